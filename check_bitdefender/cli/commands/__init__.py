@@ -6,6 +6,8 @@ from .onboarding import register_onboarding_commands
 from .lastseen import register_lastseen_commands
 from .lastscan import register_lastscan_commands
 from .detail import register_detail_commands
+from .daemon import register_daemon_commands
+from .bulk import register_bulk_commands
 
 
 def register_all_commands(main_group: Any) -> None:
@@ -15,3 +17,5 @@ def register_all_commands(main_group: Any) -> None:
     register_lastseen_commands(main_group)
     register_lastscan_commands(main_group)
     register_detail_commands(main_group)
+    register_daemon_commands(main_group)
+    register_bulk_commands(main_group)
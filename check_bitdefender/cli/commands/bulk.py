@@ -0,0 +1,164 @@
+"""Bulk check commands for CLI."""
+
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+
+from check_bitdefender.core.bulk import (
+    BULK_CHECKS,
+    BulkChecker,
+    Host,
+    Threshold,
+    parse_hosts,
+    write_results,
+)
+from check_bitdefender.core.config import load_config
+from check_bitdefender.core.factory import create_async_client, create_client
+from check_bitdefender.core.spool import CheckResultSpool
+
+
+def _parse_checks(values: Tuple[str, ...]) -> List[str]:
+    """Parse repeated or comma-separated check names."""
+    checks: List[str] = []
+    for value in values:
+        for check in value.split(","):
+            check = check.strip()
+            if check not in BULK_CHECKS:
+                raise click.BadParameter(
+                    f"'{check}' is not one of {', '.join(BULK_CHECKS)}", param_hint="--check"
+                )
+            if check not in checks:
+                checks.append(check)
+    return checks
+
+
+def _parse_thresholds(values: Tuple[str, ...]) -> Dict[str, Threshold]:
+    """Parse CHECK=WARNING,CRITICAL threshold overrides."""
+    thresholds: Dict[str, Threshold] = {}
+    for value in values:
+        try:
+            check, levels = value.split("=", 1)
+            warning, critical = levels.split(",", 1)
+            thresholds[check.strip()] = (float(warning), float(critical))
+        except ValueError:
+            raise click.BadParameter(
+                f"'{value}' is not CHECK=WARNING,CRITICAL", param_hint="--threshold"
+            )
+    return thresholds
+
+
+def register_bulk_commands(main_group: Any) -> None:
+    """Register bulk commands with the main CLI group."""
+
+    @main_group.command("bulk")
+    @click.option("-c", "--config", default="check_bitdefender.ini", help="Configuration file path")
+    @click.option("-v", "--verbose", count=True, help="Increase verbosity")
+    @click.option("-d", "--dns-name", multiple=True, help="Host to check (repeatable)")
+    @click.option(
+        "-f",
+        "--hosts-file",
+        type=click.File("r"),
+        help="File with one 'HOST_NAME [DNS_NAME]' per line, '-' for stdin",
+    )
+    @click.option(
+        "-k",
+        "--check",
+        "checks",
+        multiple=True,
+        default=["onboarding,lastseen,lastscan"],
+        show_default=True,
+        help=f"Checks to run, repeatable or comma-separated ({', '.join(BULK_CHECKS)})",
+    )
+    @click.option(
+        "-t",
+        "--threshold",
+        multiple=True,
+        help="Threshold override as CHECK=WARNING,CRITICAL (repeatable)",
+    )
+    @click.option(
+        "--service-prefix",
+        default="BITDEFENDER_",
+        show_default=True,
+        help="Service description prefix, followed by the upper-cased check name",
+    )
+    @click.option(
+        "-o",
+        "--output",
+        type=click.File("a"),
+        default="-",
+        help="Write results to this file or Nagios command pipe instead of stdout",
+    )
+    @click.option(
+        "--spool-dir",
+        type=click.Path(exists=True, file_okay=False, writable=True),
+        help="Write checkresult files into this Nagios check_result_path instead",
+    )
+    @click.option(
+        "--batch-size",
+        type=click.IntRange(min=1),
+        default=500,
+        show_default=True,
+        help="Results per checkresult file with --spool-dir",
+    )
+    @click.option(
+        "--async",
+        "use_async",
+        is_flag=True,
+        help="Use the asyncio client (requires aiohttp)",
+    )
+    def bulk_cmd(
+        config: str,
+        verbose: int,
+        dns_name: Tuple[str, ...],
+        hosts_file: Optional[Any],
+        checks: Tuple[str, ...],
+        threshold: Tuple[str, ...],
+        service_prefix: str,
+        output: Any,
+        spool_dir: Optional[str],
+        batch_size: int,
+        use_async: bool,
+    ) -> None:
+        """Check many hosts with a single inventory fetch.
+
+        Emits one Nagios passive check result (PROCESS_SERVICE_CHECK_RESULT)
+        per host and check, to be written to the Nagios command pipe, or
+        checkresult files into the Nagios spool directory with --spool-dir.
+        """
+        selected_checks = _parse_checks(checks)
+        thresholds = _parse_thresholds(threshold)
+
+        hosts = [Host(name, name) for name in dns_name]
+        if hosts_file is not None:
+            hosts.extend(parse_hosts(hosts_file))
+        if not hosts:
+            raise click.UsageError("No hosts given, use --dns-name or --hosts-file")
+
+        try:
+            # Load configuration
+            cfg = load_config(config)
+
+            # Create Defender client
+            client: Any
+            if use_async:
+                from check_bitdefender.core.async_defender import BlockingDefenderClient
+
+                client = BlockingDefenderClient(create_async_client(cfg, verbose_level=verbose))
+            else:
+                client = create_client(cfg, verbose_level=verbose)
+
+            with client:
+                checker = BulkChecker(client, verbose_level=verbose)
+                results = checker.run(hosts, selected_checks, thresholds)
+                if spool_dir:
+                    spool = CheckResultSpool(
+                        spool_dir, batch_size=batch_size, verbose_level=verbose
+                    )
+                    spool.write(results, service_prefix)
+                else:
+                    write_results(results, output, service_prefix)
+
+        except Exception as e:
+            print(f"UNKNOWN: {str(e)}")
+            sys.exit(3)
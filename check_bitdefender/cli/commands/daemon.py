@@ -0,0 +1,51 @@
+"""Daemon commands for CLI."""
+
+import signal
+import sys
+from typing import Any
+
+import click
+
+from check_bitdefender.core.config import load_config
+from check_bitdefender.core.daemon import DefenderDaemon
+from check_bitdefender.core.factory import create_client
+
+
+def register_daemon_commands(main_group: Any) -> None:
+    """Register daemon commands with the main CLI group."""
+
+    @main_group.command("daemon")
+    @click.option("-c", "--config", default="check_bitdefender.ini", help="Configuration file path")
+    @click.option("-v", "--verbose", count=True, help="Increase verbosity")
+    @click.option("--socket", required=True, help="Unix socket path to listen on")
+    @click.option(
+        "--refresh-interval",
+        type=float,
+        default=300,
+        show_default=True,
+        help="Seconds between inventory refreshes",
+    )
+    def daemon_cmd(config: str, verbose: int, socket: str, refresh_interval: float) -> None:
+        """Run a daemon answering checks from a warm inventory.
+
+        Keeps the GravityZone inventory in memory and answers onboarding,
+        lastseen, lastscan, detail and endpoints checks sent with --socket.
+        """
+        try:
+            # Load configuration
+            cfg = load_config(config)
+
+            # Create Defender client
+            client = create_client(cfg, verbose_level=verbose)
+
+            daemon = DefenderDaemon(
+                client, socket, refresh_interval=refresh_interval, verbose_level=verbose
+            )
+            signal.signal(signal.SIGTERM, lambda signum, frame: daemon.shutdown())
+            daemon.serve_forever()
+
+        except KeyboardInterrupt:
+            sys.exit(0)
+        except Exception as e:
+            print(f"UNKNOWN: {str(e)}")
+            sys.exit(3)
@@ -3,9 +3,10 @@
 import sys
 from typing import Optional, Any
 
-from check_bitdefender.core.auth import get_token
 from check_bitdefender.core.config import load_config
-from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.daemon import query_daemon
+from check_bitdefender.core.deadline import Deadline
+from check_bitdefender.core.factory import create_client
 from check_bitdefender.core.nagios import NagiosPlugin
 from check_bitdefender.services.endpoint_service import EndpointsService
 from ..decorators import common_options
@@ -23,25 +24,27 @@ def register_endpoints_commands(main_group: Any) -> None:
         dns_name: Optional[str],
         warning: Optional[float],
         critical: Optional[float],
+        socket: Optional[str],
+        deadline: Optional[Deadline],
     ) -> None:
         """List all endpoints in BitDefender GravityZone for Endpoint."""
         warning = warning if warning is not None else 10
         critical = critical if critical is not None else 25
 
         try:
+            # Answer from a running daemon when requested
+            if socket:
+                exit_code, output = query_daemon(
+                    socket, "endpoints", deadline=deadline, warning=warning, critical=critical
+                )
+                print(output, end="")
+                sys.exit(exit_code)
+
             # Load configuration
             cfg = load_config(config)
 
-            # Get authenticator
-            authenticator = get_token(cfg)
-
-            # Get parent_id from config if available
-            parent_id = None
-            if cfg.has_section("settings"):
-                parent_id = cfg["settings"].get("parent_id")
-
             # Create Defender client
-            client = DefenderClient(authenticator, verbose_level=verbose, parent_id=parent_id)
+            client = create_client(cfg, verbose_level=verbose, deadline=deadline)
 
             # Create the service
             service = EndpointsService(client, verbose_level=verbose)
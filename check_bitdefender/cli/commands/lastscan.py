@@ -3,9 +3,10 @@
 import sys
 from typing import Optional, Any
 
-from check_bitdefender.core.auth import get_token
 from check_bitdefender.core.config import load_config
-from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.daemon import query_daemon
+from check_bitdefender.core.deadline import Deadline
+from check_bitdefender.core.factory import create_client
 from check_bitdefender.core.nagios import NagiosPlugin
 from check_bitdefender.services.lastscan_service import LastScanService
 from ..decorators import common_options
@@ -23,6 +24,8 @@ def register_lastscan_commands(main_group: Any) -> None:
         dns_name: Optional[str],
         warning: Optional[float],
         critical: Optional[float],
+        socket: Optional[str],
+        deadline: Optional[Deadline],
     ) -> None:
         """Check endpoint last scan status in BitDefender GravityZone.
 
@@ -35,19 +38,25 @@ def register_lastscan_commands(main_group: Any) -> None:
         critical = critical if critical is not None else 30
 
         try:
+            # Answer from a running daemon when requested
+            if socket:
+                exit_code, output = query_daemon(
+                    socket,
+                    "lastscan",
+                    deadline=deadline,
+                    endpoint_id=endpoint_id,
+                    dns_name=dns_name,
+                    warning=warning,
+                    critical=critical,
+                )
+                print(output, end="")
+                sys.exit(exit_code)
+
             # Load configuration
             cfg = load_config(config)
 
-            # Get authenticator
-            authenticator = get_token(cfg)
-
-            # Get parent_id from config if available
-            parent_id = None
-            if cfg.has_section("settings"):
-                parent_id = cfg["settings"].get("parent_id")
-
             # Create Defender client
-            client = DefenderClient(authenticator, verbose_level=verbose, parent_id=parent_id)
+            client = create_client(cfg, verbose_level=verbose, deadline=deadline)
 
             # Create the service
             service = LastScanService(client, verbose_level=verbose)
@@ -1,7 +1,19 @@
 """CLI decorators for check_bitdefender."""
 
 import click
-from typing import Callable, Any
+from typing import Callable, Any, Optional
+
+from check_bitdefender.core.deadline import Deadline, start_deadline
+
+
+def _start_deadline(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[Deadline]:
+    """Start the execution deadline as soon as the option is parsed."""
+    try:
+        return start_deadline(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
 
 
 def common_options(func: Callable[..., Any]) -> Callable[..., Any]:
@@ -14,5 +26,13 @@ def common_options(func: Callable[..., Any]) -> Callable[..., Any]:
     func = click.option("-d", "--dns-name", help="Computer DNS Name (FQDN)")(func)
     func = click.option("-W", "--warning", type=float, help="Warning threshold")(func)
     func = click.option("-C", "--critical", type=float, help="Critical threshold")(func)
+    func = click.option(
+        "--socket", help="Query a running check_bitdefender daemon on this Unix socket"
+    )(func)
+    func = click.option(
+        "--deadline",
+        callback=_start_deadline,
+        help="Time the check may run, e.g. 25s, before reporting what it has",
+    )(func)
 
     return func
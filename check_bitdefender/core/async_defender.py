@@ -0,0 +1,392 @@
+"""Asyncio BitDefender GravityZone API client.
+
+Requires the optional ``aiohttp`` dependency (``pip install check-bitdefender[async]``).
+"""
+
+import asyncio
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Coroutine,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from check_bitdefender.core.breaker import CircuitBreaker
+from check_bitdefender.core.defender import GravityZoneAPI
+from check_bitdefender.core.exceptions import ConfigurationError, DefenderAPIError
+from check_bitdefender.core.logging_config import get_verbose_logger
+from check_bitdefender.core.ratelimit import RateLimiter
+from check_bitdefender.core.retry import RetryPolicy
+from check_bitdefender.services.endpoint_index import EndpointIndex
+
+if TYPE_CHECKING:
+    from check_bitdefender.core.cache import InventoryCache
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+
+class AsyncDefenderClient(GravityZoneAPI):
+    """Asyncio client for BitDefender GravityZone API.
+
+    Offers the same calls as DefenderClient as coroutines. All requests share
+    one aiohttp session and at most ``max_concurrency`` of them are in flight
+    at a time, so inventory pages and endpoint details fan out without
+    threads. The inventory cache, circuit breaker, retry policy and rate
+    limiter of DefenderClient are honored; their blocking file accesses run
+    outside the event loop where they may wait.
+    """
+
+    def __init__(
+        self,
+        authenticator: Any,
+        timeout: float = 15,
+        region: str = "api",
+        verbose_level: int = 0,
+        parent_id: Optional[str] = None,
+        max_concurrency: int = 4,
+        connect_timeout: Optional[float] = None,
+        cache: Optional["InventoryCache"] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        """Initialize with authenticator and optional region.
+
+        Args:
+            authenticator: Authentication provider (API token string)
+            timeout: Request timeout in seconds, or only the socket read
+                timeout with connect_timeout
+            region: Geographic region (api)
+            verbose_level: Verbosity level for logging
+            parent_id: Optional parent node ID to filter endpoints
+            max_concurrency: Maximum number of requests in flight
+            connect_timeout: Optional seconds to establish a connection
+            cache: Optional InventoryCache shared with other check processes
+            breaker: Optional CircuitBreaker shared with other check processes
+            retry: Optional RetryPolicy for connection errors, timeouts and
+                retryable HTTP statuses
+            rate_limiter: Optional RateLimiter shared with other check processes
+
+        Raises:
+            ConfigurationError: If aiohttp is not installed
+        """
+        if aiohttp is None:
+            raise ConfigurationError(
+                "AsyncDefenderClient requires aiohttp: pip install check-bitdefender[async]"
+            )
+        self.authenticator = authenticator
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.region = region
+        self.parent_id = parent_id
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = cache
+        self.breaker = breaker
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.base_url = self._get_base_url(region)
+        self.logger = get_verbose_logger(__name__, verbose_level)
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Get the HTTP session, created on first use in the running event loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self._client_timeout(),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _client_timeout(self) -> "aiohttp.ClientTimeout":
+        """Get the session timeout, split in connect and read timeouts if configured."""
+        if self.connect_timeout is None:
+            return aiohttp.ClientTimeout(total=self.timeout)
+        return aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.timeout)
+
+    async def close(self) -> None:
+        """Close the HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncDefenderClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def _post(self, payload: Any) -> Any:
+        """Send a JSON-RPC request and return the decoded response.
+
+        Connection errors, timeouts and the retry policy's HTTP statuses are
+        retried like DefenderClient._post does.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            DefenderAPIError: If the response body is not valid JSON
+            aiohttp.ClientError: If the request fails
+            asyncio.TimeoutError: If the request times out
+        """
+        policy = self.retry
+        retry = 0
+        while True:
+            try:
+                response = await self._post_once(payload)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                delay = policy.reserve(retry) if policy is not None else None
+                if delay is None:
+                    raise
+                self.logger.warning(f"Request failed ({e}), retrying in {delay:.2f}s")
+            else:
+                delay = None
+                if policy is not None and response.status in policy.statuses:
+                    delay = policy.reserve(retry, response.headers.get("Retry-After"))
+                if delay is None:
+                    response.raise_for_status()
+                    try:
+                        return await response.json(content_type=None)
+                    except ValueError as e:
+                        raise DefenderAPIError(f"Invalid API response: {e}")
+                self.logger.warning(
+                    f"Request answered HTTP {response.status}, retrying in {delay:.2f}s"
+                )
+            await asyncio.sleep(delay)
+            retry += 1
+
+    async def _post_once(self, payload: Any) -> "aiohttp.ClientResponse":
+        """Send a JSON-RPC request and read the response body.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            aiohttp.ClientError: If the request fails
+            asyncio.TimeoutError: If the request times out
+        """
+        session = self._get_session()
+        headers = {"Content-Type": self.application_json, "Authorization": self._get_auth_header()}
+        if self.breaker is not None:
+            self.breaker.before_request()
+        if self.rate_limiter is not None:
+            await asyncio.to_thread(self.rate_limiter.acquire)
+        assert self._semaphore is not None
+        try:
+            async with self._semaphore:
+                async with session.post(
+                    f"{self.base_url}/api/v1.0/jsonrpc/network", json=payload, headers=headers
+                ) as response:
+                    await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+
+        if self.breaker is not None:
+            if response.status >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        return response
+
+    async def list_endpoints(self, parent_id: Optional[str] = None) -> Dict[str, Any]:
+        """List all endpoints from BitDefender GravityZone.
+
+        The first page reveals the number of pages; the remaining pages are
+        then fetched concurrently and merged in page order. The result has the
+        same structure as DefenderClient.list_endpoints. With an inventory
+        cache, the snapshot shared with DefenderClient is used; the cache
+        runs in a worker thread, so waiting for another process refreshing
+        it does not block the event loop.
+
+        Args:
+            parent_id: Optional parent node ID to filter endpoints.
+                      If not provided, uses the parent_id from client initialization.
+
+        Raises:
+            DefenderAPIError: If the API request fails
+        """
+        # Use provided parent_id or fall back to instance parent_id
+        effective_parent_id = parent_id or self.parent_id
+        if self.cache is None:
+            return await self._fetch_endpoints(effective_parent_id)
+
+        loop = asyncio.get_running_loop()
+
+        def fetch() -> Dict[str, Any]:
+            coroutine = self._fetch_endpoints(effective_parent_id)
+            return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+        key = self.cache.key(self.base_url, self.authenticator, effective_parent_id)
+        return await asyncio.to_thread(self.cache.get_or_fetch, key, fetch)
+
+    async def _fetch_endpoints(self, effective_parent_id: Optional[str]) -> Dict[str, Any]:
+        """Fetch and transform the endpoint inventory from the API.
+
+        Raises:
+            DefenderAPIError: If the API request fails
+        """
+        self.logger.method_entry("list_endpoints")
+        start_time = time.time()
+
+        try:
+            first_page = await self._fetch_inventory_page(effective_parent_id, 1)
+            total_pages = first_page.get("pagesCount", 1)
+            self.logger.info(f"Total endpoints: {first_page.get('total', 0)}, pages: {total_pages}")
+
+            pages = [first_page]
+            if total_pages > 1:
+                pages.extend(
+                    await asyncio.gather(
+                        *(
+                            self._fetch_inventory_page(effective_parent_id, page)
+                            for page in range(2, total_pages + 1)
+                        )
+                    )
+                )
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            elapsed_time = time.time() - start_time
+            self.logger.error(f"API request failed after {elapsed_time:.2f}s: {str(e)}")
+            raise DefenderAPIError(f"Failed to list endpoints: {str(e) or type(e).__name__}")
+
+        response = {
+            "value": [
+                self._transform_endpoint(item) for page in pages for item in page.get("items", [])
+            ]
+        }
+        elapsed_time = time.time() - start_time
+        count = len(response["value"])
+        self.logger.info(
+            f"API request completed in {elapsed_time:.2f}s, retrieved {count} endpoints"
+        )
+        self.logger.method_exit("list_endpoints", f"{count} endpoints")
+        return response
+
+    async def _fetch_inventory_page(
+        self, effective_parent_id: Optional[str], page: int
+    ) -> Dict[str, Any]:
+        """Fetch one page of getNetworkInventoryItems.
+
+        Raises:
+            DefenderAPIError: If the response has no result
+        """
+        self.logger.debug(f"Request method: getNetworkInventoryItems, page: {page}")
+        data = await self._post(self._inventory_payload(effective_parent_id, page))
+        if not isinstance(data, dict) or "result" not in data:
+            raise DefenderAPIError("Invalid API response: missing 'result' field")
+        return cast(Dict[str, Any], data["result"])
+
+    async def get_endpoint_details(self, endpoint_id: str) -> Dict[str, Any]:
+        """Get detailed information about a specific endpoint.
+
+        Returns the same structure as DefenderClient.get_endpoint_details.
+
+        Raises:
+            DefenderAPIError: If the API request fails
+        """
+        self.logger.method_entry("get_endpoint_details", endpoint_id=endpoint_id)
+        try:
+            data = await self._post(self._details_payload(endpoint_id))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"API request failed: {str(e)}")
+            raise DefenderAPIError(f"Failed to get endpoint details: {str(e) or type(e).__name__}")
+
+        if not isinstance(data, dict) or "result" not in data:
+            raise DefenderAPIError("Invalid API response: missing 'result' field")
+        self.logger.method_exit("get_endpoint_details", "success")
+        return cast(Dict[str, Any], data["result"])
+
+    async def get_endpoints_details(
+        self, endpoint_ids: List[str]
+    ) -> Dict[str, Union[Dict[str, Any], DefenderAPIError]]:
+        """Get detailed information about many endpoints concurrently.
+
+        Returns:
+            Dictionary mapping each endpoint ID to its details or to the
+            DefenderAPIError that prevented retrieving them
+        """
+        unique_ids = list(dict.fromkeys(endpoint_ids))
+        answers = await asyncio.gather(
+            *(self.get_endpoint_details(endpoint_id) for endpoint_id in unique_ids),
+            return_exceptions=True,
+        )
+        results: Dict[str, Union[Dict[str, Any], DefenderAPIError]] = {}
+        for endpoint_id, answer in zip(unique_ids, answers):
+            if isinstance(answer, BaseException) and not isinstance(answer, DefenderAPIError):
+                raise answer
+            results[endpoint_id] = answer
+        return results
+
+
+class BlockingDefenderClient:
+    """Synchronous facade over an AsyncDefenderClient.
+
+    Runs the async client on a private event loop thread, so the services,
+    SnapshotClient and BulkChecker can use it in place of a DefenderClient.
+    """
+
+    def __init__(self, client: AsyncDefenderClient) -> None:
+        """Initialize with the async client to drive."""
+        self.client = client
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def _run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the event loop thread and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def list_endpoints(self, parent_id: Optional[str] = None) -> Dict[str, Any]:
+        """List all endpoints, see AsyncDefenderClient.list_endpoints."""
+        return self._run(self.client.list_endpoints(parent_id))
+
+    def iter_endpoints(self, parent_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the endpoints of list_endpoints, see DefenderClient.iter_endpoints."""
+        yield from self.list_endpoints(parent_id)["value"]
+
+    def find_endpoint(
+        self, fqdn: Optional[str] = None, endpoint_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find an endpoint in the inventory, see DefenderClient.find_endpoint."""
+        return EndpointIndex.of(self.list_endpoints()).lookup(endpoint_id, fqdn)
+
+    def get_endpoint_details(self, endpoint_id: str) -> Dict[str, Any]:
+        """Get endpoint details, see AsyncDefenderClient.get_endpoint_details."""
+        return self._run(self.client.get_endpoint_details(endpoint_id))
+
+    def get_endpoints_details(
+        self, endpoint_ids: List[str]
+    ) -> Dict[str, Union[Dict[str, Any], DefenderAPIError]]:
+        """Get many endpoint details, see AsyncDefenderClient.get_endpoints_details."""
+        return self._run(self.client.get_endpoints_details(endpoint_ids))
+
+    def reset_retry_budget(self) -> None:
+        """Restore the retry budget, see DefenderClient.reset_retry_budget."""
+        if self.client.retry is not None:
+            self.client.retry.reset()
+
+    def close(self) -> None:
+        """Close the async client and stop the event loop thread."""
+        self._run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "BlockingDefenderClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -1,8 +1,24 @@
 """Authentication management."""
 
 import configparser
+from dataclasses import dataclass
+from typing import List, Optional
+
 from check_bitdefender.core.exceptions import ConfigurationError
 
+# Prefix of the sections configuring one GravityZone account each
+TENANT_SECTION_PREFIX = "tenant:"
+
+
+@dataclass
+class Tenant:
+    """GravityZone account monitored by the plugin."""
+
+    name: str
+    token: str
+    parent_id: Optional[str] = None
+    region: str = "api"
+
 
 def get_token(
     config: configparser.ConfigParser,
@@ -19,3 +35,40 @@ def get_token(
 
     return token
 
+
+def get_tenants(config: configparser.ConfigParser) -> List[Tenant]:
+    """Get the GravityZone accounts to monitor.
+
+    Every ``[tenant:NAME]`` section configures one account with its own
+    ``token`` and optional ``parent_id`` and ``region``. Without such
+    sections, the ``[auth]`` token and the ``[settings]`` parent_id form a
+    single tenant named ``default``.
+
+    Returns:
+        Tenants in configuration order
+    """
+    tenants = []
+    for section in config.sections():
+        if not section.startswith(TENANT_SECTION_PREFIX):
+            continue
+        name = section.replace(TENANT_SECTION_PREFIX, "", 1).strip()
+        if not name:
+            raise ConfigurationError(f"Missing tenant name in [{section}] section")
+        tenant_section = config[section]
+        token = tenant_section.get("token")
+        if not token:
+            raise ConfigurationError(f"Missing 'token' in [{section}] section")
+        tenants.append(
+            Tenant(
+                name,
+                token,
+                parent_id=tenant_section.get("parent_id") or None,
+                region=tenant_section.get("region") or "api",
+            )
+        )
+
+    if tenants:
+        return tenants
+
+    parent_id = config["settings"].get("parent_id") if config.has_section("settings") else None
+    return [Tenant("default", get_token(config), parent_id=parent_id or None)]
@@ -0,0 +1,231 @@
+"""Circuit breaker around the GravityZone transport, shared across processes."""
+
+import configparser
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from check_bitdefender.core.exceptions import ConfigurationError, DefenderAPIError
+from check_bitdefender.core.logging_config import get_verbose_logger
+
+try:
+    import fcntl
+
+    HAS_FLOCK = True
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+    HAS_FLOCK = False
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Perfdata value of each state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(DefenderAPIError):
+    """Raised instead of sending a request while the circuit is open."""
+
+    pass
+
+
+class CircuitBreaker:
+    """Fail fast while the GravityZone API keeps failing.
+
+    Every check process shares the breaker through a small JSON state file,
+    updated under an exclusive lock. After ``failure_threshold`` consecutive
+    failed requests the circuit opens and requests fail at once with
+    CircuitOpenError for ``cooldown`` seconds. The first request after the
+    cool-down is let through as a probe while the others keep failing fast:
+    its success closes the circuit, its failure opens it again. A probe that
+    never reports back is replaced after another ``cooldown``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        failure_threshold: int = 5,
+        cooldown: float = 60,
+        verbose_level: int = 0,
+    ) -> None:
+        """Initialize breaker.
+
+        Args:
+            path: State file shared by all processes using the same API account
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds the circuit stays open before a probe
+            verbose_level: Verbosity level for logging
+        """
+        self.path = path
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.logger = get_verbose_logger(__name__, verbose_level)
+
+    def _read(self) -> Dict[str, Any]:
+        """Read the shared state, closed if missing or unreadable."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = None
+        if not isinstance(state, dict) or state.get("state") not in STATE_VALUES:
+            return {"state": CLOSED, "failures": 0, "opened_at": 0.0}
+        return state
+
+    def _write(self, state: Dict[str, Any]) -> None:
+        """Atomically replace the shared state."""
+        directory = os.path.dirname(self.path) or "."
+        tmp_path: Optional[str] = None
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".breaker-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+            tmp_path = None
+        except OSError as e:
+            # A read-only state directory must not fail the check
+            self.logger.warning(f"Failed to write breaker state {self.path}: {e}")
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the state lock for a read-modify-write cycle."""
+        if not HAS_FLOCK:
+            yield
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+            fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError as e:
+            self.logger.warning(f"Failed to open breaker lock {self.path}.lock: {e}")
+            yield
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def before_request(self) -> None:
+        """Let a request through, or fail fast while the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                probe already in flight
+        """
+        with self._locked():
+            state = self._read()
+            if state["state"] == CLOSED:
+                return
+
+            now = time.time()
+            elapsed = now - float(state.get("opened_at", 0))
+            if elapsed < self.cooldown:
+                if state["state"] == OPEN:
+                    raise CircuitOpenError(
+                        f"GravityZone API circuit open after {state.get('failures', 0)} "
+                        f"consecutive failures, retrying in {self.cooldown - elapsed:.0f}s"
+                    )
+                raise CircuitOpenError("GravityZone API circuit half-open, probe in progress")
+
+            # Cool-down over, or the previous probe never reported: send a probe
+            state.update(state=HALF_OPEN, opened_at=now)
+            self._write(state)
+        self.logger.info("Circuit half-open, sending probe request")
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        with self._locked():
+            state = self._read()
+            if state["state"] == CLOSED and not state.get("failures"):
+                return
+            if state["state"] != CLOSED:
+                self.logger.info("Circuit closed, GravityZone API is answering again")
+            self._write({"state": CLOSED, "failures": 0, "opened_at": 0.0})
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit at the threshold."""
+        with self._locked():
+            state = self._read()
+            failures = int(state.get("failures", 0)) + 1
+            if state["state"] == HALF_OPEN or (
+                state["state"] == CLOSED and failures >= self.failure_threshold
+            ):
+                self.logger.warning(
+                    f"Circuit open after {failures} consecutive failures, "
+                    f"failing fast for {self.cooldown:.0f}s"
+                )
+                state = {"state": OPEN, "failures": failures, "opened_at": time.time()}
+            else:
+                state["failures"] = failures
+            self._write(state)
+
+    def status(self) -> Dict[str, Any]:
+        """Get the current state and consecutive failure count."""
+        state = self._read()
+        return {"state": state["state"], "failures": int(state.get("failures", 0))}
+
+
+def get_circuit_breaker(
+    config: configparser.ConfigParser, token: str, region: str = "api", verbose_level: int = 0
+) -> Optional[CircuitBreaker]:
+    """Get the circuit breaker configured in the [breaker] section, if any.
+
+    Every API account gets its own state file, named after a hash of its
+    token so that the secret never ends up in a file name.
+
+    Args:
+        config: Loaded configuration
+        token: API token of the account
+        region: Region of the account
+        verbose_level: Verbosity level for logging
+    """
+    if not config.has_section("breaker"):
+        return None
+
+    section = config["breaker"]
+    directory = section.get("state_dir") or (
+        config["cache"].get("dir") if config.has_section("cache") else None
+    )
+    if not directory:
+        raise ConfigurationError(
+            "Missing 'state_dir' in [breaker] section and no [cache] dir to default to"
+        )
+
+    try:
+        failure_threshold = section.getint("failure_threshold", fallback=5)
+    except ValueError:
+        raise ConfigurationError(
+            "Invalid 'failure_threshold' in [breaker] section, expected a number"
+        )
+    if failure_threshold < 1:
+        raise ConfigurationError(
+            "Invalid 'failure_threshold' in [breaker] section, expected a number"
+        )
+
+    try:
+        cooldown = section.getfloat("cooldown", fallback=60)
+    except ValueError:
+        raise ConfigurationError("Invalid 'cooldown' in [breaker] section, expected seconds")
+    if cooldown < 0:
+        raise ConfigurationError("Invalid 'cooldown' in [breaker] section, expected seconds")
+
+    key = hashlib.sha256(f"{region}\0{token}".encode()).hexdigest()[:32]
+    return CircuitBreaker(
+        os.path.join(directory, f"breaker-{key}.json"),
+        failure_threshold=failure_threshold,
+        cooldown=cooldown,
+        verbose_level=verbose_level,
+    )
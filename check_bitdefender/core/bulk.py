@@ -0,0 +1,164 @@
+"""Evaluate checks for many hosts against a single inventory snapshot."""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple, Union
+
+from check_bitdefender.core.defender import EndpointClient
+from check_bitdefender.core.logging_config import get_verbose_logger
+from check_bitdefender.core.nagios import NagiosPlugin
+from check_bitdefender.core.snapshot import SnapshotClient
+from check_bitdefender.services import SERVICES
+from check_bitdefender.services.endpoint_index import EndpointIndex
+
+# Per-host checks that can be evaluated in bulk
+BULK_CHECKS = ("onboarding", "lastseen", "lastscan", "detail")
+
+# Same defaults as the individual commands
+DEFAULT_THRESHOLDS: Dict[str, Tuple[float, float]] = {
+    "onboarding": (2, 1),
+    "lastseen": (7, 30),
+    "lastscan": (7, 30),
+    "detail": (0, 0),
+}
+
+Threshold = Tuple[Optional[Union[float, int]], Optional[Union[float, int]]]
+
+
+@dataclass
+class Host:
+    """Monitored host: Nagios host name and the DNS name known to GravityZone."""
+
+    host_name: str
+    dns_name: str
+
+
+@dataclass
+class CheckResult:
+    """Result of one check for one host."""
+
+    host_name: str
+    check: str
+    exit_code: int
+    output: str
+    timestamp: float
+
+
+def parse_hosts(lines: Iterable[str]) -> List[Host]:
+    """Parse a host list.
+
+    Each line holds a Nagios host name, optionally followed by the DNS name to
+    look up in GravityZone when it differs. Blank lines and lines starting
+    with ``#`` are ignored.
+    """
+    hosts = []
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        hosts.append(Host(fields[0], fields[1] if len(fields) > 1 else fields[0]))
+    return hosts
+
+
+def format_passive_result(result: CheckResult, service_description: str) -> str:
+    """Format a result as a Nagios PROCESS_SERVICE_CHECK_RESULT external command."""
+    # External commands are line based: keep long output on the same line
+    output = result.output.rstrip("\n").replace("\n", "\\n")
+    return (
+        f"[{int(result.timestamp)}] PROCESS_SERVICE_CHECK_RESULT;"
+        f"{result.host_name};{service_description};{result.exit_code};{output}\n"
+    )
+
+
+class BulkChecker:
+    """Run the per-host checks for many hosts with a single inventory fetch.
+
+    The inventory is downloaded once into a SnapshotClient and every host is
+    evaluated with the regular services and NagiosPlugin.evaluate, so states
+    and output are the same as running each check on its own.
+    """
+
+    def __init__(self, client: EndpointClient, verbose_level: int = 0) -> None:
+        """Initialize with the client used to fetch the inventory.
+
+        Args:
+            client: DefenderClient, or any EndpointClient
+            verbose_level: Verbosity level for logging
+        """
+        self.snapshot = SnapshotClient(client, verbose_level)
+        self.verbose_level = verbose_level
+        self.logger = get_verbose_logger(__name__, verbose_level)
+
+    def run(
+        self,
+        hosts: List[Host],
+        checks: List[str],
+        thresholds: Optional[Dict[str, Threshold]] = None,
+    ) -> Iterable[CheckResult]:
+        """Evaluate every check for every host.
+
+        Args:
+            hosts: Hosts to check
+            checks: Check names from BULK_CHECKS
+            thresholds: Optional (warning, critical) per check, defaults to
+                DEFAULT_THRESHOLDS
+
+        Yields:
+            One CheckResult per host and check, in host order
+        """
+        self.logger.method_entry("run", hosts=len(hosts), checks=checks)
+        thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        plugins = {
+            check: NagiosPlugin(
+                SERVICES[check](self.snapshot, verbose_level=self.verbose_level), check
+            )
+            for check in checks
+        }
+
+        if "detail" in checks:
+            self._prefetch_details(hosts)
+
+        for host in hosts:
+            for check in checks:
+                warning, critical = thresholds[check]
+                exit_code, output = plugins[check].evaluate(
+                    dns_name=host.dns_name, warning=warning, critical=critical
+                )
+                yield CheckResult(host.host_name, check, exit_code, output, time.time())
+        self.logger.method_exit("run")
+
+    def _prefetch_details(self, hosts: List[Host]) -> None:
+        """Fetch endpoint details of all known hosts in batched requests."""
+        try:
+            index = EndpointIndex.of(self.snapshot.list_endpoints())
+        except Exception as e:
+            # Every check reports the failure on its own
+            self.logger.debug(f"Skipping details prefetch: {e}")
+            return
+
+        endpoint_ids = []
+        for host in hosts:
+            endpoint = index.lookup(dns_name=host.dns_name)
+            if endpoint and endpoint.get("id"):
+                endpoint_ids.append(endpoint["id"])
+        try:
+            self.snapshot.prefetch_details(endpoint_ids)
+        except Exception as e:
+            # Every check fetches the details it misses on its own
+            self.logger.debug(f"Skipping details prefetch: {e}")
+
+
+def write_results(
+    results: Iterable[CheckResult], stream: TextIO, service_prefix: str = "BITDEFENDER_"
+) -> int:
+    """Write results as passive check external commands.
+
+    Returns:
+        Number of results written
+    """
+    count = 0
+    for result in results:
+        stream.write(format_passive_result(result, f"{service_prefix}{result.check.upper()}"))
+        count += 1
+    stream.flush()
+    return count
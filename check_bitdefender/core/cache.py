@@ -0,0 +1,490 @@
+"""On-disk inventory cache shared across plugin processes."""
+
+import configparser
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from check_bitdefender.core.exceptions import ConfigurationError, DefenderAPIError
+from check_bitdefender.core.logging_config import get_verbose_logger
+from check_bitdefender.services.endpoint_index import EndpointIndex
+
+try:
+    import fcntl
+
+    HAS_FLOCK = True
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+    HAS_FLOCK = False
+
+CACHE_FORMAT_VERSION = 1
+
+
+class InventoryCache:
+    """TTL-bound JSON cache of the transformed endpoint inventory.
+
+    Every Nagios check runs in its own process, so the cache lives on disk and
+    is shared by all of them. Entries are written to a temporary file in the
+    cache directory and atomically renamed into place, which means a reader
+    sees either the previous snapshot or the new one, never a partial file.
+
+    Refreshes are single-flight: when a snapshot expires, the first process
+    takes an exclusive lock next to the cache file and fetches, while the
+    others wait for the lock and then read the snapshot it wrote.
+
+    With a ``grace`` period, a snapshot that expired less than ``grace``
+    seconds ago is served as is (stale-while-revalidate) and a detached
+    background process refreshes it, so no check waits for the download.
+    Processes that cannot fork safely, because other threads run, refresh
+    in the foreground instead.
+    With ``offline_max_age``, a failed refresh falls back to the last good
+    snapshot as long as it is younger than ``offline_max_age`` seconds, so
+    checks keep answering through an API outage.
+
+    The age of the last snapshot served is kept in ``last_age``,
+    ``last_stale`` tells whether it was past its TTL and ``last_offline``
+    whether it replaced a failed refresh.
+    """
+
+    lock_poll_interval = 0.05
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: int = 300,
+        verbose_level: int = 0,
+        lock_timeout: float = 30,
+        grace: float = 0,
+        offline_max_age: float = 0,
+    ) -> None:
+        """Initialize cache.
+
+        Args:
+            directory: Directory holding the cache files
+            ttl: Time to live of a snapshot in seconds
+            verbose_level: Verbosity level for logging
+            lock_timeout: Seconds to wait for another process refreshing the snapshot
+            grace: Seconds past the TTL during which the stale snapshot is
+                served while it is refreshed in the background
+            offline_max_age: Maximum age in seconds of the last good snapshot
+                served when the refresh fails, 0 to report the failure
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.grace = grace
+        self.offline_max_age = offline_max_age
+        self.last_age: Optional[float] = None
+        self.last_stale = False
+        self.last_offline = False
+        self.logger = get_verbose_logger(__name__, verbose_level)
+
+    def key(self, *parts: Optional[str]) -> str:
+        """Build a cache key from the parts identifying an inventory.
+
+        The parts are hashed so that secrets such as the API token never end
+        up in file names.
+        """
+        digest = hashlib.sha256("\0".join(part or "" for part in parts).encode())
+        return digest.hexdigest()[:32]
+
+    def path(self, key: str) -> str:
+        """Get the path of the cache file for a key."""
+        return os.path.join(self.directory, f"inventory-{key}.json")
+
+    def lock_path(self, key: str) -> str:
+        """Get the path of the refresh lock file for a key."""
+        return os.path.join(self.directory, f"inventory-{key}.lock")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a cache entry regardless of its age.
+
+        Returns:
+            Entry with ``fetched_at`` (epoch seconds) and ``data`` keys,
+            or None if there is no readable entry
+        """
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable cache file {self.path(key)}: {e}")
+            return None
+
+        if (
+            not isinstance(entry, dict)
+            or entry.get("version") != CACHE_FORMAT_VERSION
+            or "data" not in entry
+        ):
+            self.logger.warning(f"Ignoring incompatible cache file {self.path(key)}")
+            return None
+        return entry
+
+    def age(self, entry: Dict[str, Any]) -> float:
+        """Get the age of a cache entry in seconds."""
+        return max(0.0, time.time() - float(entry.get("fetched_at", 0)))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get cached data if present and younger than the TTL."""
+        entry = self.load(key)
+        if entry is None:
+            self.logger.debug(f"Cache miss: {key}")
+            return None
+
+        age = self.age(entry)
+        if age >= self.ttl:
+            self.logger.debug(f"Cache expired: {key} (age {age:.0f}s, ttl {self.ttl}s)")
+            return None
+
+        self.logger.info(f"Using cached inventory (age {age:.0f}s)")
+        self._served(age, stale=False)
+        return dict(entry["data"])
+
+    def _served(self, age: float, stale: bool, offline: bool = False) -> None:
+        """Record the age of the snapshot being served."""
+        self.last_age = age
+        self.last_stale = stale
+        self.last_offline = offline
+
+    def _serve_stale(
+        self, entry: Dict[str, Any], reason: str, offline: bool = False
+    ) -> Dict[str, Any]:
+        """Serve an expired snapshot."""
+        age = self.age(entry)
+        self.logger.warning(f"{reason}, using stale inventory (age {age:.0f}s)")
+        self._served(age, stale=True, offline=offline)
+        return dict(entry["data"])
+
+    def load_offline(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the last good snapshot if it may replace a failed refresh.
+
+        Returns:
+            Cache entry younger than ``offline_max_age``, or None
+        """
+        if self.offline_max_age <= 0:
+            return None
+        entry = self.load(key)
+        if entry is None:
+            return None
+        age = self.age(entry)
+        if age >= self.offline_max_age:
+            self.logger.info(
+                f"Last good inventory too old for offline use (age {age:.0f}s, "
+                f"max {self.offline_max_age:.0f}s)"
+            )
+            return None
+        return entry
+
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        """Atomically store data in the cache."""
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        entry = {"version": CACHE_FORMAT_VERSION, "fetched_at": time.time(), "data": data}
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".inventory-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.logger.debug(f"Cache updated: {key}")
+
+    def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Dict[str, Any]],
+        max_wait: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Get fresh cached data or fetch, store and return it.
+
+        Only one process refreshes a given key at a time. Processes that find
+        the refresh lock taken wait up to ``lock_timeout`` seconds, or
+        ``max_wait`` if shorter, for the new snapshot. If the wait times out
+        or the refresh failed, they fall back to the last good snapshot as a
+        failed refresh does, within ``offline_max_age``.
+
+        Raises:
+            DefenderAPIError: If the fetch fails, or if waiting for another
+                process timed out or its refresh failed, and no snapshot is
+                young enough for offline use
+        """
+        data = self.get(key)
+        if data is not None:
+            return data
+
+        if self.grace > 0:
+            entry = self.load(key)
+            if (
+                entry is not None
+                and self.age(entry) < self.ttl + self.grace
+                and self.spawn_refresh(key, fetch)
+            ):
+                return self._serve_stale(entry, "Inventory expired, refreshing in the background")
+
+        if not HAS_FLOCK:
+            return self._refresh(key, fetch)
+
+        lock_timeout = self.lock_timeout if max_wait is None else min(self.lock_timeout, max_wait)
+        fd, waited = self._acquire_lock(key, lock_timeout)
+        if fd is None and not waited:
+            # The lock file cannot be created, refresh without coordination
+            return self._refresh(key, fetch)
+        if fd is None:
+            stale = self.load_offline(key)
+            if stale is None:
+                raise DefenderAPIError(
+                    f"Timed out after {lock_timeout:g}s waiting for inventory refresh"
+                )
+            return self._serve_stale(stale, "Timed out waiting for inventory refresh", offline=True)
+
+        try:
+            # Another process may have refreshed while we were acquiring the lock
+            data = self.get(key)
+            if data is not None:
+                return data
+
+            if waited and self.load(key) is not None:
+                # The refresh just failed in another process, do not retry it
+                stale = self.load_offline(key)
+                if stale is None:
+                    raise DefenderAPIError("Inventory refresh by another process failed")
+                return self._serve_stale(
+                    stale, "Inventory refresh by another process failed", offline=True
+                )
+
+            return self._refresh(key, fetch)
+        finally:
+            self._release_lock(fd)
+
+    def find(
+        self,
+        key: str,
+        fetch: Callable[[], Dict[str, Any]],
+        endpoint_id: Optional[str] = None,
+        dns_name: Optional[str] = None,
+        max_wait: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Find an endpoint in the cached inventory, refreshing it as get_or_fetch does.
+
+        Matches like EndpointIndex.lookup.
+
+        Returns:
+            The endpoint in the list_endpoints format, or None if not found
+
+        Raises:
+            DefenderAPIError: If the inventory cannot be fetched or served
+        """
+        return EndpointIndex.of(self.get_or_fetch(key, fetch, max_wait)).lookup(
+            endpoint_id, dns_name
+        )
+
+    def get_details(self, key: str, endpoint_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the cached details of endpoints younger than the TTL.
+
+        The JSON cache keeps no details, see InventoryStore.
+
+        Returns:
+            Details per endpoint ID, for the endpoints that have fresh ones
+        """
+        return {}
+
+    def set_details(self, key: str, details: Dict[str, Dict[str, Any]]) -> None:
+        """Store the details of endpoints, if the cache keeps them."""
+
+    def _refresh(self, key: str, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Fetch data and store it in the cache.
+
+        Raises:
+            DefenderAPIError: If the fetch fails and no snapshot is young
+                enough for offline use
+        """
+        try:
+            data = fetch()
+        except DefenderAPIError as e:
+            entry = self.load_offline(key)
+            if entry is None:
+                raise
+            return self._serve_stale(entry, f"Inventory refresh failed ({e})", offline=True)
+        self._served(0.0, stale=False)
+        try:
+            self.set(key, data)
+        except OSError as e:
+            # A read-only or full cache directory must not fail the check
+            self.logger.warning(f"Failed to write cache file {self.path(key)}: {e}")
+        return data
+
+    def spawn_refresh(self, key: str, fetch: Callable[[], Dict[str, Any]]) -> bool:
+        """Refresh a snapshot in a detached background process.
+
+        The process is double-forked into its own session with the standard
+        streams on /dev/null, so Nagios neither waits for it nor reads its
+        output. It gives up at once if another process holds the refresh
+        lock. Nothing is started where fork() or file locks are not
+        available, or when other threads run: the child of a multi-threaded
+        process may deadlock on a lock another thread held at fork time.
+        Callers then refresh in the foreground.
+
+        Returns:
+            True if the background refresh was started
+        """
+        if not HAS_FLOCK or not hasattr(os, "fork"):
+            self.logger.debug("Background refresh not supported on this platform")
+            return False
+        if threading.active_count() > 1:
+            self.logger.debug("Background refresh not forked, other threads are running")
+            return False
+
+        try:
+            pid = os.fork()
+        except OSError as e:
+            self.logger.warning(f"Failed to start background refresh: {e}")
+            return False
+        if pid:
+            # Reap the intermediate child, the refresh runs in its own child
+            os.waitpid(pid, 0)
+            self.logger.info("Inventory refresh started in the background")
+            return True
+
+        status = 1
+        try:
+            os.setsid()
+            if os.fork():
+                status = 0
+            else:
+                devnull = os.open(os.devnull, os.O_RDWR)
+                for fd in (0, 1, 2):
+                    os.dup2(devnull, fd)
+                self._background_refresh(key, fetch)
+                status = 0
+        finally:
+            os._exit(status)
+
+    def _background_refresh(self, key: str, fetch: Callable[[], Dict[str, Any]]) -> None:
+        """Refresh a snapshot unless another process is already refreshing it."""
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            fd = os.open(self.lock_path(key), os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return
+        try:
+            if self.get(key) is None:
+                self._refresh(key, fetch)
+        finally:
+            self._release_lock(fd)
+
+    def _acquire_lock(self, key: str, timeout: float) -> Tuple[Optional[int], bool]:
+        """Acquire the refresh lock for a key, waiting up to timeout seconds.
+
+        Returns:
+            Tuple of the locked file descriptor and whether the lock was held
+            by another process when we first tried. The descriptor is None if
+            waiting timed out, or if the lock file cannot be opened (in which
+            case the flag is False).
+        """
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            fd = os.open(self.lock_path(key), os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError as e:
+            self.logger.warning(f"Failed to open cache lock file {self.lock_path(key)}: {e}")
+            return None, False
+
+        deadline = time.monotonic() + timeout
+        waited = False
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd, waited
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    return None, True
+                if not waited:
+                    self.logger.info("Inventory refresh in progress in another process, waiting")
+                waited = True
+                time.sleep(self.lock_poll_interval)
+
+    def _release_lock(self, fd: int) -> None:
+        """Release a refresh lock acquired by _acquire_lock."""
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+def get_inventory_cache(
+    config: configparser.ConfigParser, verbose_level: int = 0
+) -> Optional[InventoryCache]:
+    """Get the inventory cache configured in the [cache] section, if any.
+
+    ``backend = sqlite`` selects the InventoryStore instead of JSON files.
+    """
+    if not config.has_section("cache"):
+        return None
+
+    cache_section = config["cache"]
+    directory = cache_section.get("dir")
+    if not directory:
+        return None
+
+    try:
+        ttl = cache_section.getint("ttl", fallback=300)
+    except ValueError:
+        raise ConfigurationError("Invalid 'ttl' in [cache] section, expected seconds")
+    if ttl < 0:
+        raise ConfigurationError("Invalid 'ttl' in [cache] section, expected seconds")
+
+    try:
+        lock_timeout = cache_section.getfloat("lock_timeout", fallback=30)
+    except ValueError:
+        raise ConfigurationError("Invalid 'lock_timeout' in [cache] section, expected seconds")
+
+    try:
+        grace = cache_section.getfloat("grace", fallback=0)
+    except ValueError:
+        raise ConfigurationError("Invalid 'grace' in [cache] section, expected seconds")
+    if grace < 0:
+        raise ConfigurationError("Invalid 'grace' in [cache] section, expected seconds")
+
+    try:
+        offline_max_age = cache_section.getfloat("offline_max_age", fallback=0)
+    except ValueError:
+        raise ConfigurationError("Invalid 'offline_max_age' in [cache] section, expected seconds")
+    if offline_max_age < 0:
+        raise ConfigurationError("Invalid 'offline_max_age' in [cache] section, expected seconds")
+
+    backend = cache_section.get("backend", "json")
+    cache_class: Type[InventoryCache]
+    if backend == "sqlite":
+        # Imported here, the store module builds on this one
+        from check_bitdefender.core.store import InventoryStore
+
+        cache_class = InventoryStore
+    elif backend == "json":
+        cache_class = InventoryCache
+    else:
+        raise ConfigurationError("Invalid 'backend' in [cache] section, expected json or sqlite")
+
+    return cache_class(
+        directory,
+        ttl=ttl,
+        verbose_level=verbose_level,
+        lock_timeout=lock_timeout,
+        grace=grace,
+        offline_max_age=offline_max_age,
+    )
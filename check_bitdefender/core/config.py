@@ -2,12 +2,39 @@
 
 import configparser
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from check_bitdefender.core.exceptions import ConfigurationError
+
+
+@dataclass
+class TransportSettings:
+    """HTTP transport tuning applied to every client, from the [transport] section."""
+
+    # Seconds to establish a connection, kept short to fail fast on dead networks
+    connect_timeout: float = 5
+    # Seconds to wait for data once connected, long enough for large pages
+    read_timeout: float = 15
+    # Kept-alive connections per host
+    pool_size: int = 10
+    # Requests in flight at a time, e.g. inventory pages or details batches
+    max_concurrency: int = 4
+    # Seconds all retries may wait together, None for the [retry] budget
+    retry_budget: Optional[float] = None
+
 
 def load_config(config_path: str = "check_bitdefender.ini") -> configparser.ConfigParser:
-    """Load configuration from file."""
+    """Load configuration from file.
+
+    The [transport] section is validated here, so that a mistake is reported
+    before any client is built.
+
+    Raises:
+        FileNotFoundError: If the configuration file does not exist
+        ConfigurationError: If the [transport] section is invalid
+    """
     config = configparser.ConfigParser()
 
     # Try to find config file
@@ -17,9 +44,56 @@ def load_config(config_path: str = "check_bitdefender.ini") -> configparser.Conf
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
     config.read(config_file)
+    get_transport_settings(config)
     return config
 
 
+def get_transport_settings(config: configparser.ConfigParser) -> TransportSettings:
+    """Get the transport settings configured in the [transport] section.
+
+    The read timeout defaults to the [settings] ``timeout``, and the connect
+    timeout to the shorter of 5 seconds and the read timeout.
+
+    Raises:
+        ConfigurationError: If the [transport] section is invalid
+    """
+    defaults = TransportSettings()
+    try:
+        timeout = config.getfloat("settings", "timeout", fallback=defaults.read_timeout)
+    except ValueError:
+        raise ConfigurationError("Invalid 'timeout' in [settings] section, expected seconds")
+
+    try:
+        read_timeout = config.getfloat("transport", "read_timeout", fallback=timeout)
+        settings = TransportSettings(
+            connect_timeout=config.getfloat(
+                "transport",
+                "connect_timeout",
+                fallback=min(defaults.connect_timeout, read_timeout),
+            ),
+            read_timeout=read_timeout,
+            pool_size=config.getint("transport", "pool_size", fallback=defaults.pool_size),
+            max_concurrency=config.getint(
+                "transport", "max_concurrency", fallback=defaults.max_concurrency
+            ),
+            retry_budget=config.getfloat("transport", "retry_budget", fallback=None),
+        )
+    except ValueError as e:
+        raise ConfigurationError(f"Invalid value in [transport] section: {e}")
+
+    if settings.connect_timeout <= 0 or settings.read_timeout <= 0:
+        raise ConfigurationError(
+            "Invalid timeout in [transport] section, expected positive seconds"
+        )
+    if settings.pool_size < 1 or settings.max_concurrency < 1:
+        raise ConfigurationError(
+            "Invalid 'pool_size' or 'max_concurrency' in [transport] section, expected at least 1"
+        )
+    if settings.retry_budget is not None and settings.retry_budget < 0:
+        raise ConfigurationError("Invalid 'retry_budget' in [transport] section, expected seconds")
+    return settings
+
+
 def _find_config_file(config_path: str) -> Optional[str]:
     """Find configuration file in current directory or Nagios base directory."""
     # If absolute path provided, use it
@@ -0,0 +1,199 @@
+"""Long-running daemon answering checks over a Unix domain socket.
+
+Protocol: the client connects, sends one JSON object terminated by a newline
+and reads one JSON object terminated by a newline, then both sides close.
+
+Request::
+
+    {"command": "lastseen", "endpoint_id": null, "dns_name": "host.domain.tld",
+     "warning": 7, "critical": 30}
+
+Response::
+
+    {"exit_code": 1, "output": "DEFENDER WARNING - Host last seen 12 days ago ..."}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from check_bitdefender.core.deadline import Deadline, DeadlineExceededError
+from check_bitdefender.core.defender import EndpointClient
+from check_bitdefender.core.exceptions import DefenderAPIError
+from check_bitdefender.core.logging_config import get_verbose_logger
+from check_bitdefender.core.nagios import NagiosPlugin
+from check_bitdefender.core.snapshot import SnapshotClient
+from check_bitdefender.services import SERVICES
+
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle one daemon request per connection."""
+
+    server: "_DaemonServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline(MAX_MESSAGE_SIZE)
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            response = self.server.daemon.handle_request(request)
+        except ValueError as e:
+            response = {"exit_code": 3, "output": f"UNKNOWN: Invalid daemon request - {e}\n"}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server bound to a DefenderDaemon."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, daemon: "DefenderDaemon") -> None:
+        self.daemon = daemon
+        super().__init__(socket_path, _RequestHandler)
+
+
+class DefenderDaemon:
+    """Keep a client and inventory warm and answer checks over a Unix socket."""
+
+    def __init__(
+        self,
+        client: EndpointClient,
+        socket_path: str,
+        refresh_interval: float = 300,
+        verbose_level: int = 0,
+    ) -> None:
+        """Initialize daemon.
+
+        Args:
+            client: DefenderClient used to fetch the inventory and endpoint details
+            socket_path: Path of the Unix domain socket to listen on
+            refresh_interval: Seconds between inventory refreshes
+            verbose_level: Verbosity level for logging
+        """
+        self.client = client
+        self.snapshot = SnapshotClient(client, verbose_level)
+        self.socket_path = socket_path
+        self.refresh_interval = refresh_interval
+        self.verbose_level = verbose_level
+        self.logger = get_verbose_logger(__name__, verbose_level)
+        self._stop = threading.Event()
+        self._server: Optional[_DaemonServer] = None
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate a check request against the warm inventory.
+
+        Returns:
+            Dictionary with exit_code and output, as NagiosPlugin would produce them
+        """
+        command = request.get("command")
+        target = request.get("dns_name") or request.get("endpoint_id")
+        self.logger.info(f"Request: {command} {target}")
+
+        service_class = SERVICES.get(str(command))
+        if service_class is None:
+            return {"exit_code": 3, "output": f"UNKNOWN: Unsupported command: {command}\n"}
+
+        # Every check gets the retry budget a check process would have
+        self.client.reset_retry_budget()
+        service = service_class(self.snapshot, verbose_level=self.verbose_level)
+        exit_code, output = NagiosPlugin(service, str(command)).evaluate(
+            endpoint_id=request.get("endpoint_id"),
+            dns_name=request.get("dns_name"),
+            warning=request.get("warning"),
+            critical=request.get("critical"),
+        )
+        return {"exit_code": exit_code, "output": output}
+
+    def serve_forever(self) -> None:
+        """Warm the inventory, then serve requests until shutdown() is called."""
+        try:
+            self.snapshot.refresh()
+        except DefenderAPIError as e:
+            # Served lazily on the first request once the API is reachable again
+            self.logger.error(f"Initial inventory fetch failed: {e}")
+
+        refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        refresher.start()
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = _DaemonServer(self.socket_path, self)
+        os.chmod(self.socket_path, 0o660)
+        self.logger.info(f"Listening on {self.socket_path}")
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stop.set()
+            self._server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def shutdown(self) -> None:
+        """Stop serving. Safe to call from a signal handler."""
+        self._stop.set()
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def _refresh_loop(self) -> None:
+        """Refresh the inventory snapshot periodically."""
+        while not self._stop.wait(self.refresh_interval):
+            self.client.reset_retry_budget()
+            try:
+                self.snapshot.refresh()
+            except DefenderAPIError as e:
+                self.logger.error(f"Inventory refresh failed, keeping previous snapshot: {e}")
+
+
+def query_daemon(
+    socket_path: str,
+    command: str,
+    timeout: float = 30,
+    deadline: Optional[Deadline] = None,
+    **params: Any,
+) -> Tuple[int, str]:
+    """Send a check request to a running daemon.
+
+    Args:
+        socket_path: Path of the daemon Unix domain socket
+        command: Check command name (onboarding, lastseen, lastscan, detail, endpoints)
+        timeout: Socket timeout in seconds
+        deadline: Optional execution deadline, the socket timeout is cut to
+            the time left
+        **params: endpoint_id, dns_name, warning and critical
+
+    Returns:
+        Tuple of Nagios exit code and plugin output
+
+    Raises:
+        DeadlineExceededError: If the deadline passed before the daemon answered
+        DefenderAPIError: If the daemon cannot be reached or answers garbage
+    """
+    request = dict(params, command=command)
+    if deadline is not None:
+        deadline.check("querying the daemon")
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(deadline.cap(timeout) if deadline is not None else timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline(MAX_MESSAGE_SIZE)
+        response = json.loads(line)
+        return int(response["exit_code"]), str(response["output"])
+    except socket.timeout as e:
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceededError(
+                f"Deadline of {deadline.seconds:g}s exceeded waiting for the daemon"
+            ) from e
+        raise DefenderAPIError(f"Failed to query daemon at {socket_path}: {str(e)}")
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise DefenderAPIError(f"Failed to query daemon at {socket_path}: {str(e)}")
@@ -0,0 +1,89 @@
+"""Execution deadline of a check invocation."""
+
+import re
+import time
+from typing import Optional
+
+from check_bitdefender.core.exceptions import DefenderAPIError
+
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m)?\s*$")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0}
+
+
+class DeadlineExceededError(DefenderAPIError):
+    """Raised instead of starting work the deadline leaves no time for."""
+
+    pass
+
+
+class Deadline:
+    """Wall-clock budget shared by every request of a check.
+
+    Nagios kills plugins that overrun the service check timeout, losing
+    their output. Requests, retries and waits are bounded by what is left of
+    the budget, so that the check still gets to report.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        """Start the deadline.
+
+        Args:
+            seconds: Seconds the check may run from now
+        """
+        if seconds <= 0:
+            raise ValueError("deadline must be positive")
+        self.seconds = seconds
+        self._expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline."""
+        return max(0.0, self._expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.remaining() <= 0
+
+    def check(self, action: str) -> float:
+        """Make sure there is time left for an action.
+
+        Args:
+            action: What is about to be done, for the error message
+
+        Returns:
+            Seconds left
+
+        Raises:
+            DeadlineExceededError: If the deadline has passed
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceededError(f"Deadline of {self.seconds:g}s exceeded before {action}")
+        return remaining
+
+    def cap(self, seconds: float) -> float:
+        """Limit a timeout or wait to the time left."""
+        return min(seconds, self.remaining())
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration such as ``25``, ``25s``, ``1.5m`` or ``500ms``.
+
+    Returns:
+        Duration in seconds
+
+    Raises:
+        ValueError: If the value is not a positive duration
+    """
+    match = _DURATION.match(value)
+    if match is None:
+        raise ValueError(f"Invalid duration '{value}', expected e.g. 25s, 1.5m or 500ms")
+    seconds = float(match.group(1)) * _UNITS[match.group(2) or "s"]
+    if seconds <= 0:
+        raise ValueError(f"Invalid duration '{value}', expected a positive value")
+    return seconds
+
+
+def start_deadline(value: Optional[str]) -> Optional[Deadline]:
+    """Start a deadline from a duration option, if given."""
+    return Deadline(parse_duration(value)) if value else None
@@ -1,63 +1,532 @@
 """BitDefender GravityZone API client."""
 
 import base64
+import itertools
+import os
+import random
+import threading
 import time
 import requests
-from typing import Any, Dict, Optional, cast
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+    TYPE_CHECKING,
+)
+from check_bitdefender.core.breaker import STATE_VALUES, CircuitBreaker, CircuitOpenError
+from check_bitdefender.core.deadline import Deadline, DeadlineExceededError
 from check_bitdefender.core.exceptions import DefenderAPIError
+from check_bitdefender.core.hedge import HedgePolicy
 from check_bitdefender.core.logging_config import get_verbose_logger
+from check_bitdefender.core.ratelimit import RateLimiter
+from check_bitdefender.core.retry import RetryPolicy
+from check_bitdefender.services.endpoint_index import EndpointIndex, short_hostname
+
+if TYPE_CHECKING:
+    from check_bitdefender.core.cache import InventoryCache
+
+T = TypeVar("T")
 
-class DefenderClient:
-    """Client for BitDefender GravityZone API."""
+
+def _start_daemon(fn: Callable[[], T]) -> "Future[T]":
+    """Run a function in a daemon thread and return its future.
+
+    Unlike pool threads, which the interpreter joins at exit, a daemon thread
+    does not make the process wait for a request nobody needs anymore.
+    """
+    future: "Future[T]" = Future()
+    future.set_running_or_notify_cancel()
+
+    def run() -> None:
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="hedge", daemon=True).start()
+    return future
+
+
+class GravityZoneAPI:
+    """Requests and response transforms shared by the GravityZone clients."""
 
     application_json = "application/json"
+    per_page = 100  # Maximum items per page accepted by getNetworkInventoryItems
+
+    authenticator: Any
+
+    def _get_base_url(self, region: str) -> str:
+        """Get base URL for the specified region."""
+        endpoints = {
+            "api": "https://cloudgz.gravityzone.bitdefender.com",
+        }
+        return endpoints.get(region, endpoints["api"])
+
+    def _get_auth_header(self) -> str:
+        """Get authentication header value.
+
+        Returns:
+            Basic authentication header value
+        """
+        encoded = base64.b64encode((self.authenticator + ":").encode()).decode()
+        return f"Basic {encoded}"
+
+    def _inventory_payload(
+        self,
+        parent_id: Optional[str],
+        page: int,
+        name_filter: Optional[str] = None,
+        recursive: bool = True,
+        companies: bool = False,
+    ) -> Dict[str, Any]:
+        """Build a getNetworkInventoryItems request for one page.
+
+        Args:
+            parent_id: Optional parent node ID to filter endpoints
+            page: Page number, starting at 1
+            name_filter: Optional endpoint name the server matches partially
+            recursive: Include the whole subtree, not only direct children
+            companies: Request companies instead of computers and virtual machines
+        """
+        item_types = (
+            {"companies": True} if companies else {"computers": True, "virtualMachines": True}
+        )
+        filters: Dict[str, Any] = {"type": item_types, "depth": {"allItemsRecursively": recursive}}
+        if name_filter:
+            filters["details"] = {"name": name_filter}
+        return {
+            "params": {
+                "parentId": parent_id,
+                "page": page,
+                "perPage": self.per_page,
+                "filters": filters,
+                "options": {
+                    "companies": {"returnAllProducts": True},
+                    "endpoints": {"returnProductOutdated": True, "includeScanLogs": True},
+                },
+            },
+            "jsonrpc": "2.0",
+            "method": "getNetworkInventoryItems",
+            "id": f"check_bitdefender_inventory_{page}",
+        }
+
+    def _groups_payload(self, parent_id: Optional[str]) -> Dict[str, Any]:
+        """Build a getCustomGroupsList request for the groups directly under a node."""
+        return {
+            "params": {"parentId": parent_id},
+            "jsonrpc": "2.0",
+            "method": "getCustomGroupsList",
+            "id": "check_bitdefender_groups",
+        }
+
+    def _details_payload(self, endpoint_id: str) -> Dict[str, Any]:
+        """Build a getManagedEndpointDetails request."""
+        return {
+            "params": {"endpointId": endpoint_id, "options": {"includeScanLogs": True}},
+            "jsonrpc": "2.0",
+            "method": "getManagedEndpointDetails",
+            "id": self._details_request_id(endpoint_id),
+        }
+
+    def _details_request_id(self, endpoint_id: str) -> str:
+        """Get the JSON-RPC request id of a getManagedEndpointDetails call."""
+        return f"check_bitdefender_details_{endpoint_id}"
+
+    def _transform_endpoint(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Transform a raw inventory item to the list_endpoints format."""
+        details = item.get("details", {})
+        last_scan = item.get("lastSuccessfulScan") or {}
+        if item.get("lastSeen"):
+            last_seen_source: Optional[str] = "lastSeen"
+        elif last_scan.get("date"):
+            last_seen_source = "lastSuccessfulScan"
+        else:
+            last_seen_source = None
+        return {
+            "id": item.get("id"),
+            "fqdn": details.get("fqdn") or item.get("fqdn") or item.get("name", ""),
+            "onboardingStatus": self._map_managed_status(details.get("isManaged")),
+            "osPlatform": self._extract_os_platform(details.get("operatingSystemVersion", "")),
+            # Try lastSeen first, fall back to lastSuccessfulScan.date
+            "lastSeen": item.get("lastSeen") or last_scan.get("date"),
+            # A scan date does not tell when the agent last checked in
+            "lastSeenSource": last_seen_source,
+            "lastSuccessfulScan": last_scan or None,
+        }
+
+    def _map_managed_status(self, is_managed: bool) -> str:
+        """Map isManaged boolean to onboarding status string.
+
+        Args:
+            is_managed: Whether the endpoint is managed
+
+        Returns:
+            Onboarding status string
+        """
+        return "Onboarded" if is_managed else "InsufficientInfo"
+
+    def _extract_os_platform(self, os_version: str) -> str:
+        """Extract OS platform from version string.
+
+        Args:
+            os_version: Operating system version string
+
+        Returns:
+            Platform name (Windows, Linux, Mac, or Unknown)
+        """
+        os_lower = os_version.lower()
+        if "windows" in os_lower:
+            return "Windows"
+        elif "linux" in os_lower:
+            return "Linux"
+        elif "mac" in os_lower or "darwin" in os_lower:
+            return "Mac"
+        else:
+            return "Unknown"
+
+    def _rpc_error_message(self, data: Any) -> str:
+        """Format the error member of a JSON-RPC response."""
+        error = data.get("error") if isinstance(data, dict) else None
+        if not isinstance(error, dict):
+            return "Invalid API response: missing 'result' field"
+        message = f"{error.get('message', 'Unknown error')} ({error.get('code')})"
+        error_data = error.get("data")
+        details = error_data.get("details") if isinstance(error_data, dict) else None
+        return f"{message}: {details}" if details else message
+
+
+class EndpointClient(Protocol):
+    """Endpoint calls offered by DefenderClient and the clients standing in for it.
+
+    MultiTenantClient and BlockingDefenderClient answer the same calls, so
+    services, SnapshotClient, BulkChecker and DefenderDaemon accept any of
+    them.
+    """
+
+    def list_endpoints(self, parent_id: Optional[str] = None) -> Dict[str, Any]:
+        """List all endpoints, see DefenderClient.list_endpoints."""
+
+    def iter_endpoints(self, parent_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield all endpoints, see DefenderClient.iter_endpoints."""
+
+    def find_endpoint(
+        self, fqdn: Optional[str] = None, endpoint_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find a single endpoint, see DefenderClient.find_endpoint."""
+
+    def get_endpoint_details(self, endpoint_id: str) -> Dict[str, Any]:
+        """Get endpoint details, see DefenderClient.get_endpoint_details."""
+
+    def get_endpoints_details(
+        self, endpoint_ids: List[str]
+    ) -> Dict[str, Union[Dict[str, Any], DefenderAPIError]]:
+        """Get many endpoint details, see DefenderClient.get_endpoints_details."""
+
+    def reset_retry_budget(self) -> None:
+        """Restore the retry budget, see DefenderClient.reset_retry_budget."""
+
+
+class DefenderClient(GravityZoneAPI):
+    """Client for BitDefender GravityZone API."""
+
+    details_batch_size = 20  # getManagedEndpointDetails calls per JSON-RPC batch
+    min_name_filter = 3  # Shortest name accepted by the details.name inventory filter
+    page_orders = ("forward", "reverse", "random")
 
     def __init__(
         self,
         authenticator: Any,
-        timeout: int = 15,
+        timeout: float = 15,
         region: str = "api",
         verbose_level: int = 0,
         parent_id: Optional[str] = None,
+        cache: Optional["InventoryCache"] = None,
+        max_workers: int = 4,
+        pool_size: int = 10,
+        page_order: str = "forward",
+        server_filter: bool = True,
+        shard_by_company: bool = False,
+        max_shards: int = 4,
+        breaker: Optional[CircuitBreaker] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        deadline: Optional[Deadline] = None,
+        connect_timeout: Optional[float] = None,
+        hedge: Optional[HedgePolicy] = None,
     ) -> None:
         """Initialize with authenticator and optional region.
 
         Args:
             authenticator: Authentication provider (API token string)
-            timeout: Request timeout in seconds
+            timeout: Request timeout in seconds, or only the read timeout
+                with connect_timeout
             region: Geographic region (api)
             verbose_level: Verbosity level for logging
             parent_id: Optional parent node ID to filter endpoints
+            cache: Optional on-disk inventory cache shared across processes
+            max_workers: Maximum number of inventory pages fetched concurrently
+            pool_size: Maximum number of kept-alive connections per host
+            page_order: Order in which find_endpoint searches the pages after
+                the first: forward, reverse or random
+            server_filter: Let find_endpoint ask the server for the endpoints
+                matching the host name before scanning the whole inventory
+            shard_by_company: Let list_endpoints fetch the subtree of every
+                child company concurrently instead of one recursive listing
+            max_shards: Maximum number of companies fetched concurrently
+            breaker: Optional circuit breaker shared across processes, failing
+                requests fast while the API keeps failing
+            retry: Optional retry policy for transient failures, applied to
+                every request so a failed page is retried on its own
+            rate_limiter: Optional token bucket shared across processes that
+                every request waits on
+            deadline: Optional execution deadline bounding every request,
+                retry and wait of the check
+            connect_timeout: Optional seconds to establish a connection,
+                shorter than the read timeout to fail fast on dead networks
+            hedge: Optional policy sending a duplicate of inventory page
+                requests that are slower than usual
         """
+        if page_order not in self.page_orders:
+            raise ValueError(f"page_order must be one of {', '.join(self.page_orders)}")
         self.authenticator = authenticator
         self.timeout = timeout
+        self.connect_timeout = connect_timeout
         self.region = region
         self.parent_id = parent_id
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self.page_order = page_order
+        self.server_filter = server_filter
+        self.shard_by_company = shard_by_company
+        self.max_shards = max(1, max_shards)
+        self.breaker = breaker
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.deadline = deadline
+        self.hedge = hedge
+        self.batch_supported = True
         self.base_url = self._get_base_url(region)
         self.logger = get_verbose_logger(__name__, verbose_level)
+        self.pool_size = pool_size
+        self.session = self._create_session(pool_size)
+        # Age in seconds of the cached inventory last served, None when fetched live
+        self.inventory_age: Optional[float] = None
+        self.inventory_stale = False
+        self.inventory_offline = False
 
-    def _get_base_url(self, region: str) -> str:
-        """Get base URL for the specified region."""
-        endpoints = {
-            "api": "https://cloudgz.gravityzone.bitdefender.com",
+    def _create_session(self, pool_size: int) -> requests.Session:
+        """Create the HTTP session shared by all requests of the client.
+
+        Connections are kept alive and pooled, so consecutive pages and detail
+        calls skip the TCP and TLS handshakes. Requests block while all
+        ``pool_size`` connections to a host are busy. A forked process, such
+        as a background cache refresh, gets its own session on its first
+        request instead of sharing the parent's connections.
+        """
+        self._session_pid = os.getpid()
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, pool_size), pool_block=True)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "DefenderClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def reset_retry_budget(self) -> None:
+        """Give the retry policy its whole budget back.
+
+        The budget bounds the retries of one check. Long-running processes
+        evaluating many checks with the same client call this before each one.
+        """
+        if self.retry is not None:
+            self.retry.reset()
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Get connection reuse counters of the HTTP session.
+
+        Returns:
+            Dictionary with the number of requests sent, connections opened
+            and requests that reused a kept-alive connection
+        """
+        requests_sent = 0
+        connections = 0
+        for adapter in set(self.session.adapters.values()):
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+            for key in adapter.poolmanager.pools.keys():
+                pool = adapter.poolmanager.pools[key]
+                requests_sent += pool.num_requests
+                connections += pool.num_connections
+        return {
+            "requests": requests_sent,
+            "connections": connections,
+            "reused": max(0, requests_sent - connections),
         }
-        return endpoints.get(region, endpoints["api"])
 
-    def _get_auth_header(self) -> str:
-        """Get authentication header value.
+    def transport_metrics(self) -> Dict[str, Tuple[float, str]]:
+        """Get transport metrics to report as perfdata.
 
         Returns:
-            Basic authentication header value
+            Value and unit of measure per metric name
         """
-        encoded = base64.b64encode((self.authenticator + ":").encode()).decode()
-        return f"Basic {encoded}"
+        metrics: Dict[str, Tuple[float, str]] = {}
+        if self.breaker is not None:
+            status = self.breaker.status()
+            metrics["breaker_state"] = (STATE_VALUES[status["state"]], "")
+            metrics["breaker_failures"] = (status["failures"], "")
+        if self.rate_limiter is not None:
+            metrics["ratelimit_wait"] = (round(self.rate_limiter.waited, 3), "s")
+        if self.hedge is not None:
+            metrics["hedge_rate"] = (round(self.hedge.rate * 100, 1), "%")
+            metrics["hedge_wins"] = (self.hedge.wins, "")
+        return metrics
+
+    def _post(self, url: str, payload: Any, headers: Dict[str, str]) -> requests.Response:
+        """Send a JSON-RPC request, retrying transient failures.
+
+        Connection errors, timeouts and the retry policy's HTTP statuses are
+        retried with backoff, honoring Retry-After, while the policy allows.
+        The last response is returned, or the last error raised, once it
+        does not, or once the deadline leaves no time for the delay.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            DeadlineExceededError: If the deadline passed
+            requests.exceptions.RequestException: If the request fails
+        """
+        policy = self.retry
+        if policy is None:
+            return self._post_once(url, payload, headers)
+
+        retry = 0
+        while True:
+            try:
+                response = self._post_once(url, payload, headers)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                delay = policy.reserve(retry)
+                if delay is None or not self._fits_deadline(delay):
+                    raise
+                self.logger.warning(f"Request failed ({e}), retrying in {delay:.2f}s")
+            else:
+                if response.status_code not in policy.statuses:
+                    return response
+                delay = policy.reserve(retry, response.headers.get("Retry-After"))
+                if delay is None or not self._fits_deadline(delay):
+                    return response
+                self.logger.warning(
+                    f"Request answered HTTP {response.status_code}, retrying in {delay:.2f}s"
+                )
+            policy.sleep(delay)
+            retry += 1
+
+    def _fits_deadline(self, delay: float) -> bool:
+        """Whether a retry delay leaves time for the retried request."""
+        if self.deadline is None or delay < self.deadline.remaining():
+            return True
+        self.logger.warning(f"Not retrying, the deadline leaves no time for a {delay:.2f}s delay")
+        return False
+
+    def _request_timeout(self) -> Union[float, Tuple[float, float]]:
+        """Get the requests timeout, split in connect and read timeouts if configured."""
+        read_timeout = self.timeout
+        connect_timeout = self.connect_timeout
+        if self.deadline is not None:
+            read_timeout = self.deadline.cap(read_timeout)
+            if connect_timeout is not None:
+                connect_timeout = self.deadline.cap(connect_timeout)
+        if connect_timeout is None:
+            return read_timeout
+        return connect_timeout, read_timeout
+
+    def _post_once(self, url: str, payload: Any, headers: Dict[str, str]) -> requests.Response:
+        """Send a JSON-RPC request through the pooled session.
+
+        With a deadline, the request timeouts and the rate limiter wait are
+        cut to the time left.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            DeadlineExceededError: If the deadline passed or leaves no time
+                to wait for the rate limiter
+            requests.exceptions.RequestException: If the request fails
+        """
+        if self._session_pid != os.getpid():
+            self.session = self._create_session(self.pool_size)
+        if self.deadline is not None:
+            self.deadline.check("sending a GravityZone API request")
+        if self.breaker is not None:
+            self.breaker.before_request()
+        if self.rate_limiter is not None:
+            if self.deadline is None:
+                self.rate_limiter.acquire()
+            elif self.rate_limiter.acquire(self.deadline.remaining()) is None:
+                raise DeadlineExceededError(
+                    f"Deadline of {self.deadline.seconds:g}s leaves no time to wait "
+                    "for the API rate limit"
+                )
+            else:
+                # The wait may have used up the deadline: a zero timeout is rejected
+                self.deadline.check("sending a GravityZone API request")
+
+        try:
+            response = self.session.post(
+                url, json=payload, headers=headers, timeout=self._request_timeout(), verify=True
+            )
+        except requests.exceptions.Timeout as e:
+            if self.deadline is not None and self.deadline.expired:
+                # Cut short by the deadline, not a sign of a failing API
+                raise DeadlineExceededError(
+                    f"Deadline of {self.deadline.seconds:g}s exceeded waiting for "
+                    "the GravityZone API"
+                ) from e
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+        except requests.exceptions.RequestException:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+
+        if self.breaker is not None:
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        return response
 
     def list_endpoints(self, parent_id: Optional[str] = None) -> Dict[str, Any]:
         """List all endpoints from BitDefender GravityZone.
 
         Uses the JSONRPC API endpoint to retrieve the list of all endpoints
         managed by BitDefender GravityZone. Automatically handles pagination
-        to retrieve all endpoints.
+        to retrieve all endpoints. When an inventory cache is configured, a
+        fresh cached snapshot is returned instead of querying the API.
+        Use iter_endpoints() to stream the inventory instead.
+
+        With ``shard_by_company``, every endpoint also carries the
+        ``companyId`` and ``companyName`` of the child company it was found
+        under, see _fetch_sharded_endpoints().
 
         Args:
             parent_id: Optional parent node ID to filter endpoints.
@@ -72,6 +541,8 @@ class DefenderClient:
                         "fqdn": "hostname.domain.com",
                         "onboardingStatus": "Onboarded|InsufficientInfo|Unsupported",
                         "osPlatform": "Windows|Linux|Mac",
+                        "lastSeen": "2023-07-19T04:09:29+00:00",
+                        "lastSuccessfulScan": {"name": "...", "date": "..."} | None,
                         ...
                     },
                     ...
@@ -82,153 +553,548 @@ class DefenderClient:
             DefenderAPIError: If the API request fails
         """
         self.logger.method_entry("list_endpoints")
-        start_time = time.time()
 
-        url = f"{self.base_url}/api/v1.0/jsonrpc/network"
-        headers = {
-            "Content-Type": self.application_json,
-            "Authorization": self._get_auth_header()
-        }
+        # Use provided parent_id or fall back to instance parent_id
+        effective_parent_id = parent_id or self.parent_id
+
+        if self.cache is not None:
+            response = self.cache.get_or_fetch(
+                self._inventory_key(effective_parent_id),
+                self._inventory_fetch(effective_parent_id),
+                max_wait=self.deadline.remaining() if self.deadline is not None else None,
+            )
+            self._record_inventory_age()
+        else:
+            response = self._fetch_endpoints(effective_parent_id)
+
+        self.logger.method_exit("list_endpoints", f"{len(response['value'])} endpoints")
+        return response
+
+    def _inventory_key(self, effective_parent_id: Optional[str]) -> str:
+        """Get the cache key of the inventory under a parent."""
+        cache = cast("InventoryCache", self.cache)
+        return cache.key(
+            self.base_url,
+            self.authenticator,
+            effective_parent_id,
+            *(["companies"] if self.shard_by_company else []),
+        )
+
+    def _inventory_fetch(self, effective_parent_id: Optional[str]) -> Callable[[], Dict[str, Any]]:
+        """Get the inventory fetch to hand to the cache.
+
+        The cache may run it in a detached background refresh. That process
+        outlives the check, so the check's deadline does not bound it.
+        """
+        pid = os.getpid()
 
+        def fetch() -> Dict[str, Any]:
+            if os.getpid() != pid:
+                self.deadline = None
+            return self._fetch_endpoints(effective_parent_id)
+
+        return fetch
+
+    def _details_key(self) -> str:
+        """Get the cache key of the endpoint details of the account."""
+        return cast("InventoryCache", self.cache).key(self.base_url, self.authenticator, "details")
+
+    def _record_inventory_age(self) -> None:
+        """Copy the age of the cached inventory last served."""
+        cache = cast("InventoryCache", self.cache)
+        self.inventory_age = cache.last_age
+        self.inventory_stale = cache.last_stale
+        self.inventory_offline = cache.last_offline
+
+    def iter_endpoints(self, parent_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield endpoints page by page.
+
+        Streams the inventory instead of materializing it: each page is
+        transformed and yielded as it arrives, while up to ``max_workers``
+        following pages are fetched ahead. Stopping the iteration early
+        cancels the remaining pages. A fresh snapshot from the inventory cache
+        is used when one is configured.
+
+        Args:
+            parent_id: Optional parent node ID to filter endpoints.
+                      If not provided, uses the parent_id from client initialization.
+
+        Yields:
+            Endpoints in the list_endpoints format, in inventory order
+
+        Raises:
+            DefenderAPIError: If the API request fails
+        """
         # Use provided parent_id or fall back to instance parent_id
         effective_parent_id = parent_id or self.parent_id
 
-        all_items = []
-        page = 1
-        per_page = 100  # Maximum items per page for better performance
-        total_pages = None
+        if self.cache is not None:
+            cached = self.cache.get(self._inventory_key(effective_parent_id))
+            if cached is not None:
+                self._record_inventory_age()
+                yield from cached["value"]
+                return
 
-        if effective_parent_id:
-            self.logger.info(f"Requesting endpoints list from {url} (parent_id: {effective_parent_id})")
-        else:
-            self.logger.info(f"Requesting endpoints list from {url}")
+        yield from self._stream_endpoints(effective_parent_id)
+
+    def _fetch_endpoints(self, effective_parent_id: Optional[str]) -> Dict[str, Any]:
+        """Fetch and transform the endpoint inventory from the API.
+
+        Args:
+            effective_parent_id: Parent node ID to filter endpoints, if any
+
+        Returns:
+            Dictionary containing the transformed endpoint list
 
+        Raises:
+            DefenderAPIError: If the API request fails
+        """
+        if self.shard_by_company:
+            return self._fetch_sharded_endpoints(effective_parent_id)
+        return {"value": list(self._stream_endpoints(effective_parent_id))}
+
+    def _fetch_sharded_endpoints(self, effective_parent_id: Optional[str]) -> Dict[str, Any]:
+        """Fetch the endpoint inventory one child company at a time.
+
+        The direct child companies and groups of the parent node are listed
+        first. The subtree of each company and of each group, and the
+        endpoints placed directly under the parent, are then fetched by up to
+        ``max_shards`` threads and merged in shard order. Every endpoint
+        records the ``companyId`` and ``companyName`` of its shard; endpoints
+        under the parent itself or one of its groups get the parent id and no
+        name. Without child companies this is the same as a single recursive
+        listing.
+
+        Raises:
+            DefenderAPIError: If the API request fails
+        """
+        start_time = time.time()
+        companies = self._list_child_companies(effective_parent_id)
+        if not companies:
+            self.logger.info("No child companies, listing the inventory in one stream")
+            return {"value": list(self._stream_endpoints(effective_parent_id))}
+        groups = self._list_child_groups(effective_parent_id)
+
+        # Endpoints directly under the parent node, one shard per group of the
+        # parent, then one shard per company
+        shards: List[Tuple[Optional[str], Optional[str], Optional[str], bool]] = [
+            (effective_parent_id, effective_parent_id, None, False)
+        ]
+        shards.extend((group.get("id"), effective_parent_id, None, True) for group in groups)
+        shards.extend(
+            (company.get("id"), company.get("id"), company.get("name"), True)
+            for company in companies
+        )
+        self.logger.info(
+            f"Fetching inventory of {len(companies)} companies and {len(groups)} groups, "
+            f"{self.max_shards} at a time"
+        )
+
+        with ThreadPoolExecutor(max_workers=min(self.max_shards, len(shards))) as executor:
+            results = list(executor.map(lambda shard: self._fetch_shard(*shard), shards))
+
+        endpoints = [endpoint for shard_endpoints in results for endpoint in shard_endpoints]
+        elapsed_time = time.time() - start_time
+        self.logger.info(
+            f"Sharded inventory completed in {elapsed_time:.2f}s, "
+            f"retrieved {len(endpoints)} endpoints from {len(shards)} shards"
+        )
+        return {"value": endpoints}
+
+    def _list_child_companies(self, effective_parent_id: Optional[str]) -> List[Dict[str, Any]]:
+        """List the companies directly under the parent node.
+
+        Raises:
+            DefenderAPIError: If the API request fails
+        """
+        url = f"{self.base_url}/api/v1.0/jsonrpc/network"
+        headers = {"Content-Type": self.application_json, "Authorization": self._get_auth_header()}
+        filters = {"companies": True, "recursive": False}
         try:
-            while True:
-                # Prepare JSONRPC request with pagination
-
-                payload = {
-                   "params": {
-                       "parentId": effective_parent_id,
-                       "page": 1,
-                       "perPage": 100,
-                       "filters": {
-                           "type": {
-                               "computers": True,
-                               "virtualMachines": True
-                           },
-                           "depth": {
-                               "allItemsRecursively": True
-                           }
-                       },
-                       "options": {
-                           "companies": {
-                               "returnAllProducts": True
-                           },
-                           "endpoints": {
-                               "returnProductOutdated": True,
-                               "includeScanLogs": True
-                           }
-                       }
-                   },
-                   "jsonrpc": "2.0",
-                   "method": "getNetworkInventoryItems",
-                   "id": "301f7b05-ec02-481b-9ed6-c07b97de2b7b"
-              }
-
-
-
-                self.logger.debug(f"Request method: {payload['method']}, page: {page}/{total_pages or '?'}")
-
-                response = requests.post(
-                    url,
-                    json=payload,
-                    headers=headers,
-                    timeout=self.timeout,
-                    verify=True
+            return [
+                item
+                for page in self._iter_inventory_pages(
+                    url, headers, effective_parent_id, filters=filters
                 )
-                response.raise_for_status()
+                for item in page.get("items", [])
+            ]
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"API request failed: {str(e)}")
+            raise DefenderAPIError(f"Failed to list companies: {str(e)}")
 
-                data = response.json()
+    def _list_child_groups(self, effective_parent_id: Optional[str]) -> List[Dict[str, Any]]:
+        """List the custom groups directly under the parent node.
 
-                # Extract items from JSONRPC response
-                if "result" not in data:
-                    raise DefenderAPIError("Invalid API response: missing 'result' field")
+        Raises:
+            DefenderAPIError: If the API request fails
+        """
+        url = f"{self.base_url}/api/v1.0/jsonrpc/network"
+        headers = {"Content-Type": self.application_json, "Authorization": self._get_auth_header()}
+        try:
+            response = self._post(url, self._groups_payload(effective_parent_id), headers)
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"API request failed: {str(e)}")
+            raise DefenderAPIError(f"Failed to list groups: {str(e)}")
+        if not isinstance(data, dict) or not isinstance(data.get("result"), list):
+            raise DefenderAPIError(f"Failed to list groups: {self._rpc_error_message(data)}")
+        return cast(List[Dict[str, Any]], data["result"])
 
-                result = data["result"]
-                items = result.get("items", [])
+    def _fetch_shard(
+        self,
+        shard_id: Optional[str],
+        company_id: Optional[str],
+        company_name: Optional[str],
+        recursive: bool,
+    ) -> List[Dict[str, Any]]:
+        """Fetch the endpoints of one shard, tagged with their company."""
+        endpoints = list(self._stream_endpoints(shard_id, filters={"recursive": recursive}))
+        for endpoint in endpoints:
+            endpoint["companyId"] = company_id
+            endpoint["companyName"] = company_name
+        self.logger.debug(f"Shard {company_name or shard_id}: {len(endpoints)} endpoints")
+        return endpoints
 
-                # Get pagination info
-                if total_pages is None:
-                    total_pages = result.get("pagesCount", 1)
-                    total_items = result.get("total", 0)
-                    self.logger.info(f"Total endpoints: {total_items}, pages: {total_pages}")
+    def find_endpoint(
+        self,
+        fqdn: Optional[str] = None,
+        endpoint_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        page_order: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Find a single endpoint by id or DNS name.
 
-                # Add items to collection
-                all_items.extend(items)
-                self.logger.debug(f"Retrieved {len(items)} items from page {page}, total so far: {len(all_items)}")
+        Matches like EndpointIndex.lookup. Without an inventory cache, a
+        lookup by DNS name first asks the server for the endpoints whose name
+        contains the short hostname, which usually transfers a single small
+        page. If none of them matches, or when looking up by id, the
+        inventory is streamed and the search stops as soon as the endpoint
+        shows up, so most lookups only fetch part of the pages. A name that
+        only matches by short hostname needs the whole inventory to rule out
+        ambiguity. With a cache, the shared snapshot is searched instead,
+        with indexed queries when it is an InventoryStore.
 
-                # Check if we've retrieved all pages
-                if page >= total_pages:
-                    break
+        Args:
+            fqdn: Optional DNS name of the endpoint
+            endpoint_id: Optional endpoint ID, tried first
+            parent_id: Optional parent node ID to filter endpoints
+            page_order: Order in which pages after the first are searched:
+                forward, reverse or random (default: client page_order)
 
-                page += 1
+        Returns:
+            The endpoint in the list_endpoints format, or None if not found
 
-            elapsed_time = time.time() - start_time
-            self.logger.info(f"API request completed in {elapsed_time:.2f}s, retrieved {len(all_items)} endpoints")
+        Raises:
+            DefenderAPIError: If the API request fails
+        """
+        self.logger.method_entry("find_endpoint", fqdn=fqdn, endpoint_id=endpoint_id)
 
-            # Transform to match expected format
-            transformed_response = {
-                "value": [
-                    {
-                        "id": item.get("id"),
-                        "fqdn": item.get("details", {}).get("fqdn") or item.get("fqdn") or item.get("name", ""),
-                        "onboardingStatus": self._map_managed_status(item.get("details", {}).get("isManaged")),
-                        "osPlatform": self._extract_os_platform(item.get("details", {}).get("operatingSystemVersion", "")),
-                        # Try lastSeen first, fall back to lastSuccessfulScan.date
-                        "lastSeen": item.get("lastSeen") or item.get("lastSuccessfulScan", {}).get("date"),
-                    }
-                    for item in all_items
-                ]
-            }
+        effective_parent_id = parent_id or self.parent_id
+        endpoint = None
+        if self.cache is not None:
+            endpoint = self.cache.find(
+                self._inventory_key(effective_parent_id),
+                self._inventory_fetch(effective_parent_id),
+                endpoint_id,
+                fqdn,
+                max_wait=self.deadline.remaining() if self.deadline is not None else None,
+            )
+            self._record_inventory_age()
+        else:
+            if fqdn and not endpoint_id and self.server_filter:
+                endpoint = self._filter_endpoints(fqdn, effective_parent_id)
+            if endpoint is None:
+                endpoint = self._search_endpoints(
+                    fqdn, endpoint_id, effective_parent_id, page_order or self.page_order
+                )
+
+        self.logger.method_exit("find_endpoint", endpoint.get("id") if endpoint else None)
+        return endpoint
+
+    def _filter_endpoints(
+        self, fqdn: str, effective_parent_id: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Look up a DNS name among the endpoints the server filtered by name.
+
+        Returns:
+            The matching endpoint, or None if the name is too short to filter
+            on or no filtered endpoint matches
+        """
+        name = short_hostname(fqdn)
+        if len(name) < self.min_name_filter:
+            return None
+
+        candidates = list(
+            self._stream_endpoints(effective_parent_id, filters={"name_filter": name})
+        )
+        endpoint = EndpointIndex(candidates).lookup(dns_name=fqdn)
+        if endpoint is None:
+            self.logger.info(
+                f"No match among {len(candidates)} endpoints named like '{name}', "
+                "scanning the inventory"
+            )
+        return endpoint
+
+    def _search_endpoints(
+        self,
+        fqdn: Optional[str],
+        endpoint_id: Optional[str],
+        effective_parent_id: Optional[str],
+        page_order: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Search the streamed inventory, stopping at the first certain match."""
+        wanted = fqdn.lower() if fqdn else None
+        short = short_hostname(fqdn) if fqdn else None
+        name_match: Optional[Dict[str, Any]] = None
+        # Endpoints sharing the short hostname, resolved once the scan is complete
+        candidates: List[Dict[str, Any]] = []
+
+        scanned = 0
+        endpoints = self._stream_endpoints(effective_parent_id, page_order)
+        try:
+            for endpoint in endpoints:
+                scanned += 1
+                if endpoint_id and endpoint.get("id") == endpoint_id:
+                    self.logger.info(f"Endpoint found by id after {scanned} endpoints")
+                    return endpoint
+
+                name = endpoint.get("fqdn") or ""
+                if wanted and name.lower() == wanted:
+                    if not endpoint_id:
+                        self.logger.info(f"Endpoint found by name after {scanned} endpoints")
+                        return endpoint
+                    # The id takes precedence, keep scanning for it
+                    name_match = name_match or endpoint
+                elif short and name and short_hostname(name) == short:
+                    candidates.append(endpoint)
+        finally:
+            endpoints.close()
+
+        if name_match is not None:
+            return name_match
+        if fqdn and candidates:
+            return EndpointIndex(candidates).lookup(dns_name=fqdn)
+        return None
+
+    def _stream_endpoints(
+        self,
+        effective_parent_id: Optional[str],
+        page_order: str = "forward",
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Yield transformed endpoints from the API, one page at a time.
+
+        Args:
+            effective_parent_id: Parent node ID to filter endpoints, if any
+            page_order: Order of the pages after the first
+            filters: Optional keyword arguments of _inventory_payload
+
+        Raises:
+            DefenderAPIError: If the API request fails
+        """
+        start_time = time.time()
+
+        url = f"{self.base_url}/api/v1.0/jsonrpc/network"
+        headers = {
+            "Content-Type": self.application_json,
+            "Authorization": self._get_auth_header()
+        }
+
+        if effective_parent_id:
+            self.logger.info(
+                f"Requesting endpoints list from {url} (parent_id: {effective_parent_id})"
+            )
+        else:
+            self.logger.info(f"Requesting endpoints list from {url}")
+        if filters:
+            self.logger.info(f"Inventory filters: {filters}")
 
-            self.logger.method_exit("list_endpoints", f"{len(transformed_response['value'])} endpoints")
-            return transformed_response
+        count = 0
+        try:
+            pages = self._iter_inventory_pages(
+                url, headers, effective_parent_id, page_order, filters
+            )
+            for page in pages:
+                for item in page.get("items", []):
+                    count += 1
+                    yield self._transform_endpoint(item)
 
         except requests.exceptions.RequestException as e:
             elapsed_time = time.time() - start_time
             self.logger.error(f"API request failed after {elapsed_time:.2f}s: {str(e)}")
             raise DefenderAPIError(f"Failed to list endpoints: {str(e)}")
 
-    def _map_managed_status(self, is_managed: bool) -> str:
-        """Map isManaged boolean to onboarding status string.
+        elapsed_time = time.time() - start_time
+        self.logger.info(
+            f"API request completed in {elapsed_time:.2f}s, retrieved {count} endpoints"
+        )
+        self.logger.debug(f"HTTP connections: {self.connection_stats()}")
 
-        Args:
-            is_managed: Whether the endpoint is managed
+    def _iter_inventory_pages(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        effective_parent_id: Optional[str],
+        page_order: str = "forward",
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield getNetworkInventoryItems results.
+
+        The first page reveals the number of pages and is yielded before any
+        other request is sent. The following pages are then fetched by up to
+        ``max_workers`` threads, never more than ``max_workers`` pages ahead of
+        the consumer, so memory stays bounded by a few pages. They are yielded
+        in ``page_order``: forward, reverse or random.
+
+        Raises:
+            DefenderAPIError: If a response has no result
+            requests.exceptions.RequestException: If a request fails
+        """
+        first_page = self._fetch_inventory_page(url, headers, effective_parent_id, 1, filters)
+        total_pages = first_page.get("pagesCount", 1)
+        self.logger.info(f"Total endpoints: {first_page.get('total', 0)}, pages: {total_pages}")
+        yield first_page
+        del first_page
+
+        if total_pages <= 1:
+            return
+
+        remaining = list(range(2, total_pages + 1))
+        if page_order == "reverse":
+            remaining.reverse()
+        elif page_order == "random":
+            random.shuffle(remaining)
+        next_pages = iter(remaining)
+
+        workers = min(self.max_workers, total_pages - 1)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            pending: Deque["Future[Dict[str, Any]]"] = deque(
+                executor.submit(
+                    self._fetch_inventory_page, url, headers, effective_parent_id, page, filters
+                )
+                for page in itertools.islice(next_pages, workers)
+            )
+            while pending:
+                # Results are consumed in page order whatever order the pages complete in
+                result = pending.popleft().result()
+                for page in itertools.islice(next_pages, 1):
+                    pending.append(
+                        executor.submit(
+                            self._fetch_inventory_page,
+                            url,
+                            headers,
+                            effective_parent_id,
+                            page,
+                            filters,
+                        )
+                    )
+                yield result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _fetch_inventory_page(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        effective_parent_id: Optional[str],
+        page: int,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Fetch one page of getNetworkInventoryItems, hedged if configured.
 
         Returns:
-            Onboarding status string
+            The JSONRPC result with items, pagesCount and total
+
+        Raises:
+            DefenderAPIError: If the response has no result
+            requests.exceptions.RequestException: If the request fails
         """
-        return "Onboarded" if is_managed else "InsufficientInfo"
+        if self.hedge is None:
+            return self._request_inventory_page(url, headers, effective_parent_id, page, filters)
+        return self._hedged(
+            lambda: self._request_inventory_page(url, headers, effective_parent_id, page, filters),
+            f"page {page}",
+        )
 
-    def _extract_os_platform(self, os_version: str) -> str:
-        """Extract OS platform from version string.
+    def _hedged(self, fetch: Callable[[], T], description: str) -> T:
+        """Run an idempotent request, duplicating it if it is slower than usual.
 
-        Args:
-            os_version: Operating system version string
+        The request runs in a daemon thread. If it has not completed after the
+        policy's delay and the cap on hedged requests allows it, a duplicate
+        is sent and the first successful answer is returned. The other
+        request is left to complete in the background, without holding up
+        the exit of the process.
+
+        Raises:
+            Exception: What the requests raised, if both failed
+        """
+        policy = cast(HedgePolicy, self.hedge)
+
+        def timed() -> T:
+            start = time.monotonic()
+            result = fetch()
+            policy.record(time.monotonic() - start)
+            return result
+
+        policy.start()
+        delay = policy.delay()
+        primary = _start_daemon(timed)
+        done, _ = wait([primary], timeout=delay)
+        if done or not policy.try_hedge():
+            return primary.result()
+
+        self.logger.info(
+            f"No answer for {description} after {delay:.2f}s, sending a hedged request"
+        )
+        hedged = _start_daemon(timed)
+        pending = {primary, hedged}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedged:
+                        policy.won()
+                        self.logger.debug(f"Hedged request for {description} answered first")
+                    return future.result()
+                error = error or future.exception()
+        raise cast(BaseException, error)
+
+    def _request_inventory_page(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        effective_parent_id: Optional[str],
+        page: int,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Send the request of one page of getNetworkInventoryItems.
 
         Returns:
-            Platform name (Windows, Linux, Mac, or Unknown)
+            The JSONRPC result with items, pagesCount and total
+
+        Raises:
+            DefenderAPIError: If the response has no result
+            requests.exceptions.RequestException: If the request fails
         """
-        os_lower = os_version.lower()
-        if "windows" in os_lower:
-            return "Windows"
-        elif "linux" in os_lower:
-            return "Linux"
-        elif "mac" in os_lower or "darwin" in os_lower:
-            return "Mac"
-        else:
-            return "Unknown"
+        payload = self._inventory_payload(effective_parent_id, page, **(filters or {}))
+
+        self.logger.debug(f"Request method: {payload['method']}, page: {page}")
+
+        response = self._post(url, payload, headers)
+        response.raise_for_status()
+
+        data = response.json()
+
+        # Extract items from JSONRPC response
+        if "result" not in data:
+            raise DefenderAPIError("Invalid API response: missing 'result' field")
+
+        result = cast(Dict[str, Any], data["result"])
+        self.logger.debug(f"Retrieved {len(result.get('items', []))} items from page {page}")
+        return result
 
     def get_endpoint_details(self, endpoint_id: str) -> Dict[str, Any]:
         """Get detailed information about a specific endpoint.
@@ -256,6 +1122,26 @@ class DefenderClient:
                 }
             }
 
+        With an inventory cache keeping details, such as InventoryStore,
+        details younger than the cache TTL are served from it.
+
+        Raises:
+            DefenderAPIError: If the API request fails
+        """
+        if self.cache is None:
+            return self._request_endpoint_details(endpoint_id)
+
+        key = self._details_key()
+        cached = self.cache.get_details(key, [endpoint_id])
+        if endpoint_id in cached:
+            return cached[endpoint_id]
+        details = self._request_endpoint_details(endpoint_id)
+        self.cache.set_details(key, {endpoint_id: details})
+        return details
+
+    def _request_endpoint_details(self, endpoint_id: str) -> Dict[str, Any]:
+        """Request the details of an endpoint from the API.
+
         Raises:
             DefenderAPIError: If the API request fails
         """
@@ -268,29 +1154,13 @@ class DefenderClient:
             "Authorization": self._get_auth_header()
         }
 
-        payload = {
-            "params": {
-                "endpointId": endpoint_id,
-                "options": {
-                    "includeScanLogs": True
-                }
-            },
-            "jsonrpc": "2.0",
-            "method": "getManagedEndpointDetails",
-            "id": f"check_bitdefender_details_{endpoint_id}"
-        }
+        payload = self._details_payload(endpoint_id)
 
         self.logger.info(f"Requesting endpoint details from {url} (endpoint_id: {endpoint_id})")
         self.logger.debug(f"Request method: {payload['method']}")
 
         try:
-            response = requests.post(
-                url,
-                json=payload,
-                headers=headers,
-                timeout=self.timeout,
-                verify=True
-            )
+            response = self._post(url, payload, headers)
             response.raise_for_status()
 
             data = response.json()
@@ -310,3 +1180,135 @@ class DefenderClient:
             elapsed_time = time.time() - start_time
             self.logger.error(f"API request failed after {elapsed_time:.2f}s: {str(e)}")
             raise DefenderAPIError(f"Failed to get endpoint details: {str(e)}")
+
+    def get_endpoints_details(
+        self, endpoint_ids: List[str], batch_size: Optional[int] = None
+    ) -> Dict[str, Union[Dict[str, Any], DefenderAPIError]]:
+        """Get detailed information about many endpoints.
+
+        Packs getManagedEndpointDetails calls into JSON-RPC 2.0 batch arrays
+        of ``batch_size`` calls and de-multiplexes the answers by request id.
+        If the server refuses batches, falls back to concurrent single calls
+        for this and every later sweep of the client. Details the inventory
+        cache keeps are not requested again, see get_endpoint_details().
+        Answers to batches already in flight when one is refused are kept;
+        only the endpoints of refused batches are requested one by one.
+
+        Args:
+            endpoint_ids: Endpoint IDs to retrieve details for
+            batch_size: Calls per batch (default: details_batch_size)
+
+        Returns:
+            Dictionary mapping each endpoint ID to its details, as returned by
+            get_endpoint_details, or to the DefenderAPIError that prevented
+            retrieving them
+        """
+        self.logger.method_entry("get_endpoints_details", count=len(endpoint_ids))
+        start_time = time.time()
+
+        # Keep order, drop duplicates
+        unique_ids = list(dict.fromkeys(endpoint_ids))
+        results: Dict[str, Union[Dict[str, Any], DefenderAPIError]] = {}
+        if self.cache is not None:
+            results.update(self.cache.get_details(self._details_key(), unique_ids))
+        to_fetch = [endpoint_id for endpoint_id in unique_ids if endpoint_id not in results]
+
+        size = max(1, batch_size or self.details_batch_size)
+        batches = []
+        for start in range(0, len(to_fetch), size):
+            end = start + size
+            batches.append(to_fetch[start:end])
+        if self.batch_supported and batches:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                for batch_results in executor.map(self._fetch_details_batch, batches):
+                    if batch_results is not None:
+                        results.update(batch_results)
+
+        remaining = [endpoint_id for endpoint_id in to_fetch if endpoint_id not in results]
+        if remaining:
+            self.logger.info(f"Requesting details for {len(remaining)} endpoints one by one")
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(remaining))) as executor:
+                for endpoint_id, details in zip(
+                    remaining, executor.map(self._fetch_details_or_error, remaining)
+                ):
+                    results[endpoint_id] = details
+
+        if self.cache is not None and to_fetch:
+            fetched = {}
+            for endpoint_id in to_fetch:
+                details = results[endpoint_id]
+                if not isinstance(details, DefenderAPIError):
+                    fetched[endpoint_id] = details
+            if fetched:
+                self.cache.set_details(self._details_key(), fetched)
+
+        # Report in the requested order
+        results = {endpoint_id: results[endpoint_id] for endpoint_id in unique_ids}
+        elapsed_time = time.time() - start_time
+        errors = sum(1 for details in results.values() if isinstance(details, DefenderAPIError))
+        self.logger.info(
+            f"Retrieved details for {len(results) - errors}/{len(results)} endpoints "
+            f"in {elapsed_time:.2f}s"
+        )
+        self.logger.method_exit("get_endpoints_details", f"{errors} errors")
+        return results
+
+    def _fetch_details_batch(
+        self, endpoint_ids: List[str]
+    ) -> Optional[Dict[str, Union[Dict[str, Any], DefenderAPIError]]]:
+        """Fetch details of endpoints with a single JSON-RPC batch request.
+
+        Returns:
+            Details or error per endpoint ID, or None if the server refused the
+            batch or an earlier one
+        """
+        if not self.batch_supported:
+            # Another batch of the sweep was refused, do not send this one
+            return None
+        url = f"{self.base_url}/api/v1.0/jsonrpc/network"
+        headers = {"Content-Type": self.application_json, "Authorization": self._get_auth_header()}
+        payload = [self._details_payload(endpoint_id) for endpoint_id in endpoint_ids]
+
+        self.logger.debug(f"Request batch of {len(payload)} getManagedEndpointDetails calls")
+
+        try:
+            response = self._post(url, payload, headers)
+            if 400 <= response.status_code < 500 and response.status_code not in (401, 403, 429):
+                self.logger.info(f"Batch request refused with HTTP {response.status_code}")
+                self.batch_supported = False
+                return None
+            response.raise_for_status()
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError, CircuitOpenError) as e:
+            self.logger.error(f"Batch request failed: {str(e)}")
+            error = DefenderAPIError(f"Failed to get endpoint details: {str(e)}")
+            return {endpoint_id: error for endpoint_id in endpoint_ids}
+
+        if not isinstance(data, list):
+            # A single error object answers batches on servers without batch support
+            self.logger.info(f"Batch request refused: {self._rpc_error_message(data)}")
+            self.batch_supported = False
+            return None
+
+        answers = {answer.get("id"): answer for answer in data if isinstance(answer, dict)}
+        results: Dict[str, Union[Dict[str, Any], DefenderAPIError]] = {}
+        for endpoint_id in endpoint_ids:
+            answer = answers.get(self._details_request_id(endpoint_id))
+            if answer is None:
+                results[endpoint_id] = DefenderAPIError(
+                    f"Failed to get endpoint details: no response for {endpoint_id}"
+                )
+            elif "result" in answer:
+                results[endpoint_id] = cast(Dict[str, Any], answer["result"])
+            else:
+                results[endpoint_id] = DefenderAPIError(
+                    f"Failed to get endpoint details: {self._rpc_error_message(answer)}"
+                )
+        return results
+
+    def _fetch_details_or_error(self, endpoint_id: str) -> Union[Dict[str, Any], DefenderAPIError]:
+        """Request endpoint details, returning the error instead of raising it."""
+        try:
+            return self._request_endpoint_details(endpoint_id)
+        except DefenderAPIError as e:
+            return e
@@ -0,0 +1,172 @@
+"""Defender client construction from configuration."""
+
+import configparser
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+from check_bitdefender.core.auth import Tenant, get_tenants
+from check_bitdefender.core.breaker import get_circuit_breaker
+from check_bitdefender.core.cache import get_inventory_cache
+from check_bitdefender.core.config import TransportSettings, get_transport_settings
+from check_bitdefender.core.deadline import Deadline
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import ConfigurationError
+from check_bitdefender.core.hedge import get_hedge_policy
+from check_bitdefender.core.ratelimit import get_rate_limiter
+from check_bitdefender.core.retry import RetryPolicy, get_retry_policy
+from check_bitdefender.core.tenants import MultiTenantClient
+
+if TYPE_CHECKING:
+    from check_bitdefender.core.async_defender import AsyncDefenderClient
+
+
+def _get_page_order(config: configparser.ConfigParser) -> str:
+    """Get the find_endpoint page order from the [settings] section."""
+    page_order = "forward"
+    if config.has_section("settings"):
+        page_order = config["settings"].get("page_order") or page_order
+    if page_order not in DefenderClient.page_orders:
+        raise ConfigurationError(
+            f"Invalid 'page_order' in [settings] section, expected one of "
+            f"{', '.join(DefenderClient.page_orders)}"
+        )
+    return page_order
+
+
+def _get_server_filter(config: configparser.ConfigParser) -> bool:
+    """Get the find_endpoint server-side filter switch from the [settings] section."""
+    if not config.has_section("settings"):
+        return True
+    try:
+        return config["settings"].getboolean("server_filter", fallback=True)
+    except ValueError:
+        raise ConfigurationError(
+            "Invalid 'server_filter' in [settings] section, expected true or false"
+        )
+
+
+def _get_sharding(config: configparser.ConfigParser) -> Tuple[bool, int]:
+    """Get the per-company inventory sharding settings from the [settings] section."""
+    if not config.has_section("settings"):
+        return False, 4
+    settings = config["settings"]
+    try:
+        shard_by_company = settings.getboolean("shard_by_company", fallback=False)
+    except ValueError:
+        raise ConfigurationError(
+            "Invalid 'shard_by_company' in [settings] section, expected true or false"
+        )
+    try:
+        max_shards = settings.getint("max_shards", fallback=4)
+    except ValueError:
+        raise ConfigurationError("Invalid 'max_shards' in [settings] section, expected a number")
+    if max_shards < 1:
+        raise ConfigurationError("Invalid 'max_shards' in [settings] section, expected a number")
+    return shard_by_company, max_shards
+
+
+def create_client(
+    config: configparser.ConfigParser,
+    verbose_level: int = 0,
+    deadline: Optional[Deadline] = None,
+) -> Union[DefenderClient, MultiTenantClient]:
+    """Create a Defender client from configuration.
+
+    Args:
+        config: Loaded configuration
+        verbose_level: Verbosity level for logging
+        deadline: Optional execution deadline shared by all tenants
+
+    Returns:
+        Configured DefenderClient instance, or a MultiTenantClient when
+        several [tenant:NAME] sections are configured
+    """
+    tenants = get_tenants(config)
+    transport = get_transport_settings(config)
+    # All tenants of a check share the retry budget
+    retry = get_retry_policy(config, transport.retry_budget)
+    if len(tenants) == 1:
+        return _create_tenant_client(config, tenants[0], verbose_level, transport, retry, deadline)
+
+    return MultiTenantClient(
+        {
+            tenant.name: _create_tenant_client(
+                config, tenant, verbose_level, transport, retry, deadline
+            )
+            for tenant in tenants
+        },
+        verbose_level=verbose_level,
+    )
+
+
+def _create_tenant_client(
+    config: configparser.ConfigParser,
+    tenant: Tenant,
+    verbose_level: int,
+    transport: TransportSettings,
+    retry: RetryPolicy,
+    deadline: Optional[Deadline] = None,
+) -> DefenderClient:
+    """Create the DefenderClient of one tenant with the shared [settings] and [transport]."""
+    shard_by_company, max_shards = _get_sharding(config)
+
+    return DefenderClient(
+        tenant.token,
+        timeout=transport.read_timeout,
+        connect_timeout=transport.connect_timeout,
+        region=tenant.region,
+        verbose_level=verbose_level,
+        parent_id=tenant.parent_id,
+        cache=get_inventory_cache(config, verbose_level),
+        max_workers=transport.max_concurrency,
+        pool_size=transport.pool_size,
+        page_order=_get_page_order(config),
+        server_filter=_get_server_filter(config),
+        shard_by_company=shard_by_company,
+        max_shards=max_shards,
+        breaker=get_circuit_breaker(config, tenant.token, tenant.region, verbose_level),
+        retry=retry,
+        rate_limiter=get_rate_limiter(config, tenant, verbose_level),
+        hedge=get_hedge_policy(config),
+        deadline=deadline,
+    )
+
+
+def create_async_client(
+    config: configparser.ConfigParser, verbose_level: int = 0
+) -> "AsyncDefenderClient":
+    """Create an AsyncDefenderClient from configuration.
+
+    Uses the same tenant, [transport], [cache], [breaker], [retry] and
+    [ratelimit] settings as create_client.
+
+    Args:
+        config: Loaded configuration
+        verbose_level: Verbosity level for logging
+
+    Returns:
+        Configured AsyncDefenderClient instance
+
+    Raises:
+        ConfigurationError: If aiohttp is not installed or several tenants
+            are configured
+    """
+    from check_bitdefender.core.async_defender import AsyncDefenderClient
+
+    tenants = get_tenants(config)
+    if len(tenants) > 1:
+        raise ConfigurationError("The asyncio client supports a single tenant")
+    tenant = tenants[0]
+    transport = get_transport_settings(config)
+    return AsyncDefenderClient(
+        tenant.token,
+        timeout=transport.read_timeout,
+        connect_timeout=transport.connect_timeout,
+        region=tenant.region,
+        verbose_level=verbose_level,
+        parent_id=tenant.parent_id,
+        max_concurrency=transport.max_concurrency,
+        cache=get_inventory_cache(config, verbose_level),
+        breaker=get_circuit_breaker(config, tenant.token, tenant.region, verbose_level),
+        retry=get_retry_policy(config, transport.retry_budget),
+        rate_limiter=get_rate_limiter(config, tenant, verbose_level),
+    )
@@ -0,0 +1,122 @@
+"""Hedged requests for slow GravityZone inventory pages."""
+
+import configparser
+import math
+import threading
+from collections import deque
+from typing import Deque, Optional
+
+from check_bitdefender.core.exceptions import ConfigurationError
+
+
+class HedgePolicy:
+    """When to send a duplicate of a slow request, and how often.
+
+    A request that has not answered after the ``percentile`` of the recent
+    response times is sent a second time, and the first answer wins. Until
+    ``min_samples`` response times are known, ``initial_delay`` is used
+    instead. Duplicates are capped at ``max_ratio`` of the requests sent, so
+    a uniformly slow API does not get twice the load.
+    """
+
+    min_samples = 5
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.05,
+        max_ratio: float = 0.1,
+        window: int = 100,
+    ) -> None:
+        """Initialize policy.
+
+        Args:
+            percentile: Percentile of the recent response times to wait for
+                before hedging
+            initial_delay: Seconds to wait before hedging while too few
+                response times are known
+            min_delay: Seconds to wait at least before hedging
+            max_ratio: Maximum hedged requests per request sent
+            window: Number of recent response times kept
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.requests = 0
+        self.hedges = 0
+        # Hedged requests that answered before the original one
+        self.wins = 0
+        self._samples: Deque[float] = deque(maxlen=max(self.min_samples, window))
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Hedged requests per request sent."""
+        with self._lock:
+            return self.hedges / self.requests if self.requests else 0.0
+
+    def record(self, latency: float) -> None:
+        """Record the response time of a request."""
+        with self._lock:
+            self._samples.append(latency)
+
+    def delay(self) -> float:
+        """Get the seconds to wait for an answer before hedging."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < self.min_samples:
+            return max(self.min_delay, self.initial_delay)
+        index = max(0, math.ceil(self.percentile / 100 * len(samples)) - 1)
+        return max(self.min_delay, samples[index])
+
+    def start(self) -> None:
+        """Count a request about to be sent."""
+        with self._lock:
+            self.requests += 1
+
+    def try_hedge(self) -> bool:
+        """Count a hedged request if the cap allows it.
+
+        At least one request may always be hedged, so that short
+        inventories benefit too.
+        """
+        with self._lock:
+            if self.hedges + 1 > max(1.0, self.max_ratio * self.requests):
+                return False
+            self.hedges += 1
+            return True
+
+    def won(self) -> None:
+        """Count a hedged request that answered first."""
+        with self._lock:
+            self.wins += 1
+
+
+def get_hedge_policy(config: configparser.ConfigParser) -> Optional[HedgePolicy]:
+    """Get the hedge policy configured in the [hedge] section, if any."""
+    if not config.has_section("hedge"):
+        return None
+
+    section = config["hedge"]
+    try:
+        percentile = section.getfloat("percentile", fallback=95)
+        initial_delay = section.getfloat("initial_delay", fallback=1.0)
+        min_delay = section.getfloat("min_delay", fallback=0.05)
+        max_ratio = section.getfloat("max_ratio", fallback=0.1)
+    except ValueError as e:
+        raise ConfigurationError(f"Invalid value in [hedge] section: {e}")
+    if not 0 < percentile <= 100:
+        raise ConfigurationError("Invalid 'percentile' in [hedge] section, expected 1 to 100")
+    if initial_delay < 0 or min_delay < 0 or max_ratio < 0:
+        raise ConfigurationError("Invalid value in [hedge] section, expected positive numbers")
+
+    return HedgePolicy(
+        percentile=percentile,
+        initial_delay=initial_delay,
+        min_delay=min_delay,
+        max_ratio=max_ratio,
+    )
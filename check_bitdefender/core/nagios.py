@@ -1,7 +1,10 @@
 """Nagios plugin implementation."""
 
+import io
+import logging
 import nagiosplugin
-from typing import List, Optional, Union, Any
+from nagiosplugin.output import Output
+from typing import Dict, List, Optional, Tuple, Union, Any
 
 
 class DefenderScalarContext(nagiosplugin.ScalarContext):
@@ -118,17 +121,7 @@ class NagiosPlugin:
         """Execute the check and return Nagios exit code."""
         try:
             result = self.service.get_result(endpoint_id=endpoint_id, dns_name=dns_name)
-            value = result["value"]
-            details = result.get("details", [])
-
-            # Create Nagios check with custom summary
-            # Use 'found' as context name for detail command, otherwise use command name
-            context_name = "found" if self.command_name == "detail" else self.command_name
-            check = nagiosplugin.Check(
-                DefenderResource(self.command_name, value),
-                DefenderScalarContext(context_name, warning, critical),
-                DefenderSummary(details),
-            )
+            check = self._build_check(result, warning, critical)
 
             # Set verbosity
             check.verbosity = verbose
@@ -144,14 +137,109 @@ class NagiosPlugin:
             print(f"UNKNOWN: {str(e)}")
             return 3
 
+    def evaluate(
+        self,
+        endpoint_id: Optional[str] = None,
+        dns_name: Optional[str] = None,
+        warning: Optional[Union[float, int]] = None,
+        critical: Optional[Union[float, int]] = None,
+    ) -> Tuple[int, str]:
+        """Execute the check and return its exit code and output.
+
+        Produces the same output as check() without printing it or going
+        through the process-wide nagiosplugin runtime, so that many checks can
+        be evaluated in one process.
+
+        Returns:
+            Tuple of Nagios exit code and plugin output
+        """
+        try:
+            result = self.service.get_result(endpoint_id=endpoint_id, dns_name=dns_name)
+            check = self._build_check(result, warning, critical)
+            check()
+            output = Output(logging.StreamHandler(io.StringIO()))
+            output.add(check)
+            return check.exitcode, str(output)
+
+        except Exception as e:
+            return 3, f"UNKNOWN: {str(e)}\n"
+
+    def _build_check(
+        self,
+        result: Dict[str, Any],
+        warning: Optional[Union[float, int]],
+        critical: Optional[Union[float, int]],
+    ) -> nagiosplugin.Check:
+        """Create the Nagios check for a service result."""
+        value = result["value"]
+        details = list(result.get("details", []))
+
+        inventory_age, stale, offline = self._inventory_age()
+        if inventory_age is not None and offline:
+            details.append(
+                f"Note: GravityZone API unavailable, inventory data is {inventory_age:.0f}s old"
+            )
+        elif inventory_age is not None and stale:
+            details.append(f"Note: inventory data is {inventory_age:.0f}s old, refresh in progress")
+
+        # Create Nagios check with custom summary
+        # Use 'found' as context name for detail command, otherwise use command name
+        context_name = "found" if self.command_name == "detail" else self.command_name
+        metrics = self._transport_metrics()
+        check = nagiosplugin.Check(
+            DefenderResource(self.command_name, value, inventory_age, metrics),
+            DefenderScalarContext(context_name, warning, critical),
+            DefenderSummary(details),
+        )
+        if inventory_age is not None:
+            check.add(nagiosplugin.ScalarContext("inventory_age"))
+        for name in metrics:
+            check.add(nagiosplugin.ScalarContext(name))
+        return check
+
+    def _transport_metrics(self) -> Dict[str, Tuple[float, str]]:
+        """Get the transport metrics of the service's client, if it has any."""
+        client = getattr(self.service, "defender", None)
+        transport_metrics = getattr(client, "transport_metrics", None)
+        if not callable(transport_metrics):
+            return {}
+        metrics = transport_metrics()
+        return metrics if isinstance(metrics, dict) else {}
+
+    def _inventory_age(self) -> Tuple[Optional[float], bool, bool]:
+        """Get the age of the cached inventory the service was evaluated on.
+
+        Returns:
+            Tuple of the age in seconds, None when the inventory was not
+            served from the cache, whether it was past its TTL and whether
+            it replaced a failed refresh
+        """
+        client = getattr(self.service, "defender", None)
+        age = getattr(client, "inventory_age", None)
+        if isinstance(age, bool) or not isinstance(age, (int, float)):
+            return None, False, False
+        return (
+            float(age),
+            getattr(client, "inventory_stale", False) is True,
+            getattr(client, "inventory_offline", False) is True,
+        )
+
 
 class DefenderResource(nagiosplugin.Resource):
     """Defender resource for getting values with custom service name."""
 
-    def __init__(self, command_name: str, value: Union[int, float]) -> None:
+    def __init__(
+        self,
+        command_name: str,
+        value: Union[int, float],
+        inventory_age: Optional[float] = None,
+        metrics: Optional[Dict[str, Tuple[float, str]]] = None,
+    ) -> None:
         super().__init__()
         self.command_name = command_name
         self.value = value
+        self.inventory_age = inventory_age
+        self.metrics = metrics or {}
 
     @property
     def name(self) -> str:
@@ -161,4 +249,11 @@ class DefenderResource(nagiosplugin.Resource):
     def probe(self) -> List[nagiosplugin.Metric]:
         # Use 'found' as metric name for detail command, otherwise use command name
         metric_name = "found" if self.command_name == "detail" else self.command_name
-        return [nagiosplugin.Metric(metric_name, self.value)]
+        metrics = [nagiosplugin.Metric(metric_name, self.value)]
+        if self.inventory_age is not None:
+            metrics.append(
+                nagiosplugin.Metric("inventory_age", round(self.inventory_age), uom="s", min=0)
+            )
+        for name, (metric_value, uom) in self.metrics.items():
+            metrics.append(nagiosplugin.Metric(name, metric_value, uom=uom or None))
+        return metrics
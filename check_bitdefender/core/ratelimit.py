@@ -0,0 +1,162 @@
+"""Token bucket rate limiter for GravityZone calls, shared across processes."""
+
+import configparser
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from check_bitdefender.core.auth import TENANT_SECTION_PREFIX, Tenant
+from check_bitdefender.core.exceptions import ConfigurationError
+from check_bitdefender.core.logging_config import get_verbose_logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class RateLimiter:
+    """Token bucket holding up to ``burst`` tokens refilled at ``rate`` per second.
+
+    All check processes using the same API token share the bucket through a
+    small JSON state file, updated under an exclusive lock. A request takes
+    one token. When the bucket is empty the token is reserved anyway, which
+    drives the level below zero, and the caller sleeps until it is refilled,
+    so waiting processes are served in arrival order without polling.
+    """
+
+    def __init__(self, path: str, rate: float, burst: float = 1, verbose_level: int = 0) -> None:
+        """Initialize limiter.
+
+        Args:
+            path: State file shared by all processes using the same API token
+            rate: Requests per second
+            burst: Requests that may be sent at once after an idle period
+            verbose_level: Verbosity level for logging
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.path = path
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.logger = get_verbose_logger(__name__, verbose_level)
+        # Seconds this process waited for tokens
+        self.waited = 0.0
+        self._waited_lock = threading.Lock()
+
+    def _reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """Take a token from the shared bucket.
+
+        Args:
+            max_wait: Seconds the caller can wait at most, the token is not
+                taken if it would be available later
+
+        Returns:
+            Seconds to wait until the token is available, None if the token
+            was not taken
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                state = json.loads(os.read(fd, 4096) or b"{}")
+                tokens = float(state["tokens"])
+                updated = float(state["updated"])
+            except (ValueError, KeyError, TypeError):
+                tokens, updated = self.burst, 0.0
+
+            now = time.time()
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate) - 1
+            if max_wait is not None and -tokens / self.rate > max_wait:
+                return None
+            payload = json.dumps({"tokens": tokens, "updated": now}).encode()
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, payload)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        return max(0.0, -tokens / self.rate)
+
+    def acquire(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """Wait for a token.
+
+        Args:
+            max_wait: Seconds the caller can wait at most
+
+        Returns:
+            Seconds waited, None without waiting if the token would not be
+            available within max_wait
+        """
+        try:
+            wait = self._reserve(max_wait)
+        except OSError as e:
+            # An unusable state file must not fail the check
+            self.logger.warning(f"Rate limiter state {self.path} unavailable: {e}")
+            return 0.0
+        if wait is None:
+            self.logger.warning(f"Rate limited for more than {max_wait:.2f}s, giving up")
+            return None
+        if wait > 0:
+            self.logger.info(f"Rate limited, waiting {wait:.2f}s for a request token")
+            time.sleep(wait)
+            with self._waited_lock:
+                self.waited += wait
+        return wait
+
+
+def get_rate_limiter(
+    config: configparser.ConfigParser, tenant: Tenant, verbose_level: int = 0
+) -> Optional[RateLimiter]:
+    """Get the rate limiter of a tenant, if configured.
+
+    ``rate`` and ``burst`` come from the [ratelimit] section, and the
+    tenant's own ``[tenant:NAME]`` section may override them. Every API
+    token gets its own bucket, named after a hash of the token.
+
+    Args:
+        config: Loaded configuration
+        tenant: Tenant whose requests are limited
+        verbose_level: Verbosity level for logging
+    """
+    sections = [config["ratelimit"]] if config.has_section("ratelimit") else []
+    tenant_section = f"{TENANT_SECTION_PREFIX}{tenant.name}"
+    if config.has_section(tenant_section):
+        sections.append(config[tenant_section])
+
+    rate: Optional[float] = None
+    burst: Optional[float] = None
+    for section in sections:
+        try:
+            rate = section.getfloat("rate", fallback=rate)
+            burst = section.getfloat("burst", fallback=burst)
+        except ValueError:
+            raise ConfigurationError(
+                f"Invalid 'rate' or 'burst' in [{section.name}] section, expected a number"
+            )
+    if not rate:
+        return None
+    if rate < 0 or (burst is not None and burst < 1):
+        raise ConfigurationError("Invalid rate limit, expected a positive rate and burst")
+
+    directory = (
+        config["ratelimit"].get("state_dir") if config.has_section("ratelimit") else None
+    ) or (config["cache"].get("dir") if config.has_section("cache") else None)
+    if not directory:
+        raise ConfigurationError(
+            "Missing 'state_dir' in [ratelimit] section and no [cache] dir to default to"
+        )
+
+    key = hashlib.sha256(f"{tenant.region}\0{tenant.token}".encode()).hexdigest()[:32]
+    return RateLimiter(
+        os.path.join(directory, f"ratelimit-{key}.json"),
+        rate,
+        burst=burst if burst is not None else rate,
+        verbose_level=verbose_level,
+    )
@@ -0,0 +1,157 @@
+"""Retry policy for GravityZone requests."""
+
+import configparser
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+from check_bitdefender.core.exceptions import ConfigurationError
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by a time budget.
+
+    The n-th retry of a request waits a random delay between 0 and
+    ``min(backoff_max, backoff * 2 ** n)`` seconds, or the delay asked by a
+    ``Retry-After`` header. All retries of a client draw from one shared
+    ``budget`` of seconds: a retry whose delay does not fit in what is left
+    is not attempted, so a struggling API cannot hold a check much longer
+    than planned.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        backoff_max: float = 10,
+        budget: float = 30,
+        statuses: Tuple[int, ...] = RETRY_STATUSES,
+    ) -> None:
+        """Initialize policy.
+
+        Args:
+            max_attempts: Attempts per request, including the first one
+            backoff: Base delay in seconds of the first retry
+            backoff_max: Maximum delay in seconds of a single retry
+            budget: Seconds all retries may spend waiting together
+            statuses: HTTP statuses that are retried
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.budget = budget
+        self.statuses = statuses
+        self._spent = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left in the retry budget."""
+        with self._lock:
+            return max(0.0, self.budget - self._spent)
+
+    def reset(self) -> None:
+        """Give the whole budget back, when a long-running process starts a new check."""
+        with self._lock:
+            self._spent = 0.0
+
+    def delay(self, retry: int, retry_after: Optional[str] = None) -> float:
+        """Get the delay before a retry.
+
+        Args:
+            retry: Number of the retry, starting at 0
+            retry_after: Optional Retry-After header value
+        """
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            return requested
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2**retry))
+
+    def reserve(self, retry: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """Reserve the delay of a retry from the budget.
+
+        Args:
+            retry: Number of the retry, starting at 0
+            retry_after: Optional Retry-After header value
+
+        Returns:
+            Seconds to wait before retrying, or None if the request must
+            not be retried
+        """
+        if retry + 1 >= self.max_attempts:
+            return None
+        delay = self.delay(retry, retry_after)
+        with self._lock:
+            if self._spent + delay > self.budget:
+                return None
+            self._spent += delay
+        return delay
+
+    def sleep(self, delay: float) -> None:
+        """Wait before a retry."""
+        time.sleep(delay)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header, in seconds or as an HTTP date.
+
+    Returns:
+        Seconds to wait, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def get_retry_policy(
+    config: configparser.ConfigParser, budget: Optional[float] = None
+) -> RetryPolicy:
+    """Get the retry policy configured in the [retry] section, or the default one.
+
+    Args:
+        config: Loaded configuration
+        budget: Optional retry budget in seconds overriding the [retry] one
+    """
+    if not config.has_section("retry"):
+        return RetryPolicy() if budget is None else RetryPolicy(budget=budget)
+
+    section = config["retry"]
+    try:
+        max_attempts = section.getint("max_attempts", fallback=3)
+        backoff = section.getfloat("backoff", fallback=0.5)
+        backoff_max = section.getfloat("backoff_max", fallback=10)
+        if budget is None:
+            budget = section.getfloat("budget", fallback=30)
+    except ValueError as e:
+        raise ConfigurationError(f"Invalid value in [retry] section: {e}")
+    if max_attempts < 1 or backoff < 0 or backoff_max < 0 or budget < 0:
+        raise ConfigurationError("Invalid value in [retry] section, expected positive numbers")
+
+    statuses: Tuple[int, ...] = RETRY_STATUSES
+    if section.get("statuses"):
+        try:
+            statuses = tuple(int(status) for status in section["statuses"].split(","))
+        except ValueError:
+            raise ConfigurationError(
+                "Invalid 'statuses' in [retry] section, expected comma-separated HTTP statuses"
+            )
+
+    return RetryPolicy(
+        max_attempts=max_attempts,
+        backoff=backoff,
+        backoff_max=backoff_max,
+        budget=budget,
+        statuses=statuses,
+    )
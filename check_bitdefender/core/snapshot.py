@@ -0,0 +1,88 @@
+"""In-memory inventory snapshot for long-running and bulk evaluations."""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from check_bitdefender.core.defender import EndpointClient
+from check_bitdefender.core.exceptions import DefenderAPIError
+from check_bitdefender.core.logging_config import get_verbose_logger
+from check_bitdefender.services.endpoint_index import EndpointIndex
+
+
+class SnapshotClient:
+    """Defender client serving list_endpoints from an in-memory snapshot.
+
+    The inventory is fetched once through the wrapped DefenderClient and kept
+    until refresh() is called, so any number of service evaluations share a
+    single inventory download. Endpoint details are delegated to the wrapped
+    client, unless they were fetched ahead in bulk with prefetch_details().
+    """
+
+    def __init__(self, client: EndpointClient, verbose_level: int = 0) -> None:
+        """Initialize with the client used to fetch the inventory.
+
+        Args:
+            client: DefenderClient, or any EndpointClient
+            verbose_level: Verbosity level for logging
+        """
+        self.client = client
+        self.logger = get_verbose_logger(__name__, verbose_level)
+        self._lock = threading.Lock()
+        self._inventory: Optional[Dict[str, Any]] = None
+        self._details: Dict[str, Union[Dict[str, Any], DefenderAPIError]] = {}
+        self.fetched_at: Optional[float] = None
+
+    def refresh(self) -> Dict[str, Any]:
+        """Fetch the inventory and replace the snapshot.
+
+        Raises:
+            DefenderAPIError: If the API request fails, the previous snapshot is kept
+        """
+        self.logger.method_entry("refresh")
+        inventory = self.client.list_endpoints()
+        with self._lock:
+            self._inventory = inventory
+            self._details = {}
+            self.fetched_at = time.time()
+        count = len(inventory.get("value", []))
+        self.logger.info(f"Inventory snapshot refreshed: {count} endpoints")
+        self.logger.method_exit("refresh")
+        return inventory
+
+    def list_endpoints(self, parent_id: Optional[str] = None) -> Dict[str, Any]:
+        """Return the snapshot, fetching it on first use."""
+        with self._lock:
+            inventory = self._inventory
+        if inventory is None:
+            inventory = self.refresh()
+        return inventory
+
+    def find_endpoint(
+        self, fqdn: Optional[str] = None, endpoint_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find an endpoint in the snapshot, see DefenderClient.find_endpoint."""
+        return EndpointIndex.of(self.list_endpoints()).lookup(endpoint_id, fqdn)
+
+    def prefetch_details(self, endpoint_ids: List[str]) -> None:
+        """Fetch details of many endpoints with batched requests.
+
+        Args:
+            endpoint_ids: Endpoint IDs whose details will be requested next
+        """
+        missing = [endpoint_id for endpoint_id in endpoint_ids if endpoint_id not in self._details]
+        if missing:
+            self._details.update(self.client.get_endpoints_details(missing))
+
+    def get_endpoint_details(self, endpoint_id: str) -> Dict[str, Any]:
+        """Get prefetched endpoint details, or request them from the wrapped client.
+
+        Raises:
+            DefenderAPIError: If the details could not be retrieved
+        """
+        details = self._details.get(endpoint_id)
+        if isinstance(details, DefenderAPIError):
+            raise details
+        if details is not None:
+            return details
+        return self.client.get_endpoint_details(endpoint_id)
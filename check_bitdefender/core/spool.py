@@ -0,0 +1,122 @@
+"""Write passive check results into the Nagios/Naemon checkresults spool."""
+
+import os
+import secrets
+import string
+import tempfile
+import time
+from typing import Iterable, List
+
+from check_bitdefender.core.bulk import CheckResult
+from check_bitdefender.core.logging_config import get_verbose_logger
+
+# Nagios only picks up files named 'c' followed by six characters
+_NAME_CHARS = string.ascii_letters + string.digits
+_NAME_ATTEMPTS = 100
+
+
+def escape_output(output: str) -> str:
+    """Escape plugin output like Nagios does for checkresult files."""
+    return output.rstrip("\n").replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def format_checkresult(result: CheckResult, service_description: str) -> str:
+    """Format one passive service check result block."""
+    return (
+        "### Nagios Service Check Result ###\n"
+        f"# Time: {time.ctime(result.timestamp)}\n"
+        f"host_name={result.host_name}\n"
+        f"service_description={service_description}\n"
+        "check_type=1\n"
+        "check_options=0\n"
+        "scheduled_check=0\n"
+        "reschedule_check=0\n"
+        "latency=0.0\n"
+        f"start_time={result.timestamp:.6f}\n"
+        f"finish_time={result.timestamp:.6f}\n"
+        "early_timeout=0\n"
+        "exited_ok=1\n"
+        f"return_code={result.exit_code}\n"
+        f"output={escape_output(result.output)}\n"
+        "\n"
+    )
+
+
+class CheckResultSpool:
+    """Write check results as checkresult files with their .ok companions.
+
+    Results are grouped into files of ``batch_size`` results. Each file is
+    written under a hidden temporary name and linked to its final ``cXXXXXX``
+    name once complete, and only then is the ``.ok`` file created, so Nagios
+    never reads a partial file.
+    """
+
+    def __init__(self, directory: str, batch_size: int = 500, verbose_level: int = 0) -> None:
+        """Initialize spool writer.
+
+        Args:
+            directory: Nagios check_result_path
+            batch_size: Maximum number of results per checkresult file
+            verbose_level: Verbosity level for logging
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.directory = directory
+        self.batch_size = batch_size
+        self.logger = get_verbose_logger(__name__, verbose_level)
+
+    def write(self, results: Iterable[CheckResult], service_prefix: str = "BITDEFENDER_") -> int:
+        """Write results into the spool.
+
+        Args:
+            results: Check results to write
+            service_prefix: Prefix of the service description, followed by
+                the upper-cased check name
+
+        Returns:
+            Number of results written
+        """
+        count = 0
+        batch: List[str] = []
+        for result in results:
+            batch.append(format_checkresult(result, f"{service_prefix}{result.check.upper()}"))
+            if len(batch) >= self.batch_size:
+                self._write_file(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._write_file(batch)
+            count += len(batch)
+        return count
+
+    def _write_file(self, blocks: List[str]) -> str:
+        """Atomically publish one checkresult file and its .ok file."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".check_bitdefender-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("### Active Check Result File ###\n")
+                f.write(f"file_time={int(time.time())}\n\n")
+                f.writelines(blocks)
+                f.flush()
+                os.fsync(f.fileno())
+            path = self._link_unique(tmp_path)
+        finally:
+            os.unlink(tmp_path)
+
+        with open(f"{path}.ok", "w"):
+            pass
+        self.logger.debug(f"Wrote {len(blocks)} check results to {path}")
+        return path
+
+    def _link_unique(self, tmp_path: str) -> str:
+        """Hard link a file to a new, unused checkresult file name."""
+        for _ in range(_NAME_ATTEMPTS):
+            name = "c" + "".join(secrets.choice(_NAME_CHARS) for _ in range(6))
+            path = os.path.join(self.directory, name)
+            try:
+                # Unlike rename, link never replaces a file Nagios has not read yet
+                os.link(tmp_path, path)
+                return path
+            except FileExistsError:
+                continue
+        raise OSError(f"No free checkresult file name in {self.directory}")
@@ -0,0 +1,343 @@
+"""SQLite inventory store shared across plugin processes."""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from check_bitdefender.core.cache import CACHE_FORMAT_VERSION, InventoryCache
+from check_bitdefender.services.endpoint_index import short_hostname
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS snapshots ("
+    " key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, meta TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS endpoints ("
+    " key TEXT NOT NULL, id TEXT NOT NULL, position INTEGER NOT NULL,"
+    " fqdn TEXT, fqdn_lower TEXT, short_name TEXT, data TEXT NOT NULL,"
+    " PRIMARY KEY (key, id))",
+    "CREATE INDEX IF NOT EXISTS endpoints_fqdn ON endpoints (key, fqdn)",
+    "CREATE INDEX IF NOT EXISTS endpoints_fqdn_lower ON endpoints (key, fqdn_lower)",
+    "CREATE INDEX IF NOT EXISTS endpoints_short_name ON endpoints (key, short_name)",
+    "CREATE TABLE IF NOT EXISTS details ("
+    " key TEXT NOT NULL, id TEXT NOT NULL, fetched_at REAL NOT NULL, data TEXT NOT NULL,"
+    " PRIMARY KEY (key, id))",
+)
+
+# Endpoint ids per query, below SQLite's limit of bound parameters
+_CHUNK = 500
+
+
+class InventoryStore(InventoryCache):
+    """Inventory cache keeping one SQLite row per endpoint.
+
+    A drop-in replacement of the JSON cache for large inventories, where
+    parsing the whole snapshot in every check process gets expensive. Every
+    endpoint is a row indexed by id, fqdn, lower-cased fqdn and short
+    hostname, so find() resolves a host with a few indexed SELECTs instead of
+    loading the inventory. Endpoint details are kept alongside, as long as
+    the inventory TTL.
+
+    A sync is one transaction upserting the endpoints that changed and
+    deleting those that are gone. The database is in WAL mode, so readers
+    never block the syncing writer nor the other way around. Refresh
+    locking, grace and offline fallback work as for the JSON cache.
+    """
+
+    def __init__(self, directory: str, *args: Any, **kwargs: Any) -> None:
+        """Initialize store, see InventoryCache for the arguments."""
+        super().__init__(directory, *args, **kwargs)
+        self.database = os.path.join(directory, "inventory.sqlite3")
+        self._schema_ready = False
+
+    def path(self, key: str) -> str:
+        """Get the path of the database holding the snapshots."""
+        return self.database
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, creating the database on first use.
+
+        Connections are not shared between calls, so threads and forked
+        processes never use one concurrently.
+        """
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        conn = sqlite3.connect(self.database, timeout=self.lock_timeout, isolation_level=None)
+        try:
+            if not self._schema_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    for statement in _SCHEMA:
+                        conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                self._schema_ready = True
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in a write transaction, committed on success."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _snapshot_age(self, key: str) -> Optional[float]:
+        """Get the age of a snapshot without loading it.
+
+        Returns:
+            Age in seconds, or None if there is no readable snapshot
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT fetched_at FROM snapshots WHERE key = ?", (key,)
+                ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"Ignoring unreadable inventory store {self.database}: {e}")
+            return None
+        return None if row is None else max(0.0, time.time() - row[0])
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a snapshot regardless of its age.
+
+        Returns:
+            Entry with ``fetched_at`` (epoch seconds) and ``data`` keys,
+            or None if there is no readable snapshot
+        """
+        try:
+            with self._connect() as conn:
+                # One read transaction, so the rows match the snapshot row
+                conn.execute("BEGIN")
+                row = conn.execute(
+                    "SELECT fetched_at, meta FROM snapshots WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                endpoints = [
+                    json.loads(data)
+                    for (data,) in conn.execute(
+                        "SELECT data FROM endpoints WHERE key = ? ORDER BY position", (key,)
+                    )
+                ]
+                conn.execute("COMMIT")
+        except (sqlite3.Error, OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable inventory store {self.database}: {e}")
+            return None
+
+        data = json.loads(row[1])
+        data["value"] = endpoints
+        return {"version": CACHE_FORMAT_VERSION, "fetched_at": row[0], "data": data}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the snapshot if present and younger than the TTL."""
+        age = self._snapshot_age(key)
+        if age is None or age >= self.ttl:
+            self.logger.debug(f"Cache miss or expired: {key}")
+            return None
+        return super().get(key)
+
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        """Sync a snapshot in a single transaction.
+
+        Endpoints whose row is unchanged are not rewritten, and the rows of
+        endpoints no longer in the inventory are deleted.
+
+        Raises:
+            OSError: If the database cannot be written
+        """
+        rows: List[Tuple[Any, ...]] = []
+        seen = set()
+        for position, endpoint in enumerate(data.get("value") or []):
+            endpoint_id = endpoint.get("id") or f"#{position}"
+            if endpoint_id in seen:
+                # The first one wins, as in EndpointIndex
+                continue
+            seen.add(endpoint_id)
+            fqdn = endpoint.get("fqdn") or None
+            rows.append(
+                (
+                    key,
+                    endpoint_id,
+                    position,
+                    fqdn,
+                    fqdn.lower() if fqdn else None,
+                    short_hostname(fqdn) if fqdn else None,
+                    json.dumps(endpoint, sort_keys=True),
+                )
+            )
+        meta = json.dumps({name: value for name, value in data.items() if name != "value"})
+
+        try:
+            with self._transaction() as conn:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS synced (id TEXT PRIMARY KEY)")
+                conn.execute("DELETE FROM synced")
+                conn.executemany("INSERT INTO synced VALUES (?)", ((row[1],) for row in rows))
+                conn.executemany(
+                    "INSERT INTO endpoints (key, id, position, fqdn, fqdn_lower, short_name, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (key, id) DO UPDATE SET position = excluded.position,"
+                    " fqdn = excluded.fqdn, fqdn_lower = excluded.fqdn_lower,"
+                    " short_name = excluded.short_name, data = excluded.data"
+                    " WHERE position IS NOT excluded.position OR data IS NOT excluded.data",
+                    rows,
+                )
+                deleted = conn.execute(
+                    "DELETE FROM endpoints WHERE key = ? AND id NOT IN (SELECT id FROM synced)",
+                    (key,),
+                ).rowcount
+                conn.execute(
+                    "INSERT INTO snapshots (key, fetched_at, meta) VALUES (?, ?, ?)"
+                    " ON CONFLICT (key) DO UPDATE SET"
+                    " fetched_at = excluded.fetched_at, meta = excluded.meta",
+                    (key, time.time(), meta),
+                )
+        except sqlite3.Error as e:
+            raise OSError(f"Failed to write inventory store {self.database}: {e}") from e
+        self.logger.debug(f"Cache updated: {key} ({len(rows)} endpoints, {deleted} deleted)")
+
+    def find(
+        self,
+        key: str,
+        fetch: Callable[[], Dict[str, Any]],
+        endpoint_id: Optional[str] = None,
+        dns_name: Optional[str] = None,
+        max_wait: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Find an endpoint with indexed queries, without loading the inventory.
+
+        A fresh snapshot, or a stale one within the grace period while it is
+        refreshed in the background, is queried directly. Otherwise the
+        inventory is refreshed as by get_or_fetch and searched in memory.
+
+        Returns:
+            The endpoint in the list_endpoints format, or None if not found
+
+        Raises:
+            DefenderAPIError: If the inventory cannot be fetched or served
+        """
+        age = self._snapshot_age(key)
+        if age is not None and age < self.ttl + self.grace:
+            try:
+                endpoint = self.lookup(key, endpoint_id, dns_name)
+            except (sqlite3.Error, OSError, ValueError) as e:
+                self.logger.warning(f"Failed to query inventory store {self.database}: {e}")
+            else:
+                if age < self.ttl:
+                    self.logger.info(f"Using cached inventory (age {age:.0f}s)")
+                    self._served(age, stale=False)
+                    return endpoint
+                if self.spawn_refresh(key, fetch):
+                    self.logger.warning(
+                        "Inventory expired, refreshing in the background, "
+                        f"using stale inventory (age {age:.0f}s)"
+                    )
+                    self._served(age, stale=True)
+                    return endpoint
+        return super().find(key, fetch, endpoint_id, dns_name, max_wait)
+
+    def lookup(
+        self, key: str, endpoint_id: Optional[str] = None, dns_name: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find an endpoint of a snapshot, matching like EndpointIndex.lookup.
+
+        Returns:
+            The endpoint in the list_endpoints format, or None if not found
+
+        Raises:
+            sqlite3.Error: If the database cannot be read
+        """
+        with self._connect() as conn:
+
+            def first(column: str, value: str) -> Optional[Dict[str, Any]]:
+                row = conn.execute(
+                    f"SELECT data FROM endpoints WHERE key = ? AND {column} = ?"
+                    " ORDER BY position LIMIT 1",
+                    (key, value),
+                ).fetchone()
+                return None if row is None else dict(json.loads(row[0]))
+
+            if endpoint_id:
+                endpoint = first("id", endpoint_id)
+                if endpoint is not None:
+                    return endpoint
+
+            if not dns_name:
+                return None
+
+            endpoint = first("fqdn", dns_name) or first("fqdn_lower", dns_name.lower())
+            if endpoint is not None:
+                return endpoint
+
+            short = short_hostname(dns_name)
+            if "." in dns_name:
+                # Qualified name: only match endpoints registered without a domain
+                return first("fqdn_lower", short)
+
+            rows = conn.execute(
+                "SELECT data FROM endpoints WHERE key = ? AND short_name = ?"
+                " ORDER BY position LIMIT 2",
+                (key, short),
+            ).fetchall()
+        # A short hostname shared by several endpoints is ambiguous
+        return dict(json.loads(rows[0][0])) if len(rows) == 1 else None
+
+    def get_details(self, key: str, endpoint_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the stored details of endpoints younger than the TTL.
+
+        Returns:
+            Details per endpoint ID, for the endpoints that have fresh ones
+        """
+        details: Dict[str, Dict[str, Any]] = {}
+        oldest = time.time() - self.ttl
+        try:
+            with self._connect() as conn:
+                for start in range(0, len(endpoint_ids), _CHUNK):
+                    end = start + _CHUNK
+                    chunk = endpoint_ids[start:end]
+                    placeholders = ", ".join("?" * len(chunk))
+                    for endpoint_id, data in conn.execute(
+                        f"SELECT id, data FROM details WHERE key = ? AND fetched_at > ?"
+                        f" AND id IN ({placeholders})",
+                        (key, oldest, *chunk),
+                    ):
+                        details[endpoint_id] = json.loads(data)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable inventory store {self.database}: {e}")
+            return {}
+        if details:
+            self.logger.debug(f"Using stored details of {len(details)} endpoints")
+        return details
+
+    def set_details(self, key: str, details: Dict[str, Dict[str, Any]]) -> None:
+        """Store the details of endpoints in a single transaction.
+
+        Details past the TTL are deleted on the way.
+        """
+        now = time.time()
+        try:
+            with self._transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO details (key, id, fetched_at, data) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (key, id) DO UPDATE SET"
+                    " fetched_at = excluded.fetched_at, data = excluded.data",
+                    (
+                        (key, endpoint_id, now, json.dumps(data, sort_keys=True))
+                        for endpoint_id, data in details.items()
+                    ),
+                )
+                conn.execute(
+                    "DELETE FROM details WHERE key = ? AND fetched_at <= ?", (key, now - self.ttl)
+                )
+        except (sqlite3.Error, OSError) as e:
+            # A read-only or full cache directory must not fail the check
+            self.logger.warning(f"Failed to write inventory store {self.database}: {e}")
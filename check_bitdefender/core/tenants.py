@@ -0,0 +1,267 @@
+"""Defender client spanning several GravityZone accounts."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
+
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import DefenderAPIError
+from check_bitdefender.core.logging_config import get_verbose_logger
+
+T = TypeVar("T")
+
+
+class MultiTenantClient:
+    """Client querying several GravityZone accounts as one inventory.
+
+    Holds one DefenderClient per tenant and runs the same call against all of
+    them concurrently. Endpoints carry the ``tenant`` they belong to, and
+    endpoint details are requested from the tenant that owns the endpoint.
+    When several tenants know the same host, the first tenant in
+    configuration order wins.
+    """
+
+    def __init__(self, clients: Dict[str, DefenderClient], verbose_level: int = 0) -> None:
+        """Initialize with the client of every tenant.
+
+        Args:
+            clients: DefenderClient per tenant name, in lookup order
+            verbose_level: Verbosity level for logging
+        """
+        if not clients:
+            raise ValueError("At least one tenant client is required")
+        self.clients = clients
+        self.logger = get_verbose_logger(__name__, verbose_level)
+        # Tenant of every endpoint seen in an inventory or lookup
+        self._owners: Dict[str, str] = {}
+
+    @property
+    def inventory_age(self) -> Optional[float]:
+        """Age of the oldest cached inventory last served, None if all were fetched live."""
+        ages = [c.inventory_age for c in self.clients.values() if c.inventory_age is not None]
+        return max(ages) if ages else None
+
+    @property
+    def inventory_stale(self) -> bool:
+        """Whether any cached inventory last served was past its TTL."""
+        return any(client.inventory_stale for client in self.clients.values())
+
+    @property
+    def inventory_offline(self) -> bool:
+        """Whether any cached inventory last served replaced a failed refresh."""
+        return any(client.inventory_offline for client in self.clients.values())
+
+    def transport_metrics(self) -> Dict[str, Tuple[float, str]]:
+        """Get the transport metrics of every tenant.
+
+        Returns:
+            The worst value of each metric across tenants, see
+            DefenderClient.transport_metrics
+        """
+        metrics: Dict[str, Tuple[float, str]] = {}
+        for client in self.clients.values():
+            for name, (value, uom) in client.transport_metrics().items():
+                if name not in metrics or value > metrics[name][0]:
+                    metrics[name] = (value, uom)
+        return metrics
+
+    def reset_retry_budget(self) -> None:
+        """Restore the retry budget of every tenant, see DefenderClient.reset_retry_budget."""
+        for client in self.clients.values():
+            client.reset_retry_budget()
+
+    def close(self) -> None:
+        """Close the clients of every tenant."""
+        for client in self.clients.values():
+            client.close()
+
+    def __enter__(self) -> "MultiTenantClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _map(
+        self, call: Callable[[str, DefenderClient], T], tenants: Optional[List[str]] = None
+    ) -> Dict[str, Union[T, DefenderAPIError]]:
+        """Run a call with the name and client of every tenant concurrently.
+
+        Returns:
+            Result or DefenderAPIError per tenant name, in tenant order
+        """
+        names = tenants if tenants is not None else list(self.clients)
+        if not names:
+            return {}
+
+        def run(name: str) -> Union[T, DefenderAPIError]:
+            try:
+                return call(name, self.clients[name])
+            except DefenderAPIError as e:
+                self.logger.error(f"Tenant {name}: {e}")
+                # Keep the error type, e.g. for an exceeded deadline
+                return type(e)(f"Tenant {name}: {e}")
+
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            return dict(zip(names, executor.map(run, names)))
+
+    def _tag(self, endpoint: Dict[str, Any], tenant: str) -> Dict[str, Any]:
+        """Record the tenant of an endpoint."""
+        endpoint["tenant"] = tenant
+        if endpoint.get("id"):
+            self._owners[endpoint["id"]] = tenant
+        return endpoint
+
+    def list_endpoints_by_tenant(self) -> Dict[str, Dict[str, Any]]:
+        """Fetch the inventory of every tenant concurrently.
+
+        Returns:
+            list_endpoints response per tenant name, in tenant order
+
+        Raises:
+            DefenderAPIError: If the inventory of any tenant cannot be fetched
+        """
+        self.logger.method_entry("list_endpoints_by_tenant", tenants=len(self.clients))
+        responses = self._map(lambda name, client: client.list_endpoints())
+
+        inventories: Dict[str, Dict[str, Any]] = {}
+        for name, response in responses.items():
+            if isinstance(response, DefenderAPIError):
+                raise response
+            for endpoint in response.get("value", []):
+                self._tag(endpoint, name)
+            inventories[name] = response
+
+        self.logger.method_exit("list_endpoints_by_tenant")
+        return inventories
+
+    def list_endpoints(self, parent_id: Optional[str] = None) -> Dict[str, Any]:
+        """List the endpoints of every tenant as one inventory.
+
+        Args:
+            parent_id: Ignored, every tenant has its own parent_id
+
+        Returns:
+            Dictionary with the merged endpoint list in tenant order, see
+            DefenderClient.list_endpoints. Every endpoint has a ``tenant`` key.
+
+        Raises:
+            DefenderAPIError: If the inventory of any tenant cannot be fetched
+        """
+        inventories = self.list_endpoints_by_tenant()
+        return {
+            "value": [
+                endpoint
+                for inventory in inventories.values()
+                for endpoint in inventory.get("value", [])
+            ]
+        }
+
+    def iter_endpoints(self, parent_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the endpoints of every tenant, one tenant after the other.
+
+        Args:
+            parent_id: Ignored, every tenant has its own parent_id
+
+        Yields:
+            Endpoints in the list_endpoints format, each with a ``tenant`` key
+
+        Raises:
+            DefenderAPIError: If the inventory of a tenant cannot be fetched
+        """
+        for name, client in self.clients.items():
+            for endpoint in client.iter_endpoints():
+                yield self._tag(endpoint, name)
+
+    def find_endpoint(
+        self, fqdn: Optional[str] = None, endpoint_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find an endpoint in any tenant, see DefenderClient.find_endpoint.
+
+        Every tenant is searched concurrently.
+
+        Raises:
+            DefenderAPIError: If the endpoint was not found and a tenant
+                could not be searched
+        """
+        self.logger.method_entry("find_endpoint", fqdn=fqdn, endpoint_id=endpoint_id)
+        matches = self._map(
+            lambda name, client: client.find_endpoint(fqdn=fqdn, endpoint_id=endpoint_id)
+        )
+
+        error: Optional[DefenderAPIError] = None
+        found: Optional[Dict[str, Any]] = None
+        found_by_id = False
+        for name, match in matches.items():
+            if isinstance(match, DefenderAPIError):
+                error = error or match
+                continue
+            if match is None or found_by_id:
+                continue
+            by_id = bool(endpoint_id) and match.get("id") == endpoint_id
+            # The id takes precedence over a name match in an earlier tenant
+            if found is None or by_id:
+                found = self._tag(match, name)
+                found_by_id = by_id
+
+        if found is None and error is not None:
+            raise error
+        self.logger.method_exit("find_endpoint", found.get("tenant") if found else None)
+        return found
+
+    def get_endpoint_details(self, endpoint_id: str) -> Dict[str, Any]:
+        """Get endpoint details from the tenant owning the endpoint.
+
+        Tenants are tried in order when the owner is not known yet.
+
+        Raises:
+            DefenderAPIError: If no tenant returned the details
+        """
+        owner = self._owners.get(endpoint_id)
+        if owner is not None:
+            return self.clients[owner].get_endpoint_details(endpoint_id)
+
+        error: Optional[DefenderAPIError] = None
+        for name, client in self.clients.items():
+            try:
+                details = client.get_endpoint_details(endpoint_id)
+            except DefenderAPIError as e:
+                error = error or e
+                continue
+            self._owners[endpoint_id] = name
+            return details
+        raise error or DefenderAPIError(f"Failed to get endpoint details: {endpoint_id}")
+
+    def get_endpoints_details(
+        self, endpoint_ids: List[str]
+    ) -> Dict[str, Union[Dict[str, Any], DefenderAPIError]]:
+        """Get many endpoint details, batched per tenant.
+
+        The tenants are queried concurrently. Endpoints of unknown tenants are
+        requested from every tenant.
+
+        Returns:
+            Dictionary mapping each endpoint ID to its details or to the
+            DefenderAPIError that prevented retrieving them
+        """
+        per_tenant: Dict[str, List[str]] = {name: [] for name in self.clients}
+        for endpoint_id in dict.fromkeys(endpoint_ids):
+            owner = self._owners.get(endpoint_id)
+            for name in [owner] if owner is not None else self.clients:
+                per_tenant[name].append(endpoint_id)
+
+        tenants = [name for name, ids in per_tenant.items() if ids]
+        answers = self._map(
+            lambda name, client: client.get_endpoints_details(per_tenant[name]), tenants
+        )
+
+        results: Dict[str, Union[Dict[str, Any], DefenderAPIError]] = {}
+        for name, answer in answers.items():
+            for endpoint_id in per_tenant[name]:
+                details = answer if isinstance(answer, DefenderAPIError) else answer[endpoint_id]
+                if endpoint_id not in results or (
+                    isinstance(results[endpoint_id], DefenderAPIError)
+                    and not isinstance(details, DefenderAPIError)
+                ):
+                    results[endpoint_id] = details
+                    if not isinstance(details, DefenderAPIError):
+                        self._owners[endpoint_id] = name
+        return results
@@ -1 +1,18 @@
 """Services module for check_bitdefender."""
+
+from typing import Dict
+
+from check_bitdefender.services.detail_service import DetailService
+from check_bitdefender.services.endpoint_service import EndpointsService
+from check_bitdefender.services.lastscan_service import LastScanService
+from check_bitdefender.services.lastseen_service import LastSeenService
+from check_bitdefender.services.onboarding_service import OnboardingService
+
+# Service class for each check command name
+SERVICES: Dict[str, type] = {
+    "endpoints": EndpointsService,
+    "onboarding": OnboardingService,
+    "lastseen": LastSeenService,
+    "lastscan": LastScanService,
+    "detail": DetailService,
+}
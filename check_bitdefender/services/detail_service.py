@@ -1,16 +1,17 @@
 """Detail service implementation."""
 
 from typing import Dict, Any, Optional, List, TYPE_CHECKING
+from check_bitdefender.core.deadline import DeadlineExceededError
 from check_bitdefender.core.logging_config import get_verbose_logger
 
 if TYPE_CHECKING:
-    from check_bitdefender.core.defender import DefenderClient
+    from check_bitdefender.core.defender import EndpointClient
 
 
 class DetailService:
     """Service for getting detailed endpoint information."""
 
-    def __init__(self, defender_client: "DefenderClient", verbose_level: int = 0) -> None:
+    def __init__(self, defender_client: "EndpointClient", verbose_level: int = 0) -> None:
         """Initialize with Defender client.
 
         Args:
@@ -46,24 +47,9 @@ class DetailService:
         # First, find the endpoint to get its ID if dns_name was provided
         if not endpoint_id:
             self.logger.info(f"Looking up endpoint by DNS name: {dns_name}")
-            endpoints_data = self.defender.list_endpoints()
-
-            if not endpoints_data.get("value"):
-                self.logger.info("No endpoints found in system")
-                result = {
-                    "value": 0,  # Not found
-                    "details": [f"Host not found ({dns_name})"],
-                }
-                self.logger.method_exit("get_result", result)
-                return result
-
-            # Find matching endpoint by DNS name
-            matching_endpoint = None
-            for endpoint in endpoints_data["value"]:
-                if endpoint.get("fqdn") == dns_name:
-                    matching_endpoint = endpoint
-                    endpoint_id = endpoint.get("id")
-                    break
+            matching_endpoint = self.defender.find_endpoint(fqdn=dns_name)
+            if matching_endpoint:
+                endpoint_id = matching_endpoint.get("id")
 
             if not matching_endpoint or not endpoint_id:
                 self.logger.info(f"Endpoint not found: {dns_name}")
@@ -78,6 +64,9 @@ class DetailService:
         self.logger.info(f"Fetching details for endpoint: {endpoint_id}")
         try:
             details_data = self.defender.get_endpoint_details(endpoint_id)
+        except DeadlineExceededError:
+            # Report UNKNOWN rather than a verdict on missing details
+            raise
         except Exception as e:
             self.logger.error(f"Failed to get endpoint details: {str(e)}")
             result = {
@@ -0,0 +1,117 @@
+"""Hash index for endpoint lookups in an inventory snapshot."""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Marker for short hostnames shared by several endpoints
+_AMBIGUOUS: Dict[str, Any] = {}
+
+
+def short_hostname(name: str) -> str:
+    """Get the lower-cased host part of a DNS name."""
+    return name.split(".", 1)[0].lower()
+
+
+class EndpointIndex:
+    """Constant-time endpoint lookup by id and DNS name.
+
+    Built once per inventory snapshot. A DNS name is resolved by exact fqdn
+    first, then case-insensitively, then by short hostname: a bare host name
+    matches an endpoint whose fqdn starts with it, and a qualified name
+    matches an endpoint registered without a domain. Short hostnames shared
+    by several endpoints are ambiguous and never match. When several endpoints
+    share a key, the first one in inventory order wins, as with a linear scan.
+    """
+
+    _last: Optional[Tuple[Dict[str, Any], List[Dict[str, Any]], int, "EndpointIndex"]] = None
+    _last_lock = threading.Lock()
+
+    def __init__(self, endpoints: List[Dict[str, Any]]) -> None:
+        """Build the index.
+
+        Args:
+            endpoints: Endpoints in the list_endpoints format
+        """
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_fqdn: Dict[str, Dict[str, Any]] = {}
+        self.by_fqdn_lower: Dict[str, Dict[str, Any]] = {}
+        self.by_short_name: Dict[str, Dict[str, Any]] = {}
+
+        for endpoint in endpoints:
+            endpoint_id = endpoint.get("id")
+            if endpoint_id:
+                self.by_id.setdefault(endpoint_id, endpoint)
+
+            fqdn = endpoint.get("fqdn")
+            if not fqdn:
+                continue
+            self.by_fqdn.setdefault(fqdn, endpoint)
+            self.by_fqdn_lower.setdefault(fqdn.lower(), endpoint)
+
+            short = short_hostname(fqdn)
+            existing = self.by_short_name.get(short)
+            if existing is None:
+                self.by_short_name[short] = endpoint
+            elif existing is not _AMBIGUOUS and existing.get("id") != endpoint_id:
+                self.by_short_name[short] = _AMBIGUOUS
+
+        self.size = len(endpoints)
+
+    @classmethod
+    def of(cls, inventory: Dict[str, Any]) -> "EndpointIndex":
+        """Get the index of a list_endpoints response.
+
+        The index of the most recent snapshot is kept, so services evaluating
+        many hosts against the same snapshot build it only once.
+        """
+        endpoints = inventory.get("value") or []
+        with cls._last_lock:
+            last = cls._last
+            if (
+                last is not None
+                and last[0] is inventory
+                and last[1] is endpoints
+                and last[2] == len(endpoints)
+            ):
+                return last[3]
+
+        index = cls(endpoints)
+        with cls._last_lock:
+            cls._last = (inventory, endpoints, len(endpoints), index)
+        return index
+
+    def __len__(self) -> int:
+        """Number of endpoints in the snapshot."""
+        return self.size
+
+    def lookup(
+        self, endpoint_id: Optional[str] = None, dns_name: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find an endpoint by id or DNS name.
+
+        Args:
+            endpoint_id: Optional endpoint ID, tried first
+            dns_name: Optional DNS name
+
+        Returns:
+            The matching endpoint, or None
+        """
+        if endpoint_id and endpoint_id in self.by_id:
+            return self.by_id[endpoint_id]
+
+        if not dns_name:
+            return None
+
+        endpoint = self.by_fqdn.get(dns_name) or self.by_fqdn_lower.get(dns_name.lower())
+        if endpoint is not None:
+            return endpoint
+
+        short = short_hostname(dns_name)
+        if "." in dns_name:
+            # Qualified name: only match endpoints registered without a domain
+            return self.by_fqdn_lower.get(short)
+
+        endpoint = self.by_short_name.get(short)
+        if endpoint is None or endpoint is _AMBIGUOUS:
+            return None
+        return endpoint
@@ -2,20 +2,26 @@
 
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone, timedelta
+from check_bitdefender.core.deadline import DeadlineExceededError
 from check_bitdefender.core.logging_config import get_verbose_logger
 
 
 class LastSeenService:
     """Service for checking endpoint last seen status."""
 
-    def __init__(self, defender_client: Any, verbose_level: int = 0) -> None:
+    def __init__(
+        self, defender_client: Any, verbose_level: int = 0, inventory_only: bool = True
+    ) -> None:
         """Initialize with Defender client.
 
         Args:
             defender_client: DefenderClient instance
             verbose_level: Verbosity level for logging
+            inventory_only: Use the last seen date from the inventory when
+                present instead of requesting the endpoint details
         """
         self.defender = defender_client
+        self.inventory_only = inventory_only
         self.logger = get_verbose_logger(__name__, verbose_level)
 
     def get_result(
@@ -41,30 +47,9 @@ class LastSeenService:
         if not endpoint_id and not dns_name:
             raise ValueError("Either endpoint_id or dns_name must be provided")
 
-        # Get all endpoints
-        self.logger.info(f"Searching for endpoint: {dns_name or endpoint_id}")
-        endpoints_data = self.defender.list_endpoints()
-
-        if not endpoints_data.get("value"):
-            self.logger.info("No endpoints found in system")
-            result = {
-                "value": 999,  # Not found
-                "details": [f"Host not found ({dns_name or endpoint_id})"],
-            }
-            self.logger.method_exit("get_result", result)
-            return result
-
-        endpoints = endpoints_data["value"]
-
         # Find the matching endpoint
-        matching_endpoint = None
-        for endpoint in endpoints:
-            if endpoint_id and endpoint.get("id") == endpoint_id:
-                matching_endpoint = endpoint
-                break
-            elif dns_name and endpoint.get("fqdn") == dns_name:
-                matching_endpoint = endpoint
-                break
+        self.logger.info(f"Searching for endpoint: {dns_name or endpoint_id}")
+        matching_endpoint = self.defender.find_endpoint(fqdn=dns_name, endpoint_id=endpoint_id)
 
         if not matching_endpoint:
             self.logger.info(f"Endpoint not found: {dns_name or endpoint_id}")
@@ -75,24 +60,36 @@ class LastSeenService:
             self.logger.method_exit("get_result", result)
             return result
 
-
         endpoint_id = matching_endpoint["id"]
-        # Get detailed information about the endpoint
-        self.logger.info(f"Fetching details for endpoint: {endpoint_id}")
-        try:
-            details_data = self.defender.get_endpoint_details(endpoint_id)
-        except Exception as e:
-            self.logger.error(f"Failed to get endpoint details: {str(e)}")
-            result = {
-                "value": 0,  # Not found/error
-                "details": [f"Failed to get endpoint details: {str(e)}"],
-            }
-            self.logger.method_exit("get_result", result)
-            return result
+
+        # The inventory may carry the last seen date, fall back to details otherwise.
+        # A lastSeen filled in from the last scan date is not used.
+        last_seen_date = None
+        if self.inventory_only and matching_endpoint.get("lastSeenSource") == "lastSeen":
+            last_seen_date = matching_endpoint.get("lastSeen")
+        if last_seen_date:
+            self.logger.info(f"Using last seen date from inventory for endpoint: {endpoint_id}")
+        else:
+            # Get detailed information about the endpoint
+            self.logger.info(f"Fetching details for endpoint: {endpoint_id}")
+            try:
+                details_data = self.defender.get_endpoint_details(endpoint_id)
+            except DeadlineExceededError:
+                # Report UNKNOWN rather than a verdict on missing details
+                raise
+            except Exception as e:
+                self.logger.error(f"Failed to get endpoint details: {str(e)}")
+                result = {
+                    "value": 0,  # Not found/error
+                    "details": [f"Failed to get endpoint details: {str(e)}"],
+                }
+                self.logger.method_exit("get_result", result)
+                return result
+
+            last_seen_date = details_data.get("lastSeen")
 
         # Calculate days since last seen
         computer_name = matching_endpoint.get("fqdn", dns_name or endpoint_id)
-        last_seen_date = details_data.get("lastSeen")
 
         if not last_seen_date:
             self.logger.info(f"Endpoint has no last seen date: {computer_name}")
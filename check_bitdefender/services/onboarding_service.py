@@ -40,30 +40,9 @@ class OnboardingService:
         if not endpoint_id and not dns_name:
             raise ValueError("Either endpoint_id or dns_name must be provided")
 
-        # Get all endpoints
-        self.logger.info(f"Searching for endpoint: {dns_name or endpoint_id}")
-        endpoints_data = self.defender.list_endpoints()
-
-        if not endpoints_data.get("value"):
-            self.logger.info("No endpoints found in system")
-            result = {
-                "value": 1,  # Not found
-                "details": [f"Host not found ({dns_name or endpoint_id})"],
-            }
-            self.logger.method_exit("get_result", result)
-            return result
-
-        endpoints = endpoints_data["value"]
-
         # Find the matching endpoint
-        matching_endpoint = None
-        for endpoint in endpoints:
-            if endpoint_id and endpoint.get("id") == endpoint_id:
-                matching_endpoint = endpoint
-                break
-            elif dns_name and endpoint.get("fqdn") == dns_name:
-                matching_endpoint = endpoint
-                break
+        self.logger.info(f"Searching for endpoint: {dns_name or endpoint_id}")
+        matching_endpoint = self.defender.find_endpoint(fqdn=dns_name, endpoint_id=endpoint_id)
 
         if not matching_endpoint:
             self.logger.info(f"Endpoint not found: {dns_name or endpoint_id}")
@@ -85,7 +64,9 @@ class OnboardingService:
                 "details": [f"Host onboarded ({computer_name})"],
             }
         else:
-            self.logger.info(f"Endpoint not onboarded: {computer_name}, status: {onboarding_status}")
+            self.logger.info(
+                f"Endpoint not onboarded: {computer_name}, status: {onboarding_status}"
+            )
             result = {
                 "value": 1,  # Not onboarded
                 "details": [
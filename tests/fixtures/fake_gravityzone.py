@@ -0,0 +1,222 @@
+"""Local fake GravityZone JSON-RPC server for tests."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def make_items(count, prefix="host", domain="domain.tld"):
+    """Build raw getNetworkInventoryItems items."""
+    return [
+        {
+            "id": f"ep{i}",
+            "name": f"{prefix}{i}",
+            "details": {
+                "fqdn": f"{prefix}{i}.{domain}",
+                "isManaged": True,
+                "operatingSystemVersion": "Windows 10",
+            },
+            "lastSeen": "2024-01-01T00:00:00Z",
+        }
+        for i in range(count)
+    ]
+
+
+class FakeGravityZone:
+    """Threaded HTTP server answering GravityZone network API calls.
+
+    Serves ``items`` through ``getNetworkInventoryItems`` with pagination and
+    the ``details.name`` filter, ``groups`` through ``getCustomGroupsList``,
+    and ``getManagedEndpointDetails`` for each item. Every JSON-RPC call is
+    recorded in ``calls`` so tests can assert how many requests reached the
+    server.
+    Use as a context manager; ``base_url`` is the value to assign to
+    ``DefenderClient.base_url``. Override ``delay``, ``error`` and ``encode``
+    to inject latency, HTTP errors or malformed bodies into single requests.
+    JSON-RPC batch arrays are answered element by element unless
+    ``batch_enabled`` is False, in which case they are rejected with an
+    Invalid Request error like servers without batch support. Override
+    ``accepts_batch`` to reject single batches.
+    """
+
+    def __init__(
+        self,
+        items: Optional[List[Dict[str, Any]]] = None,
+        latency: float = 0.0,
+        batch_enabled: bool = True,
+        companies: Optional[List[Dict[str, Any]]] = None,
+        groups: Optional[List[Dict[str, Any]]] = None,
+    ):
+        """Initialize with inventory items and a fixed per-request latency.
+
+        Items, ``companies`` and ``groups`` may carry a ``parentId``, the id
+        of the company or group they belong to; those without one sit at the
+        root.
+        """
+        self.items = items if items is not None else make_items(3)
+        self.companies = companies or []
+        self.groups = groups or []
+        self.latency = latency
+        self.batch_enabled = batch_enabled
+        self.batches: List[int] = []
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, method: str) -> int:
+        """Count recorded calls of a JSON-RPC method."""
+        with self._lock:
+            return sum(1 for call in self.calls if call.get("method") == method)
+
+    def __enter__(self) -> "FakeGravityZone":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def delay(self, request: Dict[str, Any]) -> float:
+        """Seconds to wait before answering a request."""
+        return self.latency
+
+    def error(self, request: Dict[str, Any]) -> Optional[Tuple[int, Dict[str, str]]]:
+        """HTTP status and headers to answer a request with instead of a result."""
+        return None
+
+    def accepts_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        """Whether to answer a batch array rather than reject it."""
+        return self.batch_enabled
+
+    def encode(self, request: Dict[str, Any], response: Dict[str, Any]) -> bytes:
+        """Body of the answer to a single request."""
+        return json.dumps(response).encode()
+
+    def children(
+        self, nodes: List[Dict[str, Any]], parent_id: Optional[str], recursive: bool
+    ) -> List[Dict[str, Any]]:
+        """Select the nodes under a parent, directly or anywhere in its subtree."""
+        if not recursive:
+            return [node for node in nodes if node.get("parentId") == parent_id]
+        if parent_id is None:
+            return nodes
+        subtree = {parent_id}
+        for node in self.companies + self.groups:
+            # Companies, then groups, are listed parents first
+            if node.get("parentId") in subtree:
+                subtree.add(node["id"])
+        return [node for node in nodes if node.get("parentId") in subtree]
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a single JSON-RPC request."""
+        with self._lock:
+            self.calls.append(request)
+        method = request.get("method")
+        params = request.get("params", {})
+
+        if method == "getNetworkInventoryItems":
+            page = params.get("page", 1)
+            per_page = params.get("perPage", 100)
+            filters = params.get("filters", {})
+            companies = filters.get("type", {}).get("companies", False)
+            items = self.children(
+                self.companies if companies else self.items,
+                params.get("parentId"),
+                filters.get("depth", {}).get("allItemsRecursively", False),
+            )
+            name = filters.get("details", {}).get("name")
+            if name:
+                # Partial, case-insensitive match on the endpoint name
+                items = [item for item in items if name.lower() in item.get("name", "").lower()]
+            start = (page - 1) * per_page
+            end = start + per_page
+            pages_count = max(1, -(-len(items) // per_page))
+            result = {
+                "items": items[start:end],
+                "page": page,
+                "pagesCount": pages_count,
+                "perPage": per_page,
+                "total": len(items),
+            }
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+        if method == "getCustomGroupsList":
+            groups = self.children(self.groups, params.get("parentId"), False)
+            result = [{"id": group["id"], "name": group.get("name")} for group in groups]
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+        if method == "getManagedEndpointDetails":
+            endpoint_id = params.get("endpointId")
+            for item in self.items:
+                if item["id"] == endpoint_id:
+                    result = {
+                        "id": item["id"],
+                        "name": item.get("name"),
+                        "lastSeen": item.get("lastSeen"),
+                        "lastSuccessfulScan": item.get("lastSuccessfulScan"),
+                    }
+                    return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+            error = {"code": -32602, "message": "Invalid params", "data": {"details": "Not found"}}
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": error}
+
+        error = {"code": -32601, "message": "Method not found"}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "error": error}
+
+    def _handler_class(self) -> type:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections alive like the real API
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+                if isinstance(request, list):
+                    time.sleep(fake.latency)
+                    with fake._lock:
+                        fake.batches.append(len(request))
+                    if fake.accepts_batch(request):
+                        response: Any = [fake.dispatch(element) for element in request]
+                    else:
+                        error = {"code": -32600, "message": "Invalid Request"}
+                        response = {"jsonrpc": "2.0", "id": None, "error": error}
+                    body = json.dumps(response).encode()
+                else:
+                    time.sleep(fake.delay(request))
+                    error = fake.error(request)
+                    if error is not None:
+                        with fake._lock:
+                            fake.calls.append(request)
+                        self.send_error_status(*error)
+                        return
+                    body = fake.encode(request, fake.dispatch(request))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def send_error_status(self, status: int, headers: Dict[str, str]) -> None:
+                body = b"{}"
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
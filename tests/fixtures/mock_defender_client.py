@@ -2,8 +2,19 @@
 
 import json
 from pathlib import Path
+from unittest.mock import Mock
 
 from check_bitdefender.core.exceptions import ValidationError
+from check_bitdefender.services.endpoint_index import EndpointIndex
+
+
+def inventory_finder(client):
+    """Create a find_endpoint mock searching the client's list_endpoints mock."""
+
+    def find_endpoint(fqdn=None, endpoint_id=None):
+        return EndpointIndex.of(client.list_endpoints()).lookup(endpoint_id, fqdn)
+
+    return Mock(side_effect=find_endpoint)
 
 
 class MockDefenderClient:
@@ -0,0 +1,196 @@
+"""Tests for AsyncDefenderClient against a local fake server."""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import patch
+from click.testing import CliRunner
+
+from check_bitdefender.cli import main
+from check_bitdefender.core.cache import InventoryCache
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.retry import RetryPolicy
+from check_bitdefender.core.exceptions import DefenderAPIError
+from check_bitdefender.core.nagios import NagiosPlugin
+from check_bitdefender.services.onboarding_service import OnboardingService
+from tests.fixtures.fake_gravityzone import FakeGravityZone, make_items
+
+pytest.importorskip("aiohttp")
+
+from check_bitdefender.core.async_defender import (  # noqa: E402
+    AsyncDefenderClient,
+    BlockingDefenderClient,
+)
+
+
+def _client(server, max_concurrency=4, **kwargs):
+    client = AsyncDefenderClient("test_token", max_concurrency=max_concurrency, **kwargs)
+    client.base_url = server.base_url
+    return client
+
+
+class FlakyFirstRequest(FakeGravityZone):
+    """Fake server answering 503 to the first request."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.failed = False
+
+    def error(self, request):
+        if not self.failed:
+            self.failed = True
+            return 503, {"Retry-After": "0"}
+        return None
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_matches_sync_client():
+    """Test that both clients return the same transformed inventory."""
+    with FakeGravityZone(items=make_items(250)) as server:
+        async with _client(server) as client:
+            result = await client.list_endpoints()
+
+        sync_client = DefenderClient("test_token")
+        sync_client.base_url = server.base_url
+        expected = sync_client.list_endpoints()
+
+    assert result == expected
+    assert len(result["value"]) == 250
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_fetches_pages_concurrently():
+    """Test that pages are fetched in parallel up to the concurrency limit."""
+    with FakeGravityZone(items=make_items(500), latency=0.1) as server:
+        async with _client(server, max_concurrency=4) as client:
+            start = time.perf_counter()
+            result = await client.list_endpoints()
+            elapsed = time.perf_counter() - start
+
+    assert len(result["value"]) == 500
+    # 1 page alone then 4 pages in parallel: about 0.2s instead of 0.5s
+    assert elapsed < 0.4
+
+
+@pytest.mark.asyncio
+async def test_get_endpoints_details():
+    """Test concurrent detail retrieval with per-endpoint errors."""
+    with FakeGravityZone(items=make_items(3)) as server:
+        async with _client(server) as client:
+            details = await client.get_endpoints_details(["ep0", "ep2", "missing", "ep0"])
+
+    assert list(details) == ["ep0", "ep2", "missing"]
+    assert details["ep2"]["name"] == "host2"
+    assert isinstance(details["missing"], DefenderAPIError)
+
+
+class MalformedDetails(FakeGravityZone):
+    """Fake server answering the details of one endpoint with an HTML page."""
+
+    def encode(self, request, response):
+        if request.get("params", {}).get("endpointId") == "ep1":
+            return b"<html>Bad gateway</html>"
+        return super().encode(request, response)
+
+
+@pytest.mark.asyncio
+async def test_get_endpoints_details_malformed_body():
+    """Test that a body that is not JSON fails only its own endpoint."""
+    with MalformedDetails(items=make_items(3)) as server:
+        async with _client(server) as client:
+            details = await client.get_endpoints_details(["ep0", "ep1", "ep2"])
+
+    assert details["ep0"]["name"] == "host0"
+    assert isinstance(details["ep1"], DefenderAPIError)
+    assert "Invalid API response" in str(details["ep1"])
+    assert details["ep2"]["name"] == "host2"
+
+
+@pytest.mark.asyncio
+async def test_connection_error():
+    """Test that transport errors raise DefenderAPIError."""
+    client = AsyncDefenderClient("test_token", timeout=1)
+    client.base_url = "http://127.0.0.1:1"
+
+    with pytest.raises(DefenderAPIError, match="Failed to list endpoints"):
+        await client.list_endpoints()
+    await client.close()
+
+
+def test_blocking_client_with_sync_service():
+    """Test that sync services run unchanged on top of the async client."""
+    with FakeGravityZone(items=make_items(3)) as server:
+        with BlockingDefenderClient(_client(server)) as client:
+            plugin = NagiosPlugin(OnboardingService(client), "onboarding")
+            exit_code, output = plugin.evaluate(dns_name="host1.domain.tld", warning=2, critical=1)
+            details = client.get_endpoint_details("ep1")
+
+    assert exit_code == 0
+    assert output.startswith("DEFENDER OK")
+    assert details["id"] == "ep1"
+
+
+def test_blocking_client_from_running_loop_thread_is_separate():
+    """Test that the facade works while another event loop runs."""
+
+    async def main():
+        with FakeGravityZone(items=make_items(2)) as server:
+            client = BlockingDefenderClient(_client(server))
+            try:
+                return await asyncio.to_thread(client.list_endpoints)
+            finally:
+                await asyncio.to_thread(client.close)
+
+    assert len(asyncio.run(main())["value"]) == 2
+
+
+def test_bulk_command_async():
+    """Test the bulk command with the asyncio client."""
+    clients = []
+    with FakeGravityZone(items=make_items(2)) as server:
+
+        def create(cfg, verbose_level=0):
+            clients.append(_client(server))
+            return clients[-1]
+
+        with (
+            patch("check_bitdefender.cli.commands.bulk.load_config"),
+            patch("check_bitdefender.cli.commands.bulk.create_async_client", side_effect=create),
+        ):
+            result = CliRunner().invoke(
+                main, ["bulk", "--async", "-d", "host1.domain.tld", "-k", "onboarding"]
+            )
+
+    assert result.exit_code == 0
+    assert ";host1.domain.tld;BITDEFENDER_ONBOARDING;0;" in result.output
+    # The aiohttp session is closed once the results are written
+    assert clients[0]._session is None
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_shares_sync_cache(tmp_path):
+    """Test that the async client serves the snapshot cached by DefenderClient."""
+    cache = InventoryCache(str(tmp_path), ttl=300)
+    with FakeGravityZone(items=make_items(3)) as server:
+        sync_client = DefenderClient("test_token", cache=cache)
+        sync_client.base_url = server.base_url
+        expected = sync_client.list_endpoints()
+        calls = len(server.calls)
+
+        async with _client(server, cache=cache) as client:
+            result = await client.list_endpoints()
+
+    assert result == expected
+    assert len(server.calls) == calls
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_status():
+    """Test that the retry policy covers the async client."""
+    with FlakyFirstRequest(items=make_items(3)) as server:
+        async with _client(server, retry=RetryPolicy(backoff=0)) as client:
+            result = await client.list_endpoints()
+
+    assert len(result["value"]) == 3
+    assert server.count("getNetworkInventoryItems") == 2
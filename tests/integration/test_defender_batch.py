@@ -0,0 +1,84 @@
+"""Batch detail tests for DefenderClient against a local fake server."""
+
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import DefenderAPIError
+from tests.fixtures.fake_gravityzone import FakeGravityZone, make_items
+
+
+def _client(server):
+    client = DefenderClient("test_token")
+    client.base_url = server.base_url
+    return client
+
+
+def test_get_endpoints_details_batches():
+    """Test that details are requested in batches of the configured size."""
+    with FakeGravityZone(items=make_items(45)) as server:
+        ids = [f"ep{i}" for i in range(45)]
+        results = _client(server).get_endpoints_details(ids, batch_size=20)
+
+        assert sorted(server.batches) == [5, 20, 20]
+        assert server.count("getManagedEndpointDetails") == 45
+    assert list(results) == ids
+    assert all(results[f"ep{i}"]["name"] == f"host{i}" for i in range(45))
+
+
+def test_get_endpoints_details_partial_errors():
+    """Test that per-element errors do not fail the other endpoints."""
+    with FakeGravityZone(items=make_items(2)) as server:
+        results = _client(server).get_endpoints_details(["ep0", "missing", "ep1"])
+
+    assert results["ep0"]["id"] == "ep0"
+    assert results["ep1"]["id"] == "ep1"
+    assert isinstance(results["missing"], DefenderAPIError)
+    assert "Invalid params (-32602): Not found" in str(results["missing"])
+
+
+def test_get_endpoints_details_deduplicates():
+    """Test that duplicated IDs are requested once."""
+    with FakeGravityZone(items=make_items(2)) as server:
+        results = _client(server).get_endpoints_details(["ep0", "ep0", "ep1"])
+
+        assert server.count("getManagedEndpointDetails") == 2
+    assert list(results) == ["ep0", "ep1"]
+
+
+def test_get_endpoints_details_falls_back_without_batch_support():
+    """Test the single-call fallback when the server refuses batches."""
+    with FakeGravityZone(items=make_items(5), batch_enabled=False) as server:
+        client = _client(server)
+        results = client.get_endpoints_details([f"ep{i}" for i in range(5)], batch_size=2)
+
+        assert client.batch_supported is False
+        assert all(results[f"ep{i}"]["id"] == f"ep{i}" for i in range(5))
+        assert server.count("getManagedEndpointDetails") == 5
+
+        # Later sweeps go straight to single calls
+        refused = len(server.batches)
+        client.get_endpoints_details(["ep0", "ep1"])
+        assert len(server.batches) == refused
+
+
+class RefusesFirstBatch(FakeGravityZone):
+    """Fake server rejecting the batch with the details of ep0."""
+
+    def accepts_batch(self, batch):
+        return all(call.get("params", {}).get("endpointId") != "ep0" for call in batch)
+
+
+def test_get_endpoints_details_keeps_batches_in_flight():
+    """Test that only the endpoints of a refused batch are requested one by one."""
+    with RefusesFirstBatch(items=make_items(8), latency=0.1) as server:
+        client = _client(server)
+        results = client.get_endpoints_details([f"ep{i}" for i in range(8)], batch_size=2)
+
+        assert client.batch_supported is False
+        assert all(results[f"ep{i}"]["id"] == f"ep{i}" for i in range(8))
+        assert server.count("getManagedEndpointDetails") == 8
+
+
+def test_get_endpoints_details_empty():
+    """Test that no request is sent without IDs."""
+    with FakeGravityZone() as server:
+        assert _client(server).get_endpoints_details([]) == {}
+        assert server.calls == []
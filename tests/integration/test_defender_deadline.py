@@ -0,0 +1,47 @@
+"""Deadline tests for DefenderClient against a local fake server."""
+
+import time
+
+import pytest
+
+from check_bitdefender.core.cache import InventoryCache
+from check_bitdefender.core.deadline import Deadline, DeadlineExceededError
+from check_bitdefender.core.defender import DefenderClient
+from tests.fixtures.fake_gravityzone import FakeGravityZone, make_items
+
+
+def _client(server, deadline, cache=None):
+    client = DefenderClient(
+        "test_token", max_workers=1, server_filter=False, cache=cache, deadline=deadline
+    )
+    client.base_url = server.base_url
+    return client
+
+
+def test_deadline_stops_pagination():
+    """Test that remaining pages are not fetched past the deadline."""
+    with FakeGravityZone(items=make_items(1000), latency=0.1) as server:
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceededError):
+            _client(server, Deadline(0.25)).list_endpoints()
+        elapsed = time.monotonic() - start
+
+        assert server.count("getNetworkInventoryItems") < 10
+    assert elapsed < 0.5
+
+
+def test_deadline_falls_back_to_offline_inventory(tmp_path):
+    """Test that a refresh cut short by the deadline serves the last good inventory."""
+    cache = InventoryCache(str(tmp_path), ttl=0, offline_max_age=3600)
+    with FakeGravityZone(items=make_items(1000), latency=0.1) as server:
+        client = _client(server, None, cache)
+        cache.set(
+            cache.key(client.base_url, "test_token", None),
+            {"value": [{"id": "ep0", "fqdn": "host0.domain.tld"}]},
+        )
+        client.deadline = Deadline(0.25)
+
+        result = client.list_endpoints()
+
+    assert [e["id"] for e in result["value"]] == ["ep0"]
+    assert client.inventory_offline is True
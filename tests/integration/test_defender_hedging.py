@@ -0,0 +1,109 @@
+"""Hedged request tests for DefenderClient against a local fake server."""
+
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.hedge import HedgePolicy
+from tests.fixtures.fake_gravityzone import FakeGravityZone, make_items
+
+
+class RandomSlowPages(FakeGravityZone):
+    """Fake server answering the first request of a few random pages slowly."""
+
+    def __init__(self, slow_pages, slow=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.slow_pages = set(slow_pages)
+        self.slow = slow
+        self.seen = set()
+        self.seen_lock = threading.Lock()
+
+    def delay(self, request):
+        page = request.get("params", {}).get("page", 1)
+        with self.seen_lock:
+            first = page not in self.seen
+            self.seen.add(page)
+        return self.slow if first and page in self.slow_pages else 0.01
+
+
+def _client(server, hedge):
+    client = DefenderClient("test_token", max_workers=2, server_filter=False, hedge=hedge)
+    client.base_url = server.base_url
+    return client
+
+
+def _pages(count, rng):
+    return rng.sample(range(2, count + 1), 2)
+
+
+def test_hedging_cuts_tail_latency():
+    """Test that slow random pages are answered by their hedged duplicate."""
+    rng = random.Random(24)
+    slow_pages = _pages(20, rng)
+    hedge = HedgePolicy(initial_delay=0.1, max_ratio=0.2)
+    with RandomSlowPages(slow_pages, items=make_items(2000)) as server:
+        client = _client(server, hedge)
+        start = time.monotonic()
+        result = client.list_endpoints()
+        elapsed = time.monotonic() - start
+
+    assert [e["id"] for e in result["value"]] == [f"ep{i}" for i in range(2000)]
+    assert elapsed < 1.0
+    # Both slow pages were answered by their duplicate, within the cap
+    assert hedge.wins >= 2
+    assert hedge.hedges <= 4
+    assert client.transport_metrics()["hedge_rate"] == (round(hedge.rate * 100, 1), "%")
+    client.close()
+
+
+def test_hedging_capped():
+    """Test that a slow API gets no more duplicates than max_ratio allows."""
+    hedge = HedgePolicy(initial_delay=0.01, min_delay=0.01, max_ratio=0.1)
+    with FakeGravityZone(items=make_items(2000), latency=0.05) as server:
+        client = _client(server, hedge)
+        client.list_endpoints()
+
+        assert server.count("getNetworkInventoryItems") <= 20 + 2
+    assert hedge.rate <= 0.1
+    client.close()
+
+
+def test_without_hedging_slow_page_holds_the_sync():
+    """Test the baseline: without hedging a slow page delays the whole listing."""
+    rng = random.Random(24)
+    with RandomSlowPages(_pages(20, rng), slow=0.5, items=make_items(2000)) as server:
+        start = time.monotonic()
+        _client(server, None).list_endpoints()
+        elapsed = time.monotonic() - start
+
+        assert server.count("getNetworkInventoryItems") == 20
+    assert elapsed >= 0.5
+
+
+# Lists the inventory with hedging, then exits without closing the client
+_HEDGED_LISTING = """
+import sys
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.hedge import HedgePolicy
+
+hedge = HedgePolicy(initial_delay=0.1)
+client = DefenderClient("test_token", max_workers=2, server_filter=False, hedge=hedge)
+client.base_url = sys.argv[1]
+client.list_endpoints()
+assert hedge.wins == 1
+"""
+
+
+def test_losing_request_does_not_delay_exit():
+    """Test that the process exits without waiting for the slow request a duplicate beat."""
+    with RandomSlowPages([2], slow=3.0, items=make_items(300)) as server:
+        start = time.monotonic()
+        subprocess.run(
+            [sys.executable, "-c", _HEDGED_LISTING, server.base_url], check=True, timeout=10
+        )
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 2.0
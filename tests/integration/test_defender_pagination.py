@@ -0,0 +1,223 @@
+"""Pagination tests for DefenderClient against a local fake server."""
+
+import time
+
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.retry import RetryPolicy
+from tests.fixtures.fake_gravityzone import FakeGravityZone, make_items
+
+
+class SlowEarlyPages(FakeGravityZone):
+    """Fake server answering earlier pages more slowly than later ones."""
+
+    def delay(self, request):
+        page = request.get("params", {}).get("page", 1)
+        return 0.05 * (6 - page)
+
+
+def _client(server, max_workers=4, server_filter=False):
+    client = DefenderClient("test_token", max_workers=max_workers, server_filter=server_filter)
+    client.base_url = server.base_url
+    return client
+
+
+def test_list_endpoints_walks_all_pages():
+    """Test that every endpoint beyond the first page is returned."""
+    with FakeGravityZone(items=make_items(250)) as server:
+        result = _client(server).list_endpoints()
+
+        assert server.count("getNetworkInventoryItems") == 3
+    assert [e["id"] for e in result["value"]] == [f"ep{i}" for i in range(250)]
+
+
+def test_list_endpoints_merges_pages_in_order():
+    """Test that pages completing out of order are merged in page order."""
+    with SlowEarlyPages(items=make_items(500)) as server:
+        result = _client(server).list_endpoints()
+
+    assert [e["fqdn"] for e in result["value"]] == [f"host{i}.domain.tld" for i in range(500)]
+
+
+def test_list_endpoints_fetches_pages_concurrently():
+    """Test that remaining pages are fetched in parallel."""
+    with FakeGravityZone(items=make_items(500), latency=0.2) as server:
+        start = time.monotonic()
+        _client(server, max_workers=4).list_endpoints()
+        elapsed = time.monotonic() - start
+
+    # First page, then four pages in parallel: two round trips instead of five
+    assert elapsed < 0.2 * 4
+
+
+def test_iter_endpoints_yields_every_endpoint_in_order():
+    """Test that streaming returns the same endpoints as list_endpoints."""
+    with FakeGravityZone(items=make_items(250)) as server:
+        client = _client(server)
+        streamed = list(client.iter_endpoints())
+
+        assert streamed == client.list_endpoints()["value"]
+
+
+def test_iter_endpoints_stops_fetching_early():
+    """Test that stopping after the first endpoint sends a single request."""
+    with FakeGravityZone(items=make_items(1000)) as server:
+        endpoints = _client(server).iter_endpoints()
+        first = next(endpoints)
+        endpoints.close()
+
+        assert first["id"] == "ep0"
+        assert server.count("getNetworkInventoryItems") == 1
+
+
+def test_iter_endpoints_bounds_pages_in_flight():
+    """Test that no more than max_workers pages are fetched ahead."""
+    with FakeGravityZone(items=make_items(1000)) as server:
+        endpoints = _client(server, max_workers=2).iter_endpoints()
+        for _ in range(150):
+            next(endpoints)
+        # Let the pages fetched ahead complete
+        time.sleep(0.2)
+
+        # Page 1, page 2 being consumed, and two pages ahead
+        assert server.count("getNetworkInventoryItems") == 4
+        assert len(list(endpoints)) == 850
+        assert server.count("getNetworkInventoryItems") == 10
+
+
+def test_find_endpoint_stops_at_match():
+    """Test that a host on the second page only needs two pages."""
+    with FakeGravityZone(items=make_items(1000)) as server:
+        endpoint = _client(server, max_workers=1).find_endpoint(fqdn="HOST150.domain.tld")
+
+        assert endpoint["id"] == "ep150"
+        assert server.count("getNetworkInventoryItems") <= 3
+
+
+def test_find_endpoint_by_id():
+    """Test lookup by endpoint id."""
+    with FakeGravityZone(items=make_items(250)) as server:
+        endpoint = _client(server).find_endpoint(endpoint_id="ep42")
+
+    assert endpoint["fqdn"] == "host42.domain.tld"
+
+
+def test_find_endpoint_id_takes_precedence():
+    """Test that the id wins over an earlier DNS name match."""
+    with FakeGravityZone(items=make_items(250)) as server:
+        endpoint = _client(server).find_endpoint(fqdn="host1.domain.tld", endpoint_id="ep200")
+        fallback = _client(server).find_endpoint(fqdn="host1.domain.tld", endpoint_id="missing")
+
+    assert endpoint["id"] == "ep200"
+    assert fallback["id"] == "ep1"
+
+
+def test_find_endpoint_short_name():
+    """Test short hostname resolution and ambiguity over the whole inventory."""
+    items = make_items(150) + make_items(1, prefix="host3", domain="other.tld")
+    with FakeGravityZone(items=items) as server:
+        unique = _client(server).find_endpoint(fqdn="host7")
+        ambiguous = _client(server).find_endpoint(fqdn="host30")
+
+    assert unique["id"] == "ep7"
+    assert ambiguous is None
+
+
+def test_find_endpoint_not_found():
+    """Test that a missing host scans every page."""
+    with FakeGravityZone(items=make_items(250)) as server:
+        assert _client(server).find_endpoint(fqdn="missing.domain.tld") is None
+        assert server.count("getNetworkInventoryItems") == 3
+
+
+def test_find_endpoint_reverse_page_order():
+    """Test searching the last pages first."""
+    with FakeGravityZone(items=make_items(1000)) as server:
+        client = DefenderClient(
+            "test_token", max_workers=1, page_order="reverse", server_filter=False
+        )
+        client.base_url = server.base_url
+        endpoint = client.find_endpoint(fqdn="host999.domain.tld")
+
+        assert endpoint["id"] == "ep999"
+        pages = [
+            call["params"]["page"]
+            for call in server.calls
+            if call["method"] == "getNetworkInventoryItems"
+        ]
+        assert pages[:2] == [1, 10]
+        assert len(pages) <= 3
+
+
+def test_find_endpoint_server_filter():
+    """Test that a DNS name lookup only transfers the endpoints matching its name."""
+    with FakeGravityZone(items=make_items(1000)) as server:
+        endpoint = _client(server, server_filter=True).find_endpoint(fqdn="HOST750.domain.tld")
+
+        assert endpoint["id"] == "ep750"
+        calls = [call for call in server.calls if call["method"] == "getNetworkInventoryItems"]
+        assert len(calls) == 1
+        assert calls[0]["params"]["filters"]["details"] == {"name": "host750"}
+
+
+def test_find_endpoint_server_filter_short_name_ambiguity():
+    """Test that filtered candidates keep the short hostname ambiguity rules."""
+    items = make_items(150) + make_items(1, prefix="host3", domain="other.tld")
+    with FakeGravityZone(items=items) as server:
+        client = _client(server, server_filter=True)
+        unique = client.find_endpoint(fqdn="host7")
+        ambiguous = client.find_endpoint(fqdn="host30")
+
+    assert unique["id"] == "ep7"
+    assert ambiguous is None
+
+
+def test_find_endpoint_server_filter_falls_back_to_scan():
+    """Test that a name unknown to the filter is searched in the whole inventory."""
+    items = make_items(250)
+    items[200]["name"] = "renamed"
+    with FakeGravityZone(items=items) as server:
+        endpoint = _client(server, server_filter=True).find_endpoint(fqdn="host200.domain.tld")
+
+        assert endpoint["id"] == "ep200"
+        # The empty filtered page, then the unfiltered pages
+        assert server.count("getNetworkInventoryItems") == 4
+
+
+def test_find_endpoint_server_filter_skips_short_names():
+    """Test that names shorter than the filter minimum are scanned directly."""
+    with FakeGravityZone(items=make_items(3, prefix="h")) as server:
+        endpoint = _client(server, server_filter=True).find_endpoint(fqdn="h1")
+
+        assert endpoint["id"] == "ep1"
+        assert "details" not in server.calls[0]["params"]["filters"]
+
+
+class FlakyPage(FakeGravityZone):
+    """Fake server answering 502 to the first request for one page."""
+
+    def __init__(self, page, **kwargs):
+        super().__init__(**kwargs)
+        self.flaky_page = page
+        self.failed = False
+
+    def error(self, request):
+        if request.get("params", {}).get("page") == self.flaky_page and not self.failed:
+            self.failed = True
+            return 502, {}
+        return None
+
+
+def test_list_endpoints_retries_failed_page():
+    """Test that a transient error on one page only retries that page."""
+    with FlakyPage(7, items=make_items(1000)) as server:
+        client = _client(server)
+        client.retry = RetryPolicy(backoff=0.01)
+        result = client.list_endpoints()
+
+        pages = [
+            call["params"]["page"]
+            for call in server.calls
+            if call["method"] == "getNetworkInventoryItems"
+        ]
+    assert len(result["value"]) == 1000
+    assert sorted(pages) == sorted(list(range(1, 11)) + [7])
@@ -0,0 +1,28 @@
+"""Connection pooling tests for DefenderClient against a local fake server."""
+
+from check_bitdefender.core.defender import DefenderClient
+from tests.fixtures.fake_gravityzone import FakeGravityZone, make_items
+
+
+def test_sequential_pages_reuse_one_connection():
+    """Test that consecutive requests reuse the kept-alive connection."""
+    with FakeGravityZone(items=make_items(500)) as server:
+        with DefenderClient("test_token", max_workers=1) as client:
+            client.base_url = server.base_url
+            client.list_endpoints()
+            client.get_endpoint_details("ep1")
+
+            assert client.connection_stats() == {"requests": 6, "connections": 1, "reused": 5}
+
+
+def test_pool_size_limits_connections_per_host():
+    """Test that concurrent pages never open more than pool_size connections."""
+    with FakeGravityZone(items=make_items(1000), latency=0.05) as server:
+        with DefenderClient("test_token", max_workers=8, pool_size=2) as client:
+            client.base_url = server.base_url
+            result = client.list_endpoints()
+
+            stats = client.connection_stats()
+    assert len(result["value"]) == 1000
+    assert stats["requests"] == 10
+    assert stats["connections"] <= 2
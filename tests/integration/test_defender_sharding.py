@@ -0,0 +1,121 @@
+"""Per-company inventory sharding tests for DefenderClient against a local fake server."""
+
+import time
+
+from check_bitdefender.core.cache import InventoryCache
+from check_bitdefender.core.defender import DefenderClient
+from tests.fixtures.fake_gravityzone import FakeGravityZone, make_items
+
+
+def _tenant():
+    """Build an MSP tree: three companies, one with a sub-company, and root endpoints."""
+    companies = [
+        {"id": "c1", "name": "Acme", "parentId": None},
+        {"id": "c2", "name": "Globex", "parentId": None},
+        {"id": "c3", "name": "Initech", "parentId": None},
+        {"id": "c2a", "name": "Globex Labs", "parentId": "c2"},
+    ]
+    items = []
+    for company, count in (("c1", 150), ("c2", 20), ("c2a", 30), ("c3", 5), (None, 2)):
+        for item in make_items(count, prefix=f"{company or 'root'}-host"):
+            item["id"] = f"{company or 'root'}-{item['id']}"
+            item["parentId"] = company
+            items.append(item)
+    return items, companies
+
+
+def _groups(items):
+    """Add custom groups of endpoints at the root, nested, and inside a company."""
+    groups = [
+        {"id": "g1", "name": "Servers", "parentId": None},
+        {"id": "g1a", "name": "Databases", "parentId": "g1"},
+        {"id": "g3", "name": "Initech Laptops", "parentId": "c3"},
+    ]
+    for group, count in (("g1", 7), ("g1a", 3), ("g3", 4)):
+        for item in make_items(count, prefix=f"{group}-host"):
+            item["id"] = f"{group}-{item['id']}"
+            item["parentId"] = group
+            items.append(item)
+    return groups
+
+
+def _client(server, **kwargs):
+    client = DefenderClient("test_token", shard_by_company=True, **kwargs)
+    client.base_url = server.base_url
+    return client
+
+
+def test_sharded_inventory_matches_recursive_listing():
+    """Test that the shards add up to the same endpoints as one recursive listing."""
+    items, companies = _tenant()
+    with FakeGravityZone(items=items, companies=companies) as server:
+        sharded = _client(server).list_endpoints()["value"]
+        client = DefenderClient("test_token")
+        client.base_url = server.base_url
+        recursive = client.list_endpoints()["value"]
+
+    assert sorted(e["id"] for e in sharded) == sorted(e["id"] for e in recursive)
+
+
+def test_sharded_inventory_records_company():
+    """Test that every endpoint records the child company it was found under."""
+    items, companies = _tenant()
+    with FakeGravityZone(items=items, companies=companies) as server:
+        endpoints = {e["id"]: e for e in _client(server).list_endpoints()["value"]}
+
+    assert endpoints["c1-ep0"]["companyId"] == "c1"
+    assert endpoints["c1-ep0"]["companyName"] == "Acme"
+    # Sub-companies belong to the shard of their top-level company
+    assert endpoints["c2a-ep0"]["companyName"] == "Globex"
+    assert endpoints["root-ep0"]["companyId"] is None
+    assert endpoints["root-ep0"]["companyName"] is None
+
+
+def test_sharded_inventory_fetches_companies_concurrently():
+    """Test that the company subtrees are fetched in parallel."""
+    items, companies = _tenant()
+    with FakeGravityZone(items=items, companies=companies, latency=0.2) as server:
+        start = time.monotonic()
+        _client(server, max_shards=4, max_workers=1).list_endpoints()
+        elapsed = time.monotonic() - start
+
+    # Companies, then all shards at once: the two pages of Acme are the longest chain
+    assert elapsed < 0.2 * 6
+
+
+def test_sharded_inventory_without_companies():
+    """Test that a tenant without child companies is listed in one stream."""
+    with FakeGravityZone(items=make_items(150)) as server:
+        endpoints = _client(server).list_endpoints()["value"]
+
+    assert [e["id"] for e in endpoints] == [f"ep{i}" for i in range(150)]
+    assert "companyId" not in endpoints[0]
+
+
+def test_sharded_inventory_includes_groups():
+    """Test that endpoints in groups outside the companies are not lost."""
+    items, companies = _tenant()
+    groups = _groups(items)
+    with FakeGravityZone(items=items, companies=companies, groups=groups) as server:
+        endpoints = {e["id"]: e for e in _client(server).list_endpoints()["value"]}
+
+    assert sorted(endpoints) == sorted(item["id"] for item in items)
+    # Groups of the parent keep the parent as company, groups of a company its company
+    assert endpoints["g1a-ep0"]["companyId"] is None
+    assert endpoints["g1a-ep0"]["companyName"] is None
+    assert endpoints["g3-ep0"]["companyName"] == "Initech"
+
+
+def test_iter_endpoints_uses_sharded_snapshot(tmp_path):
+    """Test that iter_endpoints serves the snapshot cached by a sharded listing."""
+    items, companies = _tenant()
+    cache = InventoryCache(str(tmp_path), ttl=300)
+    with FakeGravityZone(items=items, companies=companies) as server:
+        client = _client(server, cache=cache)
+        client.list_endpoints()
+        calls = len(server.calls)
+        endpoints = list(client.iter_endpoints())
+
+    assert len(server.calls) == calls
+    assert len(endpoints) == len(items)
+    assert client.inventory_age is not None
@@ -0,0 +1,172 @@
+"""Multi-process tests for single-flight inventory refresh."""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from check_bitdefender.core.cache import InventoryCache
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import DefenderAPIError
+from tests.fixtures.fake_gravityzone import FakeGravityZone, make_items
+
+fcntl = pytest.importorskip("fcntl")
+
+
+def _check_process(base_url, cache_dir, results):
+    """Run list_endpoints as an independent check process would."""
+    client = DefenderClient("test_token", cache=InventoryCache(cache_dir, ttl=60))
+    client.base_url = base_url
+    try:
+        results.put(len(client.list_endpoints()["value"]))
+    except Exception as e:  # pragma: no cover - reported to the parent
+        results.put(repr(e))
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+def test_concurrent_processes_fetch_inventory_once(tmp_path):
+    """Test that concurrent processes coalesce into a single API fetch."""
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+
+    with FakeGravityZone(items=make_items(5), latency=0.5) as server:
+        processes = [
+            ctx.Process(target=_check_process, args=(server.base_url, str(tmp_path), results))
+            for _ in range(8)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=30)
+
+        assert [results.get(timeout=5) for _ in processes] == [5] * 8
+        assert server.count("getNetworkInventoryItems") == 1
+
+
+def _hold_lock(cache, key, release):
+    """Hold the refresh lock of a key until released."""
+    os.makedirs(cache.directory, exist_ok=True)
+    with open(cache.lock_path(key), "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        release.wait()
+
+
+def test_waiter_falls_back_to_stale_snapshot(tmp_path):
+    """Test that a waiter serves the last good snapshot when the refresh stalls."""
+    cache = InventoryCache(str(tmp_path), ttl=0, lock_timeout=0.2, offline_max_age=3600)
+    cache.set("k", {"value": [{"id": "stale"}]})
+    release = threading.Event()
+    holder = threading.Thread(target=_hold_lock, args=(cache, "k", release))
+    holder.start()
+    time.sleep(0.05)
+
+    try:
+        result = cache.get_or_fetch("k", lambda: {"value": [{"id": "fresh"}]})
+    finally:
+        release.set()
+        holder.join()
+
+    assert result == {"value": [{"id": "stale"}]}
+    assert cache.last_offline is True
+
+
+def test_waiter_without_stale_snapshot_times_out(tmp_path):
+    """Test that a waiter without a stale snapshot reports the timeout."""
+    cache = InventoryCache(str(tmp_path), ttl=60, lock_timeout=0.2)
+    release = threading.Event()
+    holder = threading.Thread(target=_hold_lock, args=(cache, "k", release))
+    holder.start()
+    time.sleep(0.05)
+
+    try:
+        with pytest.raises(DefenderAPIError, match="waiting for inventory refresh"):
+            cache.get_or_fetch("k", lambda: {"value": []})
+    finally:
+        release.set()
+        holder.join()
+
+
+def test_waiter_uses_stale_snapshot_after_failed_refresh(tmp_path):
+    """Test that a waiter does not retry a refresh that just failed elsewhere."""
+    cache = InventoryCache(str(tmp_path), ttl=0, lock_timeout=5, offline_max_age=3600)
+    cache.set("k", {"value": [{"id": "stale"}]})
+    release = threading.Event()
+    holder = threading.Thread(target=_hold_lock, args=(cache, "k", release))
+    holder.start()
+    time.sleep(0.05)
+    threading.Timer(0.2, release.set).start()
+
+    fetched = []
+    result = cache.get_or_fetch("k", lambda: fetched.append(1) or {"value": []})
+    holder.join()
+
+    assert result == {"value": [{"id": "stale"}]}
+    assert cache.last_offline is True
+    assert fetched == []
+
+
+class UnavailableGravityZone(FakeGravityZone):
+    """Fake server failing every request after a delay, like an API outage."""
+
+    def error(self, request):
+        return 503, {}
+
+
+def _offline_check_process(base_url, cache_dir, offline_max_age, results):
+    """Run list_endpoints as a check process would, reporting the offline state."""
+    cache = InventoryCache(cache_dir, ttl=60, offline_max_age=offline_max_age)
+    client = DefenderClient("test_token", cache=cache)
+    client.base_url = base_url
+    try:
+        results.put((len(client.list_endpoints()["value"]), client.inventory_offline))
+    except DefenderAPIError as e:
+        results.put(type(e).__name__)
+
+
+def _run_checks_during_outage(tmp_path, offline_max_age):
+    """Run two checks at once against a failing API with a day-old snapshot."""
+    cache = InventoryCache(str(tmp_path), ttl=60)
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+
+    with UnavailableGravityZone(latency=0.5) as server:
+        client = DefenderClient("test_token", cache=cache)
+        client.base_url = server.base_url
+        key = client._inventory_key(None)
+        cache.set(key, {"value": [{"id": "old"}]})
+        with open(cache.path(key)) as f:
+            entry = json.load(f)
+        entry["fetched_at"] -= 86400
+        with open(cache.path(key), "w") as f:
+            json.dump(entry, f)
+
+        processes = [
+            ctx.Process(
+                target=_offline_check_process,
+                args=(server.base_url, str(tmp_path), offline_max_age, results),
+            )
+            for _ in range(2)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=30)
+        outcomes = [results.get(timeout=5) for _ in processes]
+
+        assert server.count("getNetworkInventoryItems") == 1
+    return outcomes
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+def test_waiters_report_outage_past_offline_max_age(tmp_path):
+    """Test that no process serves a snapshot older than offline_max_age when the refresh fails."""
+    assert _run_checks_during_outage(tmp_path, 60) == ["DefenderAPIError"] * 2
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+def test_waiters_serve_offline_snapshot_within_offline_max_age(tmp_path):
+    """Test that every process marks the last good snapshot as offline when the refresh fails."""
+    assert _run_checks_during_outage(tmp_path, 172800) == [(1, True)] * 2
@@ -0,0 +1,193 @@
+"""Unit tests for bulk checks."""
+
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import MagicMock, patch
+from click.testing import CliRunner
+
+from check_bitdefender.cli import main
+from check_bitdefender.core.bulk import (
+    BulkChecker,
+    CheckResult,
+    Host,
+    format_passive_result,
+    parse_hosts,
+    write_results,
+)
+from check_bitdefender.core.exceptions import DefenderAPIError
+from check_bitdefender.core.nagios import NagiosPlugin
+from check_bitdefender.services.lastseen_service import LastSeenService
+from tests.fixtures.mock_defender_client import inventory_finder
+
+
+@pytest.fixture
+def mock_client():
+    """Create a mock DefenderClient with a two endpoint inventory."""
+    recent = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+    old = (datetime.now(timezone.utc) - timedelta(days=12)).isoformat()
+    client = MagicMock()
+    client.find_endpoint = inventory_finder(client)
+    client.list_endpoints.return_value = {
+        "value": [
+            {
+                "id": "ep1",
+                "fqdn": "host1.domain.tld",
+                "onboardingStatus": "Onboarded",
+                "lastSeen": recent,
+                "lastSeenSource": "lastSeen",
+            },
+            {
+                "id": "ep2",
+                "fqdn": "host2.domain.tld",
+                "onboardingStatus": "InsufficientInfo",
+                "lastSeen": old,
+                "lastSeenSource": "lastSeen",
+            },
+        ]
+    }
+    client.get_endpoints_details.return_value = {
+        "ep1": {"id": "ep1", "name": "host1"},
+        "ep2": DefenderAPIError("Endpoint details unavailable"),
+    }
+    return client
+
+
+def test_parse_hosts():
+    """Test host list parsing."""
+    hosts = parse_hosts(["# comment\n", "\n", "web01 web01.domain.tld\n", "db01\n"])
+
+    assert hosts == [Host("web01", "web01.domain.tld"), Host("db01", "db01")]
+
+
+def test_format_passive_result():
+    """Test the external command format."""
+    result = CheckResult("web01", "lastseen", 1, "DEFENDER WARNING - x\nline 2\n", 1700000000.5)
+
+    line = format_passive_result(result, "BITDEFENDER_LASTSEEN")
+
+    assert line == (
+        "[1700000000] PROCESS_SERVICE_CHECK_RESULT;web01;BITDEFENDER_LASTSEEN;1;"
+        "DEFENDER WARNING - x\\nline 2\n"
+    )
+
+
+def test_run_fetches_inventory_once(mock_client):
+    """Test that all hosts and checks share one inventory fetch."""
+    hosts = [Host("web01", "host1.domain.tld"), Host("web02", "host2.domain.tld")]
+
+    results = list(BulkChecker(mock_client).run(hosts, ["onboarding", "lastseen"]))
+
+    mock_client.list_endpoints.assert_called_once()
+    assert [(r.host_name, r.check, r.exit_code) for r in results] == [
+        ("web01", "onboarding", 0),
+        ("web01", "lastseen", 0),
+        ("web02", "onboarding", 2),
+        ("web02", "lastseen", 1),
+    ]
+
+
+def test_run_matches_single_check(mock_client):
+    """Test that bulk output is identical to a standalone evaluation."""
+    plugin = NagiosPlugin(LastSeenService(mock_client), "lastseen")
+    expected = plugin.evaluate(dns_name="host2.domain.tld", warning=3, critical=30)
+
+    results = list(
+        BulkChecker(mock_client).run(
+            [Host("web02", "host2.domain.tld")], ["lastseen"], {"lastseen": (3, 30)}
+        )
+    )
+
+    assert (results[0].exit_code, results[0].output) == expected
+
+
+def test_run_unknown_host(mock_client):
+    """Test that a missing host is reported per check."""
+    results = list(BulkChecker(mock_client).run([Host("x", "missing.domain.tld")], ["lastseen"]))
+
+    assert results[0].exit_code == 2
+
+
+def test_run_inventory_failure(mock_client):
+    """Test that an API failure yields UNKNOWN results."""
+    mock_client.list_endpoints.side_effect = DefenderAPIError("API down")
+
+    results = list(BulkChecker(mock_client).run([Host("web01", "host1.domain.tld")], ["lastseen"]))
+
+    assert results[0].exit_code == 3
+    assert "API down" in results[0].output
+
+
+def test_run_detail_prefetches_in_batch(mock_client):
+    """Test that endpoint details are fetched with one batched call."""
+    hosts = [Host("web01", "host1.domain.tld"), Host("web02", "host2.domain.tld")]
+
+    results = list(BulkChecker(mock_client).run(hosts, ["detail"]))
+
+    mock_client.get_endpoints_details.assert_called_once_with(["ep1", "ep2"])
+    mock_client.get_endpoint_details.assert_not_called()
+    assert "Host found" in results[0].output
+    assert "Endpoint details unavailable" in results[1].output
+
+
+def test_run_detail_prefetch_failure(mock_client):
+    """Test that a failed details prefetch lets every host fetch its own details."""
+    mock_client.get_endpoints_details.side_effect = ValueError("Expecting value")
+    mock_client.get_endpoint_details.side_effect = [
+        {"id": "ep1", "name": "host1"},
+        DefenderAPIError("Endpoint details unavailable"),
+    ]
+    hosts = [Host("web01", "host1.domain.tld"), Host("web02", "host2.domain.tld")]
+
+    results = list(BulkChecker(mock_client).run(hosts, ["detail"]))
+
+    assert "Host found" in results[0].output
+    assert "Endpoint details unavailable" in results[1].output
+
+
+def test_write_results():
+    """Test writing results with a service prefix."""
+    stream = io.StringIO()
+    results = [CheckResult("web01", "lastscan", 0, "DEFENDER OK\n", 1700000000)]
+
+    assert write_results(results, stream, "BD_") == 1
+    assert stream.getvalue() == (
+        "[1700000000] PROCESS_SERVICE_CHECK_RESULT;web01;BD_LASTSCAN;0;DEFENDER OK\n"
+    )
+
+
+def test_bulk_command(mock_client, tmp_path):
+    """Test the bulk command end to end."""
+    hosts_file = tmp_path / "hosts.txt"
+    hosts_file.write_text("web02 host2.domain.tld\n")
+
+    with (
+        patch("check_bitdefender.cli.commands.bulk.load_config"),
+        patch("check_bitdefender.cli.commands.bulk.create_client", return_value=mock_client),
+    ):
+        result = CliRunner().invoke(
+            main, ["bulk", "-d", "host1.domain.tld", "-f", str(hosts_file), "-k", "lastseen"]
+        )
+
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert len(lines) == 2
+    assert ";host1.domain.tld;BITDEFENDER_LASTSEEN;0;" in lines[0]
+    assert ";web02;BITDEFENDER_LASTSEEN;1;" in lines[1]
+    mock_client.__exit__.assert_called_once()
+
+
+def test_bulk_command_invalid_check():
+    """Test that unknown check names are rejected."""
+    result = CliRunner().invoke(main, ["bulk", "-d", "host1", "-k", "endpoints"])
+
+    assert result.exit_code == 2
+    assert "endpoints" in result.output
+
+
+def test_bulk_command_without_hosts():
+    """Test that at least one host is required."""
+    result = CliRunner().invoke(main, ["bulk"])
+
+    assert result.exit_code == 2
@@ -0,0 +1,188 @@
+"""Unit tests for the circuit breaker."""
+
+import configparser
+import time
+
+import pytest
+import requests
+from unittest.mock import Mock, patch
+
+from check_bitdefender.core.breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from check_bitdefender.core.cache import InventoryCache
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import ConfigurationError, DefenderAPIError
+from check_bitdefender.core.nagios import NagiosPlugin
+from check_bitdefender.services.endpoint_service import EndpointsService
+
+
+@pytest.fixture
+def breaker(tmp_path):
+    """Create a breaker opening after two failures for a minute."""
+    return CircuitBreaker(str(tmp_path / "breaker.json"), failure_threshold=2, cooldown=60)
+
+
+def _later(seconds):
+    return patch("check_bitdefender.core.breaker.time.time", return_value=time.time() + seconds)
+
+
+def test_opens_after_consecutive_failures(breaker):
+    """Test that the circuit opens at the failure threshold."""
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError, match="2 consecutive failures"):
+        breaker.before_request()
+    assert breaker.status() == {"state": "open", "failures": 2}
+
+
+def test_success_resets_failures(breaker):
+    """Test that failures must be consecutive."""
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    breaker.before_request()
+    assert breaker.status() == {"state": "closed", "failures": 1}
+
+
+def test_state_shared_across_instances(breaker):
+    """Test that another process sees the open circuit."""
+    breaker.record_failure()
+    breaker.record_failure()
+    other = CircuitBreaker(breaker.path, failure_threshold=2, cooldown=60)
+
+    with pytest.raises(CircuitOpenError):
+        other.before_request()
+
+
+def test_single_probe_after_cooldown(breaker):
+    """Test that one probe goes through after the cool-down while others fail fast."""
+    breaker.record_failure()
+    breaker.record_failure()
+
+    with _later(61):
+        breaker.before_request()
+        with pytest.raises(CircuitOpenError, match="probe in progress"):
+            breaker.before_request()
+    assert breaker.status()["state"] == "half_open"
+
+
+def test_probe_success_closes(breaker):
+    """Test that a successful probe closes the circuit."""
+    breaker.record_failure()
+    breaker.record_failure()
+    with _later(61):
+        breaker.before_request()
+    breaker.record_success()
+
+    breaker.before_request()
+    assert breaker.status() == {"state": "closed", "failures": 0}
+
+
+def test_probe_failure_reopens(breaker):
+    """Test that a failed probe opens the circuit for another cool-down."""
+    breaker.record_failure()
+    breaker.record_failure()
+    with _later(61):
+        breaker.before_request()
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError, match="retrying in"):
+            breaker.before_request()
+
+
+def test_write_failure_removes_temp_file(breaker, tmp_path):
+    """Test that a state which cannot be serialized leaves no temporary file behind."""
+    with pytest.raises(TypeError):
+        breaker._write({"state": "open", "opened_at": object()})
+
+    assert [p.name for p in tmp_path.iterdir()] == []
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_fails_fast_when_open(mock_post, breaker):
+    """Test that DefenderClient stops sending requests once the circuit opens."""
+    mock_post.side_effect = requests.exceptions.ConnectTimeout("timed out")
+    client = DefenderClient("test_token", breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(DefenderAPIError, match="timed out"):
+            client.list_endpoints()
+    with pytest.raises(CircuitOpenError):
+        client.list_endpoints()
+
+    assert mock_post.call_count == 2
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_counts_server_errors(mock_post, breaker):
+    """Test that HTTP 5xx answers count as failures."""
+    response = Mock(status_code=502)
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError("502 Bad Gateway")
+    mock_post.return_value = response
+    client = DefenderClient("test_token", breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(DefenderAPIError):
+            client.list_endpoints()
+
+    assert breaker.status()["state"] == "open"
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_open_circuit_serves_offline_inventory(mock_post, breaker, tmp_path):
+    """Test that the offline fallback answers without any API call while open."""
+    cache = InventoryCache(str(tmp_path / "cache"), ttl=0, offline_max_age=3600)
+    cache.set(
+        cache.key(DefenderClient("test_token").base_url, "test_token", None),
+        {"value": [{"id": "ep1", "fqdn": "host1.com"}]},
+    )
+    breaker.record_failure()
+    breaker.record_failure()
+    client = DefenderClient("test_token", cache=cache, breaker=breaker)
+
+    assert client.list_endpoints()["value"][0]["id"] == "ep1"
+    assert client.inventory_offline is True
+    mock_post.assert_not_called()
+
+
+def test_breaker_state_in_perfdata(breaker):
+    """Test that the breaker state is reported as perfdata."""
+    breaker.record_failure()
+    breaker.record_failure()
+    client = Mock()
+    client.list_endpoints.return_value = {"value": []}
+    client.inventory_age = None
+    client.transport_metrics = DefenderClient("test_token", breaker=breaker).transport_metrics
+    service = EndpointsService(client)
+
+    _, output = NagiosPlugin(service, "endpoints").evaluate(warning=10, critical=25)
+
+    assert "breaker_state=2" in output
+    assert "breaker_failures=2" in output
+
+
+def test_get_circuit_breaker(tmp_path):
+    """Test breaker creation from the [breaker] section."""
+    config = configparser.ConfigParser()
+    assert get_circuit_breaker(config, "token") is None
+
+    config.read_string(
+        f"[cache]\ndir = {tmp_path}\n[breaker]\nfailure_threshold = 3\ncooldown = 30\n"
+    )
+    breaker = get_circuit_breaker(config, "secret_token")
+
+    assert breaker.failure_threshold == 3
+    assert breaker.cooldown == 30
+    assert breaker.path.startswith(str(tmp_path))
+    assert "secret_token" not in breaker.path
+    assert get_circuit_breaker(config, "other_token").path != breaker.path
+
+
+def test_get_circuit_breaker_needs_directory():
+    """Test that a state directory is required."""
+    config = configparser.ConfigParser()
+    config.read_string("[breaker]\nfailure_threshold = 3\n")
+
+    with pytest.raises(ConfigurationError, match="state_dir"):
+        get_circuit_breaker(config, "token")
@@ -0,0 +1,164 @@
+"""Unit tests for configuration loading and transport settings."""
+
+import configparser
+from pathlib import Path
+
+import pytest
+from unittest.mock import Mock, patch
+
+from check_bitdefender.core.config import TransportSettings, get_transport_settings, load_config
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import ConfigurationError
+from check_bitdefender.core.factory import create_async_client, create_client
+
+
+def _config(text):
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return config
+
+
+def test_transport_defaults():
+    """Test the defaults without [settings] timeout or [transport]."""
+    assert get_transport_settings(_config("[auth]\ntoken = t\n")) == TransportSettings()
+
+
+def test_settings_timeout_is_read_timeout():
+    """Test that the documented [settings] timeout is honored."""
+    settings = get_transport_settings(_config("[settings]\ntimeout = 30\n"))
+
+    assert settings.read_timeout == 30
+    assert settings.connect_timeout == 5
+
+
+def test_short_settings_timeout_caps_connect_timeout():
+    """Test that the default connect timeout is never longer than the read timeout."""
+    settings = get_transport_settings(_config("[settings]\ntimeout = 3\n"))
+
+    assert settings.connect_timeout == 3
+
+
+def test_transport_section():
+    """Test every option of the [transport] section."""
+    settings = get_transport_settings(
+        _config(
+            "[settings]\ntimeout = 30\n"
+            "[transport]\nconnect_timeout = 2\nread_timeout = 60\npool_size = 20\n"
+            "max_concurrency = 8\nretry_budget = 10\n"
+        )
+    )
+
+    assert settings == TransportSettings(
+        connect_timeout=2, read_timeout=60, pool_size=20, max_concurrency=8, retry_budget=10
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[settings]\ntimeout = soon\n",
+        "[transport]\nconnect_timeout = 0\n",
+        "[transport]\npool_size = 0\n",
+        "[transport]\nmax_concurrency = many\n",
+        "[transport]\nretry_budget = -1\n",
+    ],
+)
+def test_invalid_transport(text):
+    """Test that invalid transport settings are rejected."""
+    with pytest.raises(ConfigurationError):
+        get_transport_settings(_config(text))
+
+
+def test_load_config_validates_transport(tmp_path):
+    """Test that load_config rejects an invalid [transport] section."""
+    path = tmp_path / "check_bitdefender.ini"
+    path.write_text("[auth]\ntoken = t\n[transport]\nread_timeout = 45\n")
+
+    assert get_transport_settings(load_config(str(path))).read_timeout == 45
+
+    path.write_text("[transport]\npool_size = none\n")
+    with pytest.raises(ConfigurationError, match="transport"):
+        load_config(str(path))
+
+
+def test_example_config_creates_client():
+    """Test that the shipped example configuration works as is."""
+    example = Path(__file__).parents[2] / "check_bitdefender.ini.example"
+
+    client = create_client(load_config(str(example)))
+
+    assert client.authenticator == "xxx_secret_token_from_account_xxx"
+    assert client.breaker is None
+
+
+def test_create_client_applies_transport():
+    """Test that every tenant client gets the transport settings and one retry budget."""
+    client = create_client(
+        _config(
+            "[tenant:acme]\ntoken = t1\n[tenant:globex]\ntoken = t2\n"
+            "[transport]\nconnect_timeout = 2\nread_timeout = 60\npool_size = 20\n"
+            "max_concurrency = 8\nretry_budget = 10\n"
+        )
+    )
+
+    tenants = list(client.clients.values())
+    for tenant in tenants:
+        assert tenant._request_timeout() == (2, 60)
+        assert tenant.pool_size == 20
+        assert tenant.max_workers == 8
+        assert tenant.retry.budget == 10
+    assert tenants[0].retry is tenants[1].retry
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_request_uses_split_timeout(mock_post):
+    """Test that requests get separate connect and read timeouts."""
+    response = Mock(status_code=200)
+    response.json.return_value = {"result": {"items": [], "pagesCount": 1}}
+    mock_post.return_value = response
+    client = create_client(_config("[auth]\ntoken = t\n[settings]\ntimeout = 30\n"))
+    assert isinstance(client, DefenderClient)
+
+    client.list_endpoints()
+
+    assert mock_post.call_args.kwargs["timeout"] == (5, 30)
+
+
+def test_create_async_client_applies_transport():
+    """Test that the async client gets the transport settings."""
+    pytest.importorskip("aiohttp")
+    client = create_async_client(
+        _config(
+            "[auth]\ntoken = t\n[transport]\nconnect_timeout = 2\nread_timeout = 60\n"
+            "max_concurrency = 8\n"
+        )
+    )
+
+    timeout = client._client_timeout()
+    assert (timeout.sock_connect, timeout.sock_read) == (2, 60)
+    assert client.max_concurrency == 8
+
+
+def test_create_async_client_from_tenant_section(tmp_path):
+    """Test that the async client uses the tenant and the shared resilience settings."""
+    pytest.importorskip("aiohttp")
+    client = create_async_client(
+        _config(
+            f"[tenant:acme]\ntoken = t1\nparent_id = p1\nregion = eu\n"
+            f"[cache]\ndir = {tmp_path}\n[breaker]\nfailure_threshold = 3\n"
+            "[retry]\nmax_attempts = 4\n[ratelimit]\nrate = 5\n"
+        )
+    )
+
+    assert (client.authenticator, client.parent_id, client.region) == ("t1", "p1", "eu")
+    assert client.cache is not None
+    assert client.breaker.failure_threshold == 3
+    assert client.retry.max_attempts == 4
+    assert client.rate_limiter.rate == 5
+
+
+def test_create_async_client_single_tenant():
+    """Test that the async client refuses several tenants."""
+    pytest.importorskip("aiohttp")
+    with pytest.raises(ConfigurationError, match="single tenant"):
+        create_async_client(_config("[tenant:acme]\ntoken = t1\n[tenant:globex]\ntoken = t2\n"))
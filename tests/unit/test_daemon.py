@@ -0,0 +1,197 @@
+"""Unit tests for the check_bitdefender daemon."""
+
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import Mock, patch
+from click.testing import CliRunner
+
+from check_bitdefender.cli import main
+from check_bitdefender.core.daemon import DefenderDaemon, query_daemon
+from check_bitdefender.core.deadline import Deadline, DeadlineExceededError
+from check_bitdefender.core.exceptions import DefenderAPIError
+from check_bitdefender.core.nagios import NagiosPlugin
+from check_bitdefender.core.snapshot import SnapshotClient
+from check_bitdefender.services.lastseen_service import LastSeenService
+from tests.fixtures.mock_defender_client import inventory_finder
+
+
+@pytest.fixture
+def mock_client():
+    """Create a mock DefenderClient with a two endpoint inventory."""
+    client = Mock()
+    client.find_endpoint = inventory_finder(client)
+    client.list_endpoints.return_value = {
+        "value": [
+            {
+                "id": "ep1",
+                "fqdn": "host1.domain.tld",
+                "onboardingStatus": "Onboarded",
+                "osPlatform": "Windows",
+            },
+            {
+                "id": "ep2",
+                "fqdn": "host2.domain.tld",
+                "onboardingStatus": "InsufficientInfo",
+                "osPlatform": "Linux",
+            },
+        ]
+    }
+    last_seen = datetime.now(timezone(timedelta(hours=2))) - timedelta(days=12)
+    client.get_endpoint_details.return_value = {"lastSeen": last_seen.isoformat()}
+    return client
+
+
+@pytest.fixture
+def socket_path():
+    """Create a short Unix socket path."""
+    directory = tempfile.mkdtemp(prefix="cbd")
+    yield os.path.join(directory, "daemon.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def running_daemon(mock_client, socket_path):
+    """Run a daemon in a background thread."""
+    daemon = DefenderDaemon(mock_client, socket_path, refresh_interval=3600)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(socket_path):
+            break
+        time.sleep(0.01)
+    yield daemon
+    daemon.shutdown()
+    thread.join(timeout=5)
+
+
+def test_snapshot_client_fetches_once(mock_client):
+    """Test that the snapshot is shared by all list_endpoints calls."""
+    snapshot = SnapshotClient(mock_client)
+
+    snapshot.list_endpoints()
+    snapshot.list_endpoints()
+
+    mock_client.list_endpoints.assert_called_once()
+    assert snapshot.fetched_at is not None
+
+
+def test_snapshot_client_refresh_failure_keeps_snapshot(mock_client):
+    """Test that a failed refresh keeps the previous snapshot."""
+    snapshot = SnapshotClient(mock_client)
+    snapshot.refresh()
+    mock_client.list_endpoints.side_effect = DefenderAPIError("API down")
+
+    with pytest.raises(DefenderAPIError):
+        snapshot.refresh()
+
+    assert len(snapshot.list_endpoints()["value"]) == 2
+
+
+def test_handle_request_matches_plugin_check(mock_client, capsys):
+    """Test that the daemon answers exactly what NagiosPlugin.check prints."""
+    daemon = DefenderDaemon(mock_client, "/unused")
+    response = daemon.handle_request(
+        {"command": "lastseen", "dns_name": "host1.domain.tld", "warning": 7, "critical": 30}
+    )
+
+    exit_code = NagiosPlugin(LastSeenService(mock_client), "lastseen").check(
+        dns_name="host1.domain.tld", warning=7, critical=30
+    )
+
+    assert response == {"exit_code": exit_code, "output": capsys.readouterr().out}
+    assert response["exit_code"] == 1
+    assert "last seen 12 days ago" in response["output"]
+
+
+def test_handle_request_resets_retry_budget(mock_client):
+    """Test that every request starts with the whole retry budget."""
+    daemon = DefenderDaemon(mock_client, "/unused")
+    request = {"command": "lastseen", "dns_name": "host1.domain.tld"}
+
+    daemon.handle_request(request)
+    daemon.handle_request(request)
+
+    assert mock_client.reset_retry_budget.call_count == 2
+
+
+def test_handle_request_unsupported_command(mock_client):
+    """Test that unknown commands answer UNKNOWN."""
+    daemon = DefenderDaemon(mock_client, "/unused")
+
+    response = daemon.handle_request({"command": "reboot"})
+
+    assert response["exit_code"] == 3
+    assert "Unsupported command" in response["output"]
+
+
+def test_query_daemon_round_trip(running_daemon, socket_path, mock_client):
+    """Test querying the daemon over its Unix socket."""
+    exit_code, output = query_daemon(
+        socket_path, "onboarding", dns_name="host2.domain.tld", warning=2, critical=1
+    )
+
+    assert exit_code == 2
+    assert output.startswith("DEFENDER CRITICAL - Host not onboarded (host2.domain.tld)")
+
+    exit_code, output = query_daemon(
+        socket_path, "onboarding", dns_name="host1.domain.tld", warning=2, critical=1
+    )
+
+    assert exit_code == 0
+    # The inventory was fetched once for both queries
+    mock_client.list_endpoints.assert_called_once()
+
+
+def test_query_daemon_not_running(socket_path):
+    """Test that an unreachable daemon raises DefenderAPIError."""
+    with pytest.raises(DefenderAPIError, match="Failed to query daemon"):
+        query_daemon(socket_path, "onboarding", dns_name="host1.domain.tld")
+
+
+@pytest.fixture
+def silent_daemon(socket_path):
+    """Listen on the socket without ever answering, like a stuck daemon."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        server.listen()
+        yield server
+
+
+def test_query_daemon_bounded_by_deadline(silent_daemon, socket_path):
+    """Test that waiting for the daemon does not outlive the deadline."""
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError, match="waiting for the daemon"):
+        query_daemon(socket_path, "onboarding", deadline=Deadline(0.2), dns_name="host1")
+
+    assert time.monotonic() - start < 1
+
+
+def test_cli_socket_flag_with_deadline(silent_daemon, socket_path):
+    """Test that --deadline bounds a check answered by the daemon."""
+    start = time.monotonic()
+    result = CliRunner().invoke(
+        main, ["lastseen", "-d", "host1", "--socket", socket_path, "--deadline", "200ms"]
+    )
+
+    assert time.monotonic() - start < 1
+    assert result.exit_code == 3
+    assert "Deadline" in result.output
+
+
+def test_cli_socket_flag(running_daemon, socket_path):
+    """Test that check commands forward to the daemon with --socket."""
+    with patch("check_bitdefender.cli.commands.lastseen.load_config") as mock_config:
+        result = CliRunner().invoke(
+            main, ["lastseen", "-d", "host1.domain.tld", "--socket", socket_path]
+        )
+
+    assert result.exit_code == 1
+    assert result.output.startswith("DEFENDER WARNING - Host last seen 12 days ago")
+    mock_config.assert_not_called()
@@ -0,0 +1,184 @@
+"""Unit tests for the execution deadline."""
+
+import time
+
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from click.testing import CliRunner
+
+from check_bitdefender.cli import main
+from check_bitdefender.core.deadline import Deadline, DeadlineExceededError, parse_duration
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import DefenderAPIError
+from check_bitdefender.core.nagios import NagiosPlugin
+from check_bitdefender.core.ratelimit import RateLimiter
+from check_bitdefender.core.retry import RetryPolicy
+from check_bitdefender.services.lastseen_service import LastSeenService
+
+
+@pytest.mark.parametrize(
+    "value,seconds",
+    [
+        ("25", 25),
+        ("25s", 25),
+        ("1.5m", 90),
+        ("500ms", 0.5),
+        (" 10 s ", 10),
+    ],
+)
+def test_parse_duration(value, seconds):
+    """Test the accepted duration formats."""
+    assert parse_duration(value) == seconds
+
+
+@pytest.mark.parametrize("value", ["", "soon", "-5s", "0", "10h"])
+def test_parse_duration_invalid(value):
+    """Test that invalid durations are rejected."""
+    with pytest.raises(ValueError, match="Invalid duration"):
+        parse_duration(value)
+
+
+def test_deadline_check():
+    """Test that the deadline raises once it has passed."""
+    deadline = Deadline(0.05)
+    assert 0 < deadline.check("listing endpoints") <= 0.05
+    assert deadline.cap(15) <= 0.05
+
+    time.sleep(0.06)
+
+    assert deadline.expired
+    with pytest.raises(DeadlineExceededError, match="Deadline of 0.05s exceeded before listing"):
+        deadline.check("listing endpoints")
+
+
+def _ok():
+    response = Mock(status_code=200)
+    response.json.return_value = {"result": {"items": [], "pagesCount": 1}}
+    return response
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_caps_request_timeout(mock_post):
+    """Test that requests do not outlive the deadline."""
+    mock_post.return_value = _ok()
+    client = DefenderClient("test_token", timeout=15, deadline=Deadline(2))
+
+    client.list_endpoints()
+
+    assert mock_post.call_args.kwargs["timeout"] <= 2
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_stops_after_deadline(mock_post):
+    """Test that no request is sent once the deadline has passed."""
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    client = DefenderClient("test_token", deadline=deadline)
+
+    with pytest.raises(DeadlineExceededError):
+        client.list_endpoints()
+    mock_post.assert_not_called()
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_timeout_from_deadline_is_not_a_breaker_failure(mock_post):
+    """Test that a request cut short by the deadline reports the deadline."""
+    deadline = Deadline(0.05)
+
+    def slow(*args, **kwargs):
+        time.sleep(0.06)
+        raise requests.exceptions.ReadTimeout("read timed out")
+
+    mock_post.side_effect = slow
+    breaker = Mock()
+    client = DefenderClient("test_token", breaker=breaker, deadline=deadline)
+
+    with pytest.raises(DeadlineExceededError, match="waiting for the GravityZone API"):
+        client.list_endpoints()
+    breaker.record_failure.assert_not_called()
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_no_retry_past_deadline(mock_post):
+    """Test that a retry delay longer than the time left is not waited."""
+    mock_post.side_effect = requests.exceptions.ConnectionError("refused")
+    policy = RetryPolicy(max_attempts=5, backoff=10, backoff_max=10, budget=60)
+    policy.delay = Mock(return_value=5)
+    policy.sleep = Mock()
+    client = DefenderClient("test_token", retry=policy, deadline=Deadline(1))
+
+    with pytest.raises(DefenderAPIError, match="refused"):
+        client.list_endpoints()
+    assert mock_post.call_count == 1
+    policy.sleep.assert_not_called()
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_rate_limit_wait_bounded_by_deadline(mock_post, tmp_path):
+    """Test that a token available after the deadline is neither taken nor waited."""
+    limiter = RateLimiter(str(tmp_path / "ratelimit.json"), rate=0.1, burst=1)
+    limiter.acquire()
+    client = DefenderClient("test_token", rate_limiter=limiter, deadline=Deadline(1))
+
+    with patch("check_bitdefender.core.ratelimit.time.sleep") as sleep:
+        with pytest.raises(DeadlineExceededError, match="rate limit"):
+            client.list_endpoints()
+    sleep.assert_not_called()
+    mock_post.assert_not_called()
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_deadline_checked_after_rate_limit_wait(mock_post):
+    """Test that no request is sent when the rate limit wait used up the deadline."""
+    deadline = Deadline(0.05)
+    limiter = Mock()
+    limiter.acquire.side_effect = lambda max_wait: time.sleep(max_wait + 0.01) or max_wait
+    client = DefenderClient("test_token", rate_limiter=limiter, deadline=deadline)
+
+    with pytest.raises(DeadlineExceededError, match="before sending"):
+        client.list_endpoints()
+    mock_post.assert_not_called()
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_background_refresh_ignores_deadline(mock_post):
+    """Test that a refresh run by a forked process is not bound by the check's deadline."""
+    mock_post.return_value = _ok()
+    deadline = Deadline(0.01)
+    client = DefenderClient("test_token", deadline=deadline)
+    fetch = client._inventory_fetch(None)
+    time.sleep(0.02)
+
+    with pytest.raises(DeadlineExceededError):
+        fetch()
+    with patch("check_bitdefender.core.defender.os.getpid", return_value=-1):
+        assert fetch() == {"value": []}
+    assert client.deadline is None
+
+
+def test_service_reports_unknown_on_deadline():
+    """Test that missing details past the deadline give UNKNOWN, not a verdict."""
+    client = Mock()
+    client.find_endpoint.return_value = {"id": "ep1", "fqdn": "host1.domain.tld"}
+    client.get_endpoint_details.side_effect = DeadlineExceededError(
+        "Deadline of 25s exceeded before sending a GravityZone API request"
+    )
+    client.inventory_age = None
+    client.transport_metrics.return_value = {}
+    service = LastSeenService(client)
+
+    exit_code, output = NagiosPlugin(service, "lastseen").evaluate(
+        dns_name="host1.domain.tld", warning=7, critical=30
+    )
+
+    assert exit_code == 3
+    assert output.startswith("UNKNOWN: Deadline of 25s exceeded")
+
+
+def test_cli_rejects_invalid_deadline():
+    """Test that an invalid --deadline is a usage error."""
+    result = CliRunner().invoke(main, ["endpoints", "--deadline", "soon"])
+
+    assert result.exit_code == 2
+    assert "Invalid duration" in result.output
@@ -94,7 +94,7 @@ def test_extract_os_platform_unknown(client):
     assert client._extract_os_platform("") == "Unknown"
 
 
-@patch('check_bitdefender.core.defender.requests.post')
+@patch('check_bitdefender.core.defender.requests.Session.post')
 def test_list_endpoints_success(mock_post, client):
     """Test successful endpoint listing."""
     # Mock API response
@@ -143,11 +143,15 @@ def test_list_endpoints_success(mock_post, client):
     assert result["value"][1]["onboardingStatus"] == "InsufficientInfo"
     assert result["value"][1]["osPlatform"] == "Linux"
     assert result["value"][1]["lastSeen"] == "2024-01-02T00:00:00Z"
+    assert result["value"][0]["lastSeenSource"] == "lastSeen"
+    assert result["value"][1]["lastSeenSource"] == "lastSuccessfulScan"
+    assert result["value"][0]["lastSuccessfulScan"] is None
+    assert result["value"][1]["lastSuccessfulScan"] == {"date": "2024-01-02T00:00:00Z"}
 
     mock_post.assert_called_once()
 
 
-@patch('check_bitdefender.core.defender.requests.post')
+@patch('check_bitdefender.core.defender.requests.Session.post')
 def test_list_endpoints_with_pagination(mock_post, client):
     """Test endpoint listing with multiple pages."""
     # Mock responses for 2 pages
@@ -181,7 +185,7 @@ def test_list_endpoints_with_pagination(mock_post, client):
     assert mock_post.call_count == 2
 
 
-@patch('check_bitdefender.core.defender.requests.post')
+@patch('check_bitdefender.core.defender.requests.Session.post')
 def test_list_endpoints_with_parent_id(mock_post, client_with_parent):
     """Test endpoint listing with parent_id."""
     mock_response = Mock()
@@ -203,7 +207,7 @@ def test_list_endpoints_with_parent_id(mock_post, client_with_parent):
     assert payload['params']['parentId'] == 'parent123'
 
 
-@patch('check_bitdefender.core.defender.requests.post')
+@patch('check_bitdefender.core.defender.requests.Session.post')
 def test_list_endpoints_with_override_parent_id(mock_post, client):
     """Test endpoint listing with override parent_id parameter."""
     mock_response = Mock()
@@ -225,7 +229,7 @@ def test_list_endpoints_with_override_parent_id(mock_post, client):
     assert payload['params']['parentId'] == 'override_parent'
 
 
-@patch('check_bitdefender.core.defender.requests.post')
+@patch('check_bitdefender.core.defender.requests.Session.post')
 def test_list_endpoints_missing_result(mock_post, client):
     """Test handling of invalid API response missing 'result' field."""
     mock_response = Mock()
@@ -237,7 +241,7 @@ def test_list_endpoints_missing_result(mock_post, client):
         client.list_endpoints()
 
 
-@patch('check_bitdefender.core.defender.requests.post')
+@patch('check_bitdefender.core.defender.requests.Session.post')
 def test_list_endpoints_request_exception(mock_post, client):
     """Test handling of request exceptions."""
     mock_post.side_effect = requests.exceptions.ConnectionError("Connection failed")
@@ -246,7 +250,7 @@ def test_list_endpoints_request_exception(mock_post, client):
         client.list_endpoints()
 
 
-@patch('check_bitdefender.core.defender.requests.post')
+@patch('check_bitdefender.core.defender.requests.Session.post')
 def test_list_endpoints_http_error(mock_post, client):
     """Test handling of HTTP errors."""
     mock_response = Mock()
@@ -257,7 +261,7 @@ def test_list_endpoints_http_error(mock_post, client):
         client.list_endpoints()
 
 
-@patch('check_bitdefender.core.defender.requests.post')
+@patch('check_bitdefender.core.defender.requests.Session.post')
 def test_get_endpoint_details_success(mock_post, client):
     """Test successful endpoint details retrieval."""
     mock_response = Mock()
@@ -288,7 +292,7 @@ def test_get_endpoint_details_success(mock_post, client):
     assert payload['params']['options']['includeScanLogs'] is True
 
 
-@patch('check_bitdefender.core.defender.requests.post')
+@patch('check_bitdefender.core.defender.requests.Session.post')
 def test_get_endpoint_details_missing_result(mock_post, client):
     """Test handling of invalid response missing 'result' field."""
     mock_response = Mock()
@@ -300,7 +304,7 @@ def test_get_endpoint_details_missing_result(mock_post, client):
         client.get_endpoint_details("ep123")
 
 
-@patch('check_bitdefender.core.defender.requests.post')
+@patch('check_bitdefender.core.defender.requests.Session.post')
 def test_get_endpoint_details_request_exception(mock_post, client):
     """Test handling of request exceptions."""
     mock_post.side_effect = requests.exceptions.Timeout("Request timeout")
@@ -309,7 +313,7 @@ def test_get_endpoint_details_request_exception(mock_post, client):
         client.get_endpoint_details("ep123")
 
 
-@patch('check_bitdefender.core.defender.requests.post')
+@patch('check_bitdefender.core.defender.requests.Session.post')
 def test_list_endpoints_empty_items(mock_post, client):
     """Test handling of empty items list."""
     mock_response = Mock()
@@ -327,3 +331,111 @@ def test_list_endpoints_empty_items(mock_post, client):
 
     assert "value" in result
     assert len(result["value"]) == 0
+
+
+@patch('check_bitdefender.core.defender.requests.Session.post')
+def test_list_endpoints_requests_every_page(mock_post, client):
+    """Test that each page is requested once with its page number."""
+    def page_response(url, json, **kwargs):
+        page = json['params']['page']
+        response = Mock()
+        response.raise_for_status = Mock()
+        response.json.return_value = {
+            "result": {
+                "items": [{"id": f"ep{page}", "fqdn": f"host{page}.com"}],
+                "pagesCount": 3,
+                "total": 3
+            }
+        }
+        return response
+
+    mock_post.side_effect = page_response
+
+    result = client.list_endpoints()
+
+    requested_pages = sorted(c.kwargs['json']['params']['page'] for c in mock_post.call_args_list)
+    assert requested_pages == [1, 2, 3]
+    assert [e["id"] for e in result["value"]] == ["ep1", "ep2", "ep3"]
+
+
+@patch('check_bitdefender.core.defender.requests.Session.post')
+def test_list_endpoints_page_failure(mock_post, client):
+    """Test that a failing page fails the whole listing."""
+    def page_response(url, json, **kwargs):
+        if json['params']['page'] == 2:
+            raise requests.exceptions.ConnectionError("Connection reset")
+        response = Mock()
+        response.raise_for_status = Mock()
+        response.json.return_value = {"result": {"items": [], "pagesCount": 3, "total": 250}}
+        return response
+
+    mock_post.side_effect = page_response
+
+    with pytest.raises(DefenderAPIError, match="Failed to list endpoints"):
+        client.list_endpoints()
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_get_endpoints_details_transport_error(mock_post, client):
+    """Test that a failed batch reports an error for each of its endpoints."""
+    mock_post.side_effect = requests.exceptions.ConnectionError("Connection failed")
+
+    results = client.get_endpoints_details(["ep1", "ep2"])
+
+    assert set(results) == {"ep1", "ep2"}
+    assert all(isinstance(error, DefenderAPIError) for error in results.values())
+    assert client.batch_supported is True
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_get_endpoints_details_http_400_refusal(mock_post, client):
+    """Test that an HTTP 400 answer to a batch switches to single calls."""
+    refused = Mock(status_code=400)
+    single = Mock(status_code=200)
+    single.raise_for_status = Mock()
+    single.json.return_value = {"result": {"id": "ep1"}}
+    mock_post.side_effect = [refused, single]
+
+    results = client.get_endpoints_details(["ep1"])
+
+    assert results == {"ep1": {"id": "ep1"}}
+    assert client.batch_supported is False
+    assert isinstance(mock_post.call_args_list[0].kwargs["json"], list)
+    assert mock_post.call_args_list[1].kwargs["json"]["method"] == "getManagedEndpointDetails"
+
+
+def test_session_pool_configuration():
+    """Test that the session pools connections per host."""
+    client = DefenderClient("test_token", pool_size=7)
+    adapter = client.session.get_adapter("https://cloudgz.gravityzone.bitdefender.com")
+
+    assert adapter._pool_maxsize == 7
+    assert adapter._pool_block is True
+    assert client.connection_stats() == {"requests": 0, "connections": 0, "reused": 0}
+    client.close()
+
+
+def test_init_invalid_page_order():
+    """Test that an unknown page order is rejected."""
+    with pytest.raises(ValueError, match="page_order"):
+        DefenderClient("token", page_order="sideways")
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_find_endpoint_uses_cache(mock_post, tmp_path):
+    """Test that find_endpoint searches the cached snapshot when a cache is configured."""
+    from check_bitdefender.core.cache import InventoryCache
+
+    mock_response = Mock()
+    mock_response.json.return_value = {
+        "result": {
+            "items": [{"id": "ep1", "details": {"fqdn": "host1.domain.tld"}}],
+            "pagesCount": 1,
+        }
+    }
+    mock_post.return_value = mock_response
+    client = DefenderClient("token", cache=InventoryCache(str(tmp_path), ttl=60))
+
+    assert client.find_endpoint(fqdn="host1")["id"] == "ep1"
+    assert client.find_endpoint(endpoint_id="ep1")["id"] == "ep1"
+    mock_post.assert_called_once()
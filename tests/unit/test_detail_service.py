@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import Mock
 from check_bitdefender.services.detail_service import DetailService
 from check_bitdefender.core.exceptions import DefenderAPIError
+from tests.fixtures.mock_defender_client import inventory_finder
 
 
 @pytest.fixture
@@ -11,6 +12,7 @@ def mock_client():
     """Create a mock DefenderClient."""
     client = Mock()
     client.list_endpoints = Mock()
+    client.find_endpoint = inventory_finder(client)
     client.get_endpoint_details = Mock()
     return client
 
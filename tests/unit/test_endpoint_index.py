@@ -0,0 +1,123 @@
+"""Unit tests for EndpointIndex."""
+
+import time
+
+import pytest
+
+from check_bitdefender.services.endpoint_index import EndpointIndex, short_hostname
+
+
+@pytest.fixture
+def endpoints():
+    """Create a small inventory."""
+    return [
+        {"id": "ep1", "fqdn": "Host1.Domain.tld"},
+        {"id": "ep2", "fqdn": "host2.domain.tld"},
+        {"id": "ep3", "fqdn": "web.site-a.tld"},
+        {"id": "ep4", "fqdn": "web.site-b.tld"},
+        {"id": "ep5", "fqdn": "bare-host"},
+        {"id": "ep6", "fqdn": "host2.domain.tld"},
+        {"id": "ep7", "fqdn": ""},
+    ]
+
+
+@pytest.fixture
+def index(endpoints):
+    """Create index over the inventory."""
+    return EndpointIndex(endpoints)
+
+
+def test_short_hostname():
+    """Test short hostname extraction."""
+    assert short_hostname("Host1.Domain.tld") == "host1"
+    assert short_hostname("host1") == "host1"
+
+
+def test_len(index):
+    """Test index size."""
+    assert len(index) == 7
+
+
+def test_lookup_by_id(index):
+    """Test lookup by endpoint id."""
+    assert index.lookup(endpoint_id="ep2")["fqdn"] == "host2.domain.tld"
+    assert index.lookup(endpoint_id="missing") is None
+
+
+def test_lookup_id_takes_precedence(index):
+    """Test that the endpoint id is tried before the DNS name."""
+    assert index.lookup(endpoint_id="ep3", dns_name="host2.domain.tld")["id"] == "ep3"
+    assert index.lookup(endpoint_id="missing", dns_name="host2.domain.tld")["id"] == "ep2"
+
+
+def test_lookup_exact_fqdn_first_match_wins(index):
+    """Test that duplicates resolve to the first endpoint like a linear scan."""
+    assert index.lookup(dns_name="host2.domain.tld")["id"] == "ep2"
+
+
+def test_lookup_case_insensitive(index):
+    """Test case-insensitive fqdn lookup."""
+    assert index.lookup(dns_name="host1.domain.TLD")["id"] == "ep1"
+
+
+def test_lookup_short_hostname(index):
+    """Test lookup of a bare host name."""
+    assert index.lookup(dns_name="HOST1")["id"] == "ep1"
+
+
+def test_lookup_ambiguous_short_hostname(index):
+    """Test that short names shared by several endpoints do not match."""
+    assert index.lookup(dns_name="web") is None
+
+
+def test_lookup_qualified_name_for_bare_endpoint(index):
+    """Test that a qualified name matches an endpoint registered without domain."""
+    assert index.lookup(dns_name="bare-host.domain.tld")["id"] == "ep5"
+
+
+def test_lookup_qualified_name_other_domain(index):
+    """Test that a qualified name never matches a host in another domain."""
+    assert index.lookup(dns_name="host1.other.tld") is None
+
+
+def test_lookup_nothing(index):
+    """Test lookup without identifiers."""
+    assert index.lookup() is None
+
+
+def test_of_reuses_index_for_same_snapshot(endpoints):
+    """Test that the index is built once per snapshot."""
+    inventory = {"value": endpoints}
+
+    assert EndpointIndex.of(inventory) is EndpointIndex.of(inventory)
+    assert EndpointIndex.of(inventory) is not EndpointIndex.of({"value": list(endpoints)})
+
+
+def test_of_rebuilds_after_snapshot_change(endpoints):
+    """Test that a modified snapshot gets a new index."""
+    inventory = {"value": endpoints}
+    EndpointIndex.of(inventory)
+
+    endpoints.append({"id": "ep8", "fqdn": "new.domain.tld"})
+
+    assert EndpointIndex.of(inventory).lookup(dns_name="new.domain.tld")["id"] == "ep8"
+
+
+def test_of_missing_value():
+    """Test index of an empty response."""
+    assert len(EndpointIndex.of({})) == 0
+
+
+def test_lookup_benchmark_100k_endpoints():
+    """Test that lookups stay constant-time at 100k endpoints."""
+    endpoints = [{"id": f"ep{i}", "fqdn": f"host{i}.domain.tld"} for i in range(100_000)]
+    index = EndpointIndex(endpoints)
+
+    start = time.perf_counter()
+    for i in range(0, 100_000, 10):
+        assert index.lookup(dns_name=f"HOST{i}")["id"] == f"ep{i}"
+        assert index.lookup(endpoint_id=f"ep{i}") is endpoints[i]
+    elapsed = time.perf_counter() - start
+
+    # 20k lookups; a linear scan would need about 10^9 comparisons
+    assert elapsed < 1.0
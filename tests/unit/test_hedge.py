@@ -0,0 +1,84 @@
+"""Unit tests for the hedge policy."""
+
+import configparser
+
+import pytest
+
+from check_bitdefender.core.exceptions import ConfigurationError
+from check_bitdefender.core.hedge import HedgePolicy, get_hedge_policy
+
+
+def test_initial_delay_until_enough_samples():
+    """Test that the initial delay applies while few response times are known."""
+    policy = HedgePolicy(initial_delay=2.0)
+    for _ in range(HedgePolicy.min_samples - 1):
+        policy.record(0.1)
+
+    assert policy.delay() == 2.0
+
+
+def test_delay_is_percentile_of_samples():
+    """Test that the delay follows the configured percentile."""
+    policy = HedgePolicy(percentile=90, min_delay=0)
+    for latency in range(1, 11):
+        policy.record(latency / 10)
+
+    assert policy.delay() == pytest.approx(0.9)
+
+
+def test_min_delay():
+    """Test that very fast responses do not make every request hedged."""
+    policy = HedgePolicy(min_delay=0.5)
+    for _ in range(10):
+        policy.record(0.01)
+
+    assert policy.delay() == 0.5
+
+
+def test_hedges_capped():
+    """Test that hedged requests stay within max_ratio of the requests."""
+    policy = HedgePolicy(max_ratio=0.2)
+    allowed = 0
+    for _ in range(20):
+        policy.start()
+        allowed += policy.try_hedge()
+
+    assert allowed == 4
+    assert policy.rate == pytest.approx(0.2)
+
+
+def test_first_hedge_always_allowed():
+    """Test that short inventories may hedge one request."""
+    policy = HedgePolicy(max_ratio=0.1)
+    policy.start()
+
+    assert policy.try_hedge() is True
+    assert policy.try_hedge() is False
+
+
+def test_get_hedge_policy():
+    """Test policy creation from the [hedge] section."""
+    config = configparser.ConfigParser()
+    assert get_hedge_policy(config) is None
+
+    config.read_string("[hedge]\npercentile = 99\ninitial_delay = 2\nmax_ratio = 0.05\n")
+    policy = get_hedge_policy(config)
+
+    assert (policy.percentile, policy.initial_delay, policy.max_ratio) == (99, 2, 0.05)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[hedge]\npercentile = 0\n",
+        "[hedge]\nmax_ratio = -1\n",
+        "[hedge]\nmin_delay = soon\n",
+    ],
+)
+def test_get_hedge_policy_invalid(text):
+    """Test that invalid hedge settings are rejected."""
+    config = configparser.ConfigParser()
+    config.read_string(text)
+
+    with pytest.raises(ConfigurationError, match="hedge"):
+        get_hedge_policy(config)
@@ -0,0 +1,327 @@
+"""Unit tests for InventoryCache."""
+
+import configparser
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import Mock, patch
+
+from check_bitdefender.core.cache import InventoryCache, get_inventory_cache
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import ConfigurationError, DefenderAPIError
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create InventoryCache in a temporary directory."""
+    return InventoryCache(str(tmp_path / "cache"), ttl=60)
+
+
+def _inventory_response():
+    """Build a single page getNetworkInventoryItems response."""
+    mock_response = Mock()
+    mock_response.json.return_value = {
+        "result": {
+            "items": [{"id": "ep1", "fqdn": "host1.com", "details": {"isManaged": True}}],
+            "pagesCount": 1,
+            "total": 1,
+        }
+    }
+    mock_response.raise_for_status = Mock()
+    return mock_response
+
+
+def test_key_does_not_leak_parts(cache):
+    """Test that cache keys are hashed."""
+    key = cache.key("https://example", "secret_token", None)
+    assert "secret_token" not in key
+    assert key == cache.key("https://example", "secret_token", None)
+    assert key != cache.key("https://example", "secret_token", "parent")
+
+
+def test_get_missing(cache):
+    """Test cache miss when no file exists."""
+    assert cache.get("missing") is None
+
+
+def test_set_and_get(cache):
+    """Test that stored data is returned while fresh."""
+    cache.set("k", {"value": [{"id": "ep1"}]})
+    assert cache.get("k") == {"value": [{"id": "ep1"}]}
+
+
+def test_set_leaves_no_temporary_files(cache):
+    """Test that atomic writes clean up after themselves."""
+    cache.set("k", {"value": []})
+    assert os.listdir(cache.directory) == [os.path.basename(cache.path("k"))]
+
+
+def test_get_expired(cache):
+    """Test that entries older than the TTL are ignored."""
+    cache.set("k", {"value": []})
+    with patch("check_bitdefender.core.cache.time.time", return_value=time.time() + 61):
+        assert cache.get("k") is None
+    # Expired entries remain loadable
+    assert cache.load("k")["data"] == {"value": []}
+
+
+def test_get_corrupt_file(cache):
+    """Test that a corrupt cache file is treated as a miss."""
+    os.makedirs(cache.directory)
+    with open(cache.path("k"), "w") as f:
+        f.write("{not json")
+    assert cache.get("k") is None
+
+
+def test_get_incompatible_version(cache):
+    """Test that files from another format version are ignored."""
+    os.makedirs(cache.directory)
+    with open(cache.path("k"), "w") as f:
+        json.dump({"version": 0, "fetched_at": time.time(), "data": {}}, f)
+    assert cache.get("k") is None
+
+
+def test_get_or_fetch_fetches_once(cache):
+    """Test that fetch is only called on a miss."""
+    fetch = Mock(return_value={"value": [{"id": "ep1"}]})
+
+    assert cache.get_or_fetch("k", fetch) == {"value": [{"id": "ep1"}]}
+    assert cache.get_or_fetch("k", fetch) == {"value": [{"id": "ep1"}]}
+    fetch.assert_called_once()
+
+
+def test_get_or_fetch_unwritable_directory(tmp_path):
+    """Test that a cache write failure does not fail the fetch."""
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = InventoryCache(str(blocker / "cache"), ttl=60)
+
+    assert cache.get_or_fetch("k", lambda: {"value": []}) == {"value": []}
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_list_endpoints_uses_cache(mock_post, cache):
+    """Test that DefenderClient serves list_endpoints from the cache."""
+    mock_post.return_value = _inventory_response()
+    client = DefenderClient("test_token", cache=cache)
+
+    first = client.list_endpoints()
+    second = client.list_endpoints()
+
+    assert first == second
+    assert second["value"][0]["id"] == "ep1"
+    mock_post.assert_called_once()
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_cache_shared_between_instances(mock_post, cache):
+    """Test that a snapshot written by one client is read by another."""
+    mock_post.return_value = _inventory_response()
+
+    DefenderClient("test_token", cache=cache).list_endpoints()
+    other = InventoryCache(cache.directory, ttl=60)
+    result = DefenderClient("test_token", cache=other).list_endpoints()
+
+    assert result["value"][0]["id"] == "ep1"
+    mock_post.assert_called_once()
+
+
+def _age_entry(cache, key, seconds):
+    """Make the cache entry of a key look fetched some seconds ago."""
+    with open(cache.path(key)) as f:
+        entry = json.load(f)
+    entry["fetched_at"] -= seconds
+    with open(cache.path(key), "w") as f:
+        json.dump(entry, f)
+
+
+def test_get_or_fetch_serves_stale_within_grace(tmp_path):
+    """Test that an entry expired within the grace period is served at once."""
+    cache = InventoryCache(str(tmp_path), ttl=60, grace=120)
+    cache.set("k", {"value": [{"id": "old"}]})
+    _age_entry(cache, "k", 100)
+    fetch = Mock()
+
+    with patch.object(cache, "spawn_refresh") as spawn_refresh:
+        assert cache.get_or_fetch("k", fetch) == {"value": [{"id": "old"}]}
+
+    spawn_refresh.assert_called_once_with("k", fetch)
+    fetch.assert_not_called()
+    assert cache.last_stale is True
+    assert 99 < cache.last_age < 110
+
+
+def test_get_or_fetch_beyond_grace_fetches(tmp_path):
+    """Test that an entry older than TTL plus grace is refreshed synchronously."""
+    cache = InventoryCache(str(tmp_path), ttl=60, grace=30)
+    cache.set("k", {"value": [{"id": "old"}]})
+    _age_entry(cache, "k", 100)
+
+    with patch.object(cache, "spawn_refresh") as spawn_refresh:
+        assert cache.get_or_fetch("k", lambda: {"value": [{"id": "new"}]}) == {
+            "value": [{"id": "new"}]
+        }
+
+    spawn_refresh.assert_not_called()
+    assert cache.last_age == 0.0
+    assert cache.last_stale is False
+
+
+def test_get_or_fetch_refreshes_in_background(tmp_path):
+    """Test that a detached process writes the refreshed snapshot."""
+    cache = InventoryCache(str(tmp_path), ttl=60, grace=120)
+    cache.set("k", {"value": [{"id": "old"}]})
+    _age_entry(cache, "k", 100)
+
+    assert cache.get_or_fetch("k", lambda: {"value": [{"id": "new"}]})["value"][0]["id"] == "old"
+
+    deadline = time.monotonic() + 5
+    while cache.get("k") is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert cache.get("k") == {"value": [{"id": "new"}]}
+
+
+def test_spawn_refresh_skipped_with_threads(tmp_path):
+    """Test that a multi-threaded process does not fork a background refresh."""
+    cache = InventoryCache(str(tmp_path), ttl=60, grace=120)
+
+    with (
+        patch("check_bitdefender.core.cache.threading.active_count", return_value=2),
+        patch("check_bitdefender.core.cache.os.fork") as fork,
+    ):
+        assert cache.spawn_refresh("k", Mock()) is False
+
+    fork.assert_not_called()
+
+
+def test_get_or_fetch_from_worker_thread_refreshes_in_foreground(tmp_path):
+    """Test that a thread pool worker, as used per tenant, refreshes instead of serving stale."""
+    cache = InventoryCache(str(tmp_path), ttl=60, grace=120)
+    cache.set("k", {"value": [{"id": "old"}]})
+    _age_entry(cache, "k", 100)
+
+    with patch("check_bitdefender.core.cache.os.fork") as fork:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(
+                cache.get_or_fetch, "k", lambda: {"value": [{"id": "new"}]}
+            ).result()
+
+    assert result == {"value": [{"id": "new"}]}
+    assert cache.last_stale is False
+    fork.assert_not_called()
+
+
+def _failing_fetch():
+    raise DefenderAPIError("Failed to list endpoints: connection refused")
+
+
+def test_get_or_fetch_offline_fallback(tmp_path):
+    """Test that a failed refresh serves the last good snapshot within the max age."""
+    cache = InventoryCache(str(tmp_path), ttl=60, offline_max_age=3600)
+    cache.set("k", {"value": [{"id": "old"}]})
+    _age_entry(cache, "k", 600)
+
+    assert cache.get_or_fetch("k", _failing_fetch) == {"value": [{"id": "old"}]}
+    assert cache.last_offline is True
+    assert cache.last_stale is True
+    assert 599 < cache.last_age < 610
+
+
+def test_get_or_fetch_offline_fallback_too_old(tmp_path):
+    """Test that a snapshot older than the max age lets the failure through."""
+    cache = InventoryCache(str(tmp_path), ttl=60, offline_max_age=300)
+    cache.set("k", {"value": [{"id": "old"}]})
+    _age_entry(cache, "k", 600)
+
+    with pytest.raises(DefenderAPIError, match="connection refused"):
+        cache.get_or_fetch("k", _failing_fetch)
+
+
+def test_get_or_fetch_offline_fallback_disabled(tmp_path):
+    """Test that failures are reported without an offline max age."""
+    cache = InventoryCache(str(tmp_path), ttl=60)
+    cache.set("k", {"value": [{"id": "old"}]})
+    _age_entry(cache, "k", 600)
+
+    with pytest.raises(DefenderAPIError):
+        cache.get_or_fetch("k", _failing_fetch)
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_reports_inventory_age(mock_post, cache):
+    """Test that DefenderClient exposes the age of the cached inventory."""
+    mock_post.return_value = _inventory_response()
+    client = DefenderClient("test_token", cache=cache)
+
+    client.list_endpoints()
+    assert client.inventory_age == 0.0
+
+    client.list_endpoints()
+    assert client.inventory_age is not None and client.inventory_age < 5
+    assert client.inventory_stale is False
+
+
+def test_get_inventory_cache_not_configured():
+    """Test that no cache is created without a [cache] dir."""
+    config = configparser.ConfigParser()
+    assert get_inventory_cache(config) is None
+
+    config.read_string("[cache]\nttl = 60\n")
+    assert get_inventory_cache(config) is None
+
+
+def test_get_inventory_cache_configured(tmp_path):
+    """Test cache creation from the [cache] section."""
+    config = configparser.ConfigParser()
+    config.read_string(f"[cache]\ndir = {tmp_path}\nttl = 120\n")
+
+    cache = get_inventory_cache(config)
+
+    assert cache is not None
+    assert cache.directory == str(tmp_path)
+    assert cache.ttl == 120
+
+
+def test_get_inventory_cache_invalid_ttl(tmp_path):
+    """Test that an invalid ttl raises ConfigurationError."""
+    config = configparser.ConfigParser()
+    config.read_string(f"[cache]\ndir = {tmp_path}\nttl = soon\n")
+
+    with pytest.raises(ConfigurationError, match="ttl"):
+        get_inventory_cache(config)
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_iter_endpoints_uses_cache(mock_post, cache):
+    """Test that iter_endpoints streams a fresh cached snapshot."""
+    mock_post.return_value = _inventory_response()
+    client = DefenderClient("test_token", cache=cache)
+    client.list_endpoints()
+
+    assert [e["id"] for e in client.iter_endpoints()] == ["ep1"]
+    mock_post.assert_called_once()
+
+
+def test_get_inventory_cache_grace(tmp_path):
+    """Test the stale-while-revalidate grace period setting."""
+    config = configparser.ConfigParser()
+    config.read_string(f"[cache]\ndir = {tmp_path}\ngrace = 600\n")
+    assert get_inventory_cache(config).grace == 600
+
+    config.read_string(f"[cache]\ndir = {tmp_path}\ngrace = -1\n")
+    with pytest.raises(ConfigurationError, match="grace"):
+        get_inventory_cache(config)
+
+
+def test_get_inventory_cache_offline_max_age(tmp_path):
+    """Test the offline fallback maximum age setting."""
+    config = configparser.ConfigParser()
+    config.read_string(f"[cache]\ndir = {tmp_path}\noffline_max_age = 86400\n")
+    assert get_inventory_cache(config).offline_max_age == 86400
+
+    config.read_string(f"[cache]\ndir = {tmp_path}\noffline_max_age = never\n")
+    with pytest.raises(ConfigurationError, match="offline_max_age"):
+        get_inventory_cache(config)
@@ -0,0 +1,250 @@
+"""Unit tests for the SQLite InventoryStore."""
+
+import configparser
+import sqlite3
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from check_bitdefender.core.cache import get_inventory_cache
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import ConfigurationError
+from check_bitdefender.core.store import InventoryStore
+from check_bitdefender.services.endpoint_index import EndpointIndex
+
+ENDPOINTS = [
+    {"id": "ep1", "fqdn": "web01.example.com"},
+    {"id": "ep2", "fqdn": "Mail.Example.com"},
+    {"id": "ep3", "fqdn": "db01.example.com"},
+    {"id": "ep4", "fqdn": "db01.other.com"},
+    {"id": "ep5", "fqdn": "printer"},
+    {"id": "ep6"},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create InventoryStore in a temporary directory."""
+    return InventoryStore(str(tmp_path / "cache"), ttl=60)
+
+
+def _connect(store):
+    return sqlite3.connect(store.database)
+
+
+def test_set_and_load_round_trip(store):
+    """Test that a snapshot loads back in inventory order with its metadata."""
+    store.set("k", {"value": ENDPOINTS, "total": 6})
+
+    entry = store.load("k")
+
+    assert entry["data"] == {"value": ENDPOINTS, "total": 6}
+    assert time.time() - entry["fetched_at"] < 5
+    assert store.get("k") == {"value": ENDPOINTS, "total": 6}
+    assert store.load("other") is None
+
+
+def test_wal_mode(store):
+    """Test that readers do not block the syncing writer."""
+    store.set("k", {"value": ENDPOINTS})
+
+    with _connect(store) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sync_upserts_changes_and_deletes_gone(store):
+    """Test that a sync only rewrites changed endpoints and deletes removed ones."""
+    store.set("k", {"value": ENDPOINTS})
+    with _connect(store) as conn:
+        conn.execute("CREATE TABLE updates (id TEXT)")
+        conn.execute(
+            "CREATE TRIGGER count_updates AFTER UPDATE ON endpoints"
+            " BEGIN INSERT INTO updates VALUES (new.id); END"
+        )
+
+    changed = dict(ENDPOINTS[-1], fqdn="kiosk.example.com")
+    store.set("k", {"value": ENDPOINTS[:4] + [changed, {"id": "ep7", "fqdn": "new"}]})
+
+    with _connect(store) as conn:
+        updates = [row[0] for row in conn.execute("SELECT id FROM updates")]
+    assert updates == ["ep6"]
+    assert [e["id"] for e in store.load("k")["data"]["value"]] == [
+        "ep1",
+        "ep2",
+        "ep3",
+        "ep4",
+        "ep6",
+        "ep7",
+    ]
+
+
+def test_snapshots_kept_per_key(store):
+    """Test that syncing one inventory leaves the others alone."""
+    store.set("a", {"value": ENDPOINTS[:2]})
+    store.set("b", {"value": ENDPOINTS[2:]})
+    store.set("a", {"value": ENDPOINTS[:1]})
+
+    assert len(store.load("b")["data"]["value"]) == 4
+
+
+@pytest.mark.parametrize(
+    "endpoint_id,dns_name",
+    [
+        ("ep3", None),
+        ("missing", "web01.example.com"),
+        (None, "mail.example.com"),
+        (None, "WEB01"),
+        (None, "db01"),
+        (None, "printer.example.com"),
+        (None, "unknown"),
+        (None, None),
+    ],
+)
+def test_lookup_matches_endpoint_index(store, endpoint_id, dns_name):
+    """Test that indexed lookups match EndpointIndex, ambiguity included."""
+    store.set("k", {"value": ENDPOINTS})
+
+    assert store.lookup("k", endpoint_id, dns_name) == EndpointIndex(ENDPOINTS).lookup(
+        endpoint_id, dns_name
+    )
+
+
+def test_lookup_uses_indexes(store):
+    """Test that host lookups are indexed queries."""
+    store.set("k", {"value": ENDPOINTS})
+
+    with _connect(store) as conn:
+        for column in ("id", "fqdn", "fqdn_lower", "short_name"):
+            plan = " ".join(
+                str(row[-1])
+                for row in conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT data FROM endpoints WHERE key = ? AND {column} = ?",
+                    ("k", "x"),
+                )
+            )
+            assert "INDEX" in plan, plan
+
+
+def test_find_does_not_load_fresh_inventory(store):
+    """Test that a fresh snapshot is queried without loading or fetching it."""
+    store.set("k", {"value": ENDPOINTS})
+    fetch = Mock()
+
+    with patch.object(store, "load") as load:
+        endpoint = store.find("k", fetch, dns_name="web01")
+
+    assert endpoint["id"] == "ep1"
+    fetch.assert_not_called()
+    load.assert_not_called()
+    assert store.last_stale is False
+
+
+def test_find_refreshes_expired_inventory(store):
+    """Test that an expired snapshot is refreshed and stored."""
+    store.ttl = 0
+    store.set("k", {"value": ENDPOINTS[:1]})
+    fetch = Mock(return_value={"value": ENDPOINTS})
+
+    endpoint = store.find("k", fetch, dns_name="mail.example.com")
+
+    assert endpoint["id"] == "ep2"
+    fetch.assert_called_once()
+    assert len(store.load("k")["data"]["value"]) == len(ENDPOINTS)
+
+
+def test_find_serves_stale_within_grace(store):
+    """Test that a stale snapshot within the grace period is queried directly."""
+    store.ttl = 0
+    store.grace = 600
+    store.set("k", {"value": ENDPOINTS})
+    fetch = Mock()
+
+    with patch.object(store, "spawn_refresh") as spawn_refresh:
+        endpoint = store.find("k", fetch, endpoint_id="ep4")
+
+    assert endpoint["id"] == "ep4"
+    spawn_refresh.assert_called_once_with("k", fetch)
+    assert store.last_stale is True
+
+
+def test_find_refreshes_without_background_refresh(store):
+    """Test that a stale snapshot is not served when no background refresh could start."""
+    store.ttl = 0
+    store.grace = 600
+    store.set("k", {"value": ENDPOINTS[:1]})
+    fetch = Mock(return_value={"value": ENDPOINTS})
+
+    with patch.object(store, "spawn_refresh", return_value=False):
+        endpoint = store.find("k", fetch, endpoint_id="ep4")
+
+    assert endpoint["id"] == "ep4"
+    fetch.assert_called_once()
+    assert store.last_stale is False
+
+
+def test_details(store):
+    """Test that details are stored and served while younger than the TTL."""
+    store.set_details("d", {"ep1": {"id": "ep1", "name": "web01"}})
+
+    assert store.get_details("d", ["ep1", "ep2"]) == {"ep1": {"id": "ep1", "name": "web01"}}
+    assert store.get_details("other", ["ep1"]) == {}
+
+    store.ttl = 0
+    assert store.get_details("d", ["ep1"]) == {}
+
+
+def test_unwritable_store_does_not_fail(tmp_path):
+    """Test that an unusable database is reported as a write failure."""
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    store = InventoryStore(str(blocker / "cache"))
+
+    with pytest.raises(OSError):
+        store.set("k", {"value": ENDPOINTS})
+    store.set_details("d", {"ep1": {}})
+    assert store.get("k") is None
+    assert store.get_details("d", ["ep1"]) == {}
+
+
+def test_get_inventory_cache_backend(tmp_path):
+    """Test backend selection in the [cache] section."""
+    config = configparser.ConfigParser()
+    config.read_string(f"[cache]\ndir = {tmp_path}\nbackend = sqlite\nttl = 120\n")
+
+    store = get_inventory_cache(config)
+
+    assert isinstance(store, InventoryStore)
+    assert store.ttl == 120
+
+    config["cache"]["backend"] = "redis"
+    with pytest.raises(ConfigurationError, match="backend"):
+        get_inventory_cache(config)
+
+
+def _response(result):
+    response = Mock(status_code=200)
+    response.json.return_value = result
+    return response
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_uses_store(mock_post, store):
+    """Test that the client resolves hosts and details from the store."""
+    items = [
+        {"id": "ep1", "name": "web01", "details": {"fqdn": "web01.example.com"}},
+        {"id": "ep2", "name": "mail", "details": {"fqdn": "mail.example.com"}},
+    ]
+    mock_post.side_effect = [
+        _response({"result": {"items": items, "pagesCount": 1, "total": 2}}),
+        _response({"result": {"id": "ep1", "name": "web01"}}),
+    ]
+    client = DefenderClient("test_token", cache=store)
+
+    assert client.find_endpoint(fqdn="web01")["id"] == "ep1"
+    assert client.find_endpoint(fqdn="mail.example.com")["id"] == "ep2"
+    assert client.get_endpoint_details("ep1") == {"id": "ep1", "name": "web01"}
+    assert client.get_endpoints_details(["ep1"]) == {"ep1": {"id": "ep1", "name": "web01"}}
+
+    assert mock_post.call_count == 2
+    assert client.inventory_age is not None
@@ -5,6 +5,7 @@ from unittest.mock import Mock
 from datetime import datetime, timedelta, timezone
 from check_bitdefender.services.lastscan_service import LastScanService
 from check_bitdefender.core.exceptions import DefenderAPIError
+from tests.fixtures.mock_defender_client import inventory_finder
 
 
 @pytest.fixture
@@ -12,6 +13,7 @@ def mock_client():
     """Create a mock DefenderClient."""
     client = Mock()
     client.list_endpoints = Mock()
+    client.find_endpoint = inventory_finder(client)
     client.get_endpoint_details = Mock()
     return client
 
@@ -356,3 +358,51 @@ def test_get_result_scanned_today(service, mock_client):
 
     assert result["value"] == 0
     assert "last scanned 0 days ago" in result["details"][0]
+
+
+def test_get_result_uses_inventory_last_scan(service, mock_client):
+    """Test that the inventory lastSuccessfulScan avoids the details request."""
+    six_days_ago = datetime.now(timezone.utc) - timedelta(days=6)
+
+    mock_client.list_endpoints.return_value = {
+        "value": [
+            {
+                "id": "ep1",
+                "fqdn": "test.domain.com",
+                "onboardingStatus": "Onboarded",
+                "osPlatform": "Windows",
+                "lastSuccessfulScan": {"name": "Quick Scan", "date": six_days_ago.isoformat()},
+            }
+        ]
+    }
+
+    result = service.get_result(dns_name="test.domain.com")
+
+    assert result["value"] == 6
+    assert "last scanned 6 days ago" in result["details"][0]
+    mock_client.get_endpoint_details.assert_not_called()
+
+
+def test_get_result_inventory_last_scan_without_date(service, mock_client):
+    """Test fallback to details when the inventory scan has no date."""
+    one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
+
+    mock_client.list_endpoints.return_value = {
+        "value": [
+            {
+                "id": "ep1",
+                "fqdn": "test.domain.com",
+                "onboardingStatus": "Onboarded",
+                "osPlatform": "Windows",
+                "lastSuccessfulScan": {"name": "Quick Scan"},
+            }
+        ]
+    }
+    mock_client.get_endpoint_details.return_value = {
+        "lastSuccessfulScan": {"date": one_day_ago.isoformat()}
+    }
+
+    result = service.get_result(dns_name="test.domain.com")
+
+    assert result["value"] == 1
+    mock_client.get_endpoint_details.assert_called_once_with("ep1")
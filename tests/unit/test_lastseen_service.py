@@ -5,6 +5,7 @@ from unittest.mock import Mock
 from datetime import datetime, timedelta, timezone
 from check_bitdefender.services.lastseen_service import LastSeenService
 from check_bitdefender.core.exceptions import DefenderAPIError
+from tests.fixtures.mock_defender_client import inventory_finder
 
 
 @pytest.fixture
@@ -12,6 +13,7 @@ def mock_client():
     """Create a mock DefenderClient."""
     client = Mock()
     client.list_endpoints = Mock()
+    client.find_endpoint = inventory_finder(client)
     client.get_endpoint_details = Mock()
     return client
 
@@ -279,3 +281,79 @@ def test_get_result_with_z_suffix(service, mock_client):
     # Should be close to 4 days, allowing for timezone offset
     assert result["value"] in [3, 4, 5]
     assert "days ago" in result["details"][0]
+
+
+def test_get_result_uses_inventory_last_seen(service, mock_client):
+    """Test that the inventory lastSeen avoids the details request."""
+    local_tz = timezone(timedelta(hours=2))
+    five_days_ago = datetime.now(local_tz) - timedelta(days=5)
+
+    mock_client.list_endpoints.return_value = {
+        "value": [
+            {
+                "id": "ep1",
+                "fqdn": "test.domain.com",
+                "onboardingStatus": "Onboarded",
+                "osPlatform": "Windows",
+                "lastSeen": five_days_ago.isoformat(),
+                "lastSeenSource": "lastSeen",
+            }
+        ]
+    }
+
+    result = service.get_result(dns_name="test.domain.com")
+
+    assert result["value"] == 5
+    assert "last seen 5 days ago" in result["details"][0]
+    mock_client.get_endpoint_details.assert_not_called()
+
+
+def test_get_result_ignores_inventory_scan_date(service, mock_client):
+    """Test that a lastSeen filled in from the last scan date falls back to details."""
+    local_tz = timezone(timedelta(hours=2))
+    two_days_ago = datetime.now(local_tz) - timedelta(days=2)
+
+    mock_client.list_endpoints.return_value = {
+        "value": [
+            {
+                "id": "ep1",
+                "fqdn": "test.domain.com",
+                "onboardingStatus": "Onboarded",
+                "osPlatform": "Windows",
+                "lastSeen": "2000-01-01T00:00:00Z",
+                "lastSeenSource": "lastSuccessfulScan",
+                "lastSuccessfulScan": {"date": "2000-01-01T00:00:00Z"},
+            }
+        ]
+    }
+    mock_client.get_endpoint_details.return_value = {"lastSeen": two_days_ago.isoformat()}
+
+    result = service.get_result(dns_name="test.domain.com")
+
+    assert result["value"] == 2
+    mock_client.get_endpoint_details.assert_called_once_with("ep1")
+
+
+def test_get_result_inventory_only_disabled(mock_client):
+    """Test that details are always requested when inventory_only is off."""
+    service = LastSeenService(mock_client, inventory_only=False)
+    local_tz = timezone(timedelta(hours=2))
+    two_days_ago = datetime.now(local_tz) - timedelta(days=2)
+
+    mock_client.list_endpoints.return_value = {
+        "value": [
+            {
+                "id": "ep1",
+                "fqdn": "test.domain.com",
+                "onboardingStatus": "Onboarded",
+                "osPlatform": "Windows",
+                "lastSeen": "2000-01-01T00:00:00Z",
+            }
+        ]
+    }
+    mock_client.get_endpoint_details.return_value = {"lastSeen": two_days_ago.isoformat()}
+
+    result = service.get_result(dns_name="test.domain.com")
+
+    assert result["value"] == 2
+    mock_client.get_endpoint_details.assert_called_once_with("ep1")
@@ -349,3 +349,58 @@ class TestNagiosPlugin:
         exit_code = plugin.check(dns_name="test.com")
 
         assert exit_code == 0
+
+    def test_evaluate_reports_inventory_age(self):
+        """Test that a cached inventory adds its age to perfdata."""
+        service = Mock()
+        service.get_result.return_value = {"value": 0, "details": ["Host onboarded (h)"]}
+        service.defender.inventory_age = 41.6
+        service.defender.inventory_stale = False
+
+        exit_code, output = NagiosPlugin(service, "onboarding").evaluate(
+            dns_name="h", warning=2, critical=1
+        )
+
+        assert exit_code == 0
+        assert "inventory_age=42s;;;0" in output
+        assert "refresh in progress" not in output
+
+    def test_evaluate_notes_stale_inventory(self):
+        """Test that a stale inventory is noted in the output."""
+        service = Mock()
+        service.get_result.return_value = {"value": 3, "details": ["Host last seen 3 days ago (h)"]}
+        service.defender.inventory_age = 412.0
+        service.defender.inventory_stale = True
+
+        _, output = NagiosPlugin(service, "lastseen").evaluate(dns_name="h", warning=7, critical=30)
+
+        assert "Note: inventory data is 412s old, refresh in progress" in output
+        assert "inventory_age=412s" in output
+
+    def test_evaluate_notes_offline_inventory(self):
+        """Test that an inventory replacing a failed refresh is noted in the output."""
+        service = Mock()
+        service.get_result.return_value = {"value": 0, "details": ["Host onboarded (h)"]}
+        service.defender.inventory_age = 7200.0
+        service.defender.inventory_stale = True
+        service.defender.inventory_offline = True
+
+        exit_code, output = NagiosPlugin(service, "onboarding").evaluate(
+            dns_name="h", warning=2, critical=1
+        )
+
+        assert exit_code == 0
+        assert "Note: GravityZone API unavailable, inventory data is 7200s old" in output
+        assert "inventory_age=7200s" in output
+
+    def test_evaluate_without_cache_has_no_age(self):
+        """Test that a live inventory adds no age metric."""
+        service = Mock()
+        service.get_result.return_value = {"value": 0, "details": []}
+        service.defender.inventory_age = None
+
+        _, output = NagiosPlugin(service, "onboarding").evaluate(
+            dns_name="h", warning=2, critical=1
+        )
+
+        assert "inventory_age" not in output
@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import Mock
 from check_bitdefender.services.onboarding_service import OnboardingService
 from check_bitdefender.core.exceptions import DefenderAPIError
+from tests.fixtures.mock_defender_client import inventory_finder
 
 
 @pytest.fixture
@@ -11,6 +12,7 @@ def mock_client():
     """Create a mock DefenderClient."""
     client = Mock()
     client.list_endpoints = Mock()
+    client.find_endpoint = inventory_finder(client)
     return client
 
 
@@ -223,3 +225,22 @@ def test_get_result_unsupported_status(service, mock_client):
     assert result["value"] == 1  # Not onboarded
     assert "Host not onboarded" in result["details"][0]
     assert "Unsupported" in result["details"][1]
+
+
+def test_get_result_case_insensitive_dns_name(service, mock_client):
+    """Test that hosts resolve regardless of DNS name case."""
+    mock_client.list_endpoints.return_value = {
+        "value": [
+            {
+                "id": "ep1",
+                "fqdn": "TEST.domain.com",
+                "onboardingStatus": "Onboarded",
+                "osPlatform": "Windows",
+            }
+        ]
+    }
+
+    result = service.get_result(dns_name="test.DOMAIN.com")
+
+    assert result["value"] == 0
+    assert "TEST.domain.com" in result["details"][0]
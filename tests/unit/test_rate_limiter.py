@@ -0,0 +1,133 @@
+"""Unit tests for the cross-process rate limiter."""
+
+import configparser
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from check_bitdefender.core.auth import Tenant
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import ConfigurationError
+from check_bitdefender.core.ratelimit import RateLimiter, get_rate_limiter
+
+
+@pytest.fixture
+def limiter(tmp_path):
+    """Create a limiter allowing two requests per second with a burst of two."""
+    return RateLimiter(str(tmp_path / "ratelimit.json"), rate=2, burst=2)
+
+
+@pytest.fixture
+def sleep():
+    with patch("check_bitdefender.core.ratelimit.time.sleep") as mock_sleep:
+        yield mock_sleep
+
+
+def test_burst_without_waiting(limiter, sleep):
+    """Test that a full bucket lets a burst through."""
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+    sleep.assert_not_called()
+    assert limiter.waited == 0
+
+
+def test_waits_when_empty(limiter, sleep):
+    """Test that requests past the burst wait for their token in turn."""
+    now = time.time()
+    with patch("check_bitdefender.core.ratelimit.time.time", return_value=now):
+        limiter.acquire()
+        limiter.acquire()
+        first = limiter.acquire()
+        second = limiter.acquire()
+
+    assert first == pytest.approx(0.5)
+    assert second == pytest.approx(1.0)
+    assert limiter.waited == pytest.approx(1.5)
+    assert sleep.call_count == 2
+
+
+def test_refills_over_time(limiter, sleep):
+    """Test that tokens come back at the configured rate."""
+    now = time.time()
+    with patch("check_bitdefender.core.ratelimit.time.time", return_value=now):
+        limiter.acquire()
+        limiter.acquire()
+    with patch("check_bitdefender.core.ratelimit.time.time", return_value=now + 10):
+        assert limiter.acquire() == 0
+        assert limiter.acquire() == 0
+        assert limiter.acquire() == pytest.approx(0.5)
+
+
+def test_bucket_shared_across_instances(limiter, sleep):
+    """Test that another process draws from the same bucket."""
+    now = time.time()
+    other = RateLimiter(limiter.path, rate=2, burst=2)
+    with patch("check_bitdefender.core.ratelimit.time.time", return_value=now):
+        limiter.acquire()
+        limiter.acquire()
+        assert other.acquire() == pytest.approx(0.5)
+
+
+def test_unusable_state_does_not_block(tmp_path, sleep):
+    """Test that requests go through when the state file cannot be written."""
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    limiter = RateLimiter(str(blocker / "ratelimit.json"), rate=1)
+
+    assert limiter.acquire() == 0
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_waits_before_each_request(mock_post, limiter):
+    """Test that DefenderClient takes a token per request and reports the wait."""
+    response = Mock(status_code=200)
+    response.json.return_value = {"result": {"items": [], "pagesCount": 1}}
+    mock_post.return_value = response
+    limiter.acquire = Mock(return_value=0.25)
+    limiter.waited = 0.25
+    client = DefenderClient("test_token", rate_limiter=limiter)
+
+    client.list_endpoints()
+
+    limiter.acquire.assert_called_once()
+    assert client.transport_metrics()["ratelimit_wait"] == (0.25, "s")
+
+
+def test_get_rate_limiter(tmp_path):
+    """Test limiter creation from [ratelimit] with per-tenant overrides."""
+    config = configparser.ConfigParser()
+    tenant = Tenant("acme", "secret_token")
+    assert get_rate_limiter(config, tenant) is None
+
+    config.read_string(
+        f"[cache]\ndir = {tmp_path}\n[ratelimit]\nrate = 5\n"
+        "[tenant:acme]\ntoken = secret_token\nburst = 20\n"
+        "[tenant:slow]\ntoken = other_token\nrate = 0\n"
+    )
+    limiter = get_rate_limiter(config, tenant)
+
+    assert limiter.rate == 5
+    assert limiter.burst == 20
+    assert limiter.path.startswith(str(tmp_path))
+    assert "secret_token" not in limiter.path
+    assert get_rate_limiter(config, Tenant("other", "other_token")).path != limiter.path
+    assert get_rate_limiter(config, Tenant("slow", "other_token")) is None
+
+
+def test_get_rate_limiter_invalid(tmp_path):
+    """Test that invalid limits are rejected."""
+    config = configparser.ConfigParser()
+    config.read_string(f"[cache]\ndir = {tmp_path}\n[ratelimit]\nrate = fast\n")
+
+    with pytest.raises(ConfigurationError, match="rate"):
+        get_rate_limiter(config, Tenant("default", "token"))
+
+
+def test_get_rate_limiter_needs_directory():
+    """Test that a state directory is required."""
+    config = configparser.ConfigParser()
+    config.read_string("[ratelimit]\nrate = 5\n")
+
+    with pytest.raises(ConfigurationError, match="state_dir"):
+        get_rate_limiter(config, Tenant("default", "token"))
@@ -0,0 +1,151 @@
+"""Unit tests for the retry policy."""
+
+import configparser
+from email.utils import formatdate
+import time
+
+import pytest
+import requests
+from unittest.mock import Mock, patch
+
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import ConfigurationError, DefenderAPIError
+from check_bitdefender.core.retry import RetryPolicy, get_retry_policy, parse_retry_after
+
+
+def _response(status, headers=None, result=None):
+    response = Mock(status_code=status, headers=headers or {})
+    response.json.return_value = {"result": result or {"items": [], "pagesCount": 1}}
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status} Error")
+    return response
+
+
+def test_delay_full_jitter():
+    """Test that delays stay between 0 and the capped exponential backoff."""
+    policy = RetryPolicy(backoff=1, backoff_max=5)
+
+    for retry, cap in ((0, 1), (1, 2), (2, 4), (5, 5)):
+        delays = [policy.delay(retry) for _ in range(50)]
+        assert all(0 <= delay <= cap for delay in delays)
+
+
+def test_parse_retry_after():
+    """Test Retry-After in seconds and as an HTTP date."""
+    assert parse_retry_after("7") == 7
+    assert 8 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_reserve_honors_retry_after():
+    """Test that Retry-After replaces the backoff."""
+    assert RetryPolicy(budget=30).reserve(0, "12") == 12
+
+
+def test_reserve_stops_after_max_attempts():
+    """Test that a request is attempted at most max_attempts times."""
+    policy = RetryPolicy(max_attempts=3)
+
+    assert policy.reserve(0) is not None
+    assert policy.reserve(1) is not None
+    assert policy.reserve(2) is None
+
+
+def test_reserve_shares_budget():
+    """Test that all retries draw from one time budget."""
+    policy = RetryPolicy(max_attempts=10, budget=10)
+
+    assert policy.reserve(0, "6") == 6
+    assert policy.reserve(0, "6") is None
+    assert policy.reserve(0, "4") == 4
+    assert policy.remaining == 0
+
+
+def test_reset_restores_budget():
+    """Test that reset gives back the budget spent by earlier retries."""
+    policy = RetryPolicy(max_attempts=10, budget=10)
+    policy.reserve(0, "10")
+
+    policy.reset()
+
+    assert policy.remaining == 10
+    assert policy.reserve(0, "6") == 6
+
+
+def test_client_reset_retry_budget():
+    """Test that the client resets its retry policy."""
+    client = DefenderClient("test_token", retry=RetryPolicy(budget=10))
+    client.retry.reserve(0, "10")
+
+    client.reset_retry_budget()
+
+    assert client.retry.remaining == 10
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_retries_server_errors(mock_post):
+    """Test that a 502 is retried and the request then succeeds."""
+    item = {"id": "ep1", "details": {"fqdn": "h.tld"}}
+    mock_post.side_effect = [_response(502), _response(200, result={"items": [item]})]
+    policy = RetryPolicy(backoff=0)
+    client = DefenderClient("test_token", retry=policy)
+
+    assert client.list_endpoints()["value"][0]["id"] == "ep1"
+    assert mock_post.call_count == 2
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_retries_connection_errors(mock_post):
+    """Test that connection errors are retried until attempts run out."""
+    mock_post.side_effect = requests.exceptions.ConnectionError("refused")
+    client = DefenderClient("test_token", retry=RetryPolicy(max_attempts=3, backoff=0))
+
+    with pytest.raises(DefenderAPIError, match="refused"):
+        client.list_endpoints()
+    assert mock_post.call_count == 3
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_waits_retry_after(mock_post):
+    """Test that a 429 waits the delay asked by the server."""
+    mock_post.side_effect = [_response(429, {"Retry-After": "3"}), _response(200)]
+    policy = RetryPolicy()
+    policy.sleep = Mock()
+
+    DefenderClient("test_token", retry=policy).get_endpoint_details("ep1")
+
+    policy.sleep.assert_called_once_with(3)
+
+
+@patch("check_bitdefender.core.defender.requests.Session.post")
+def test_client_does_not_retry_client_errors(mock_post):
+    """Test that other HTTP errors fail at once."""
+    mock_post.return_value = _response(401)
+    client = DefenderClient("test_token", retry=RetryPolicy(backoff=0))
+
+    with pytest.raises(DefenderAPIError):
+        client.list_endpoints()
+    mock_post.assert_called_once()
+
+
+def test_get_retry_policy():
+    """Test policy creation from the [retry] section."""
+    config = configparser.ConfigParser()
+    assert get_retry_policy(config).max_attempts == 3
+
+    config.read_string("[retry]\nmax_attempts = 5\nbudget = 12\nstatuses = 429,503\n")
+    policy = get_retry_policy(config)
+
+    assert policy.max_attempts == 5
+    assert policy.budget == 12
+    assert policy.statuses == (429, 503)
+
+
+def test_get_retry_policy_invalid():
+    """Test that invalid settings raise ConfigurationError."""
+    config = configparser.ConfigParser()
+    config.read_string("[retry]\nstatuses = 5xx\n")
+
+    with pytest.raises(ConfigurationError, match="statuses"):
+        get_retry_policy(config)
@@ -0,0 +1,116 @@
+"""Unit tests for the checkresult spool writer."""
+
+import os
+import re
+
+import pytest
+from unittest.mock import MagicMock, patch
+from click.testing import CliRunner
+
+from check_bitdefender.cli import main
+from check_bitdefender.core.bulk import CheckResult
+from check_bitdefender.core.spool import CheckResultSpool, escape_output, format_checkresult
+
+
+def _results(count):
+    """Build check results for distinct hosts."""
+    return [
+        CheckResult(f"web{i:02d}", "lastseen", i % 4, f"DEFENDER OK - host {i}\n", 1700000000.0)
+        for i in range(count)
+    ]
+
+
+def _checkresult_files(directory):
+    """List published checkresult files."""
+    return sorted(name for name in os.listdir(directory) if re.fullmatch(r"c\w{6}", name))
+
+
+def test_escape_output():
+    """Test newline and backslash escaping."""
+    assert escape_output("line 1\nC:\\path\n") == "line 1\\nC:\\\\path"
+
+
+def test_format_checkresult():
+    """Test the service check result block."""
+    block = format_checkresult(
+        CheckResult("web01", "lastscan", 2, "DEFENDER CRITICAL\nmore\n", 1700000000.25),
+        "BITDEFENDER_LASTSCAN",
+    )
+
+    assert "host_name=web01\n" in block
+    assert "service_description=BITDEFENDER_LASTSCAN\n" in block
+    assert "check_type=1\n" in block
+    assert "start_time=1700000000.250000\n" in block
+    assert "return_code=2\n" in block
+    assert "output=DEFENDER CRITICAL\\nmore\n" in block
+
+
+def test_write_batches(tmp_path):
+    """Test that results are split into files with .ok companions."""
+    spool = CheckResultSpool(str(tmp_path), batch_size=2)
+
+    assert spool.write(_results(5)) == 5
+
+    files = _checkresult_files(tmp_path)
+    assert len(files) == 3
+    assert sorted(os.listdir(tmp_path)) == sorted(files + [f"{name}.ok" for name in files])
+
+    contents = "".join((tmp_path / name).read_text() for name in files)
+    assert contents.count("### Nagios Service Check Result ###") == 5
+    assert all(
+        (tmp_path / name).read_text().startswith("### Active Check Result File ###")
+        for name in files
+    )
+    for i in range(5):
+        assert f"host_name=web{i:02d}\n" in contents
+
+
+def test_write_nothing(tmp_path):
+    """Test that no file is created without results."""
+    assert CheckResultSpool(str(tmp_path)).write([]) == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_write_never_replaces_unread_file(tmp_path):
+    """Test that name collisions pick another name."""
+    (tmp_path / "cAAAAAA").write_text("unread")
+    names = iter("AAAAAABBBBBB")
+
+    choice = patch("check_bitdefender.core.spool.secrets.choice", side_effect=lambda _: next(names))
+    with choice:
+        CheckResultSpool(str(tmp_path)).write(_results(1))
+
+    assert (tmp_path / "cAAAAAA").read_text() == "unread"
+    assert "host_name=web00" in (tmp_path / "cBBBBBB").read_text()
+    assert (tmp_path / "cBBBBBB.ok").exists()
+
+
+def test_invalid_batch_size(tmp_path):
+    """Test batch size validation."""
+    with pytest.raises(ValueError):
+        CheckResultSpool(str(tmp_path), batch_size=0)
+
+
+def test_bulk_command_spool_dir(tmp_path):
+    """Test the bulk command writing into a spool directory."""
+    client = MagicMock()
+    client.list_endpoints.return_value = {
+        "value": [{"id": "ep1", "fqdn": "host1.domain.tld", "onboardingStatus": "Onboarded"}]
+    }
+
+    with (
+        patch("check_bitdefender.cli.commands.bulk.load_config"),
+        patch("check_bitdefender.cli.commands.bulk.create_client", return_value=client),
+    ):
+        result = CliRunner().invoke(
+            main,
+            ["bulk", "-d", "host1.domain.tld", "-k", "onboarding", "--spool-dir", str(tmp_path)],
+        )
+
+    assert result.exit_code == 0
+    assert result.output == ""
+    files = _checkresult_files(tmp_path)
+    assert len(files) == 1
+    content = (tmp_path / files[0]).read_text()
+    assert "service_description=BITDEFENDER_ONBOARDING\n" in content
+    assert "return_code=0\n" in content
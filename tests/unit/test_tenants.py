@@ -0,0 +1,188 @@
+"""Unit tests for multi-tenant configuration and client."""
+
+import configparser
+
+import pytest
+from unittest.mock import Mock
+
+from check_bitdefender.core.auth import Tenant, get_tenants
+from check_bitdefender.core.defender import DefenderClient
+from check_bitdefender.core.exceptions import ConfigurationError, DefenderAPIError
+from check_bitdefender.core.factory import create_client
+from check_bitdefender.core.tenants import MultiTenantClient
+from check_bitdefender.services.lastseen_service import LastSeenService
+from tests.fixtures.mock_defender_client import inventory_finder
+
+
+def _config(text):
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return config
+
+
+def _tenant_client(endpoints):
+    client = Mock()
+    client.list_endpoints.return_value = {"value": endpoints}
+    client.find_endpoint = inventory_finder(client)
+    return client
+
+
+@pytest.fixture
+def clients():
+    """Create two tenant clients sharing one host name."""
+    return {
+        "acme": _tenant_client(
+            [
+                {"id": "a1", "fqdn": "web.acme.tld", "lastSeen": "2024-01-01T00:00:00Z"},
+                {"id": "shared", "fqdn": "dup.domain.tld"},
+            ]
+        ),
+        "globex": _tenant_client(
+            [
+                {"id": "g1", "fqdn": "web.globex.tld"},
+                {"id": "g2", "fqdn": "dup.domain.tld"},
+            ]
+        ),
+    }
+
+
+def test_get_tenants_from_sections():
+    """Test parsing one tenant per [tenant:NAME] section."""
+    tenants = get_tenants(
+        _config(
+            "[tenant:acme]\ntoken = t1\nparent_id = p1\n"
+            "[tenant:globex]\ntoken = t2\nregion = eu\n"
+        )
+    )
+
+    assert tenants == [Tenant("acme", "t1", "p1", "api"), Tenant("globex", "t2", None, "eu")]
+
+
+def test_get_tenants_from_auth_section():
+    """Test that the [auth] token forms a single default tenant."""
+    tenants = get_tenants(_config("[auth]\ntoken = t\n[settings]\nparent_id = p\n"))
+
+    assert tenants == [Tenant("default", "t", "p", "api")]
+
+
+def test_get_tenants_missing_token():
+    """Test that a tenant without token is rejected."""
+    with pytest.raises(ConfigurationError, match="tenant:acme"):
+        get_tenants(_config("[tenant:acme]\nparent_id = p\n"))
+
+
+def test_create_client_multi_tenant():
+    """Test that several tenants produce a MultiTenantClient."""
+    client = create_client(_config("[tenant:acme]\ntoken = t1\n[tenant:globex]\ntoken = t2\n"))
+
+    assert isinstance(client, MultiTenantClient)
+    assert [c.authenticator for c in client.clients.values()] == ["t1", "t2"]
+
+
+def test_create_client_single_tenant():
+    """Test that a single account keeps a plain DefenderClient."""
+    client = create_client(_config("[auth]\ntoken = t\n"))
+
+    assert isinstance(client, DefenderClient)
+
+
+def test_list_endpoints_merges_tenants(clients):
+    """Test that inventories are merged in tenant order and tagged."""
+    client = MultiTenantClient(clients)
+
+    endpoints = client.list_endpoints()["value"]
+    by_tenant = client.list_endpoints_by_tenant()
+
+    assert [(e["id"], e["tenant"]) for e in endpoints] == [
+        ("a1", "acme"),
+        ("shared", "acme"),
+        ("g1", "globex"),
+        ("g2", "globex"),
+    ]
+    assert list(by_tenant) == ["acme", "globex"]
+
+
+def test_list_endpoints_tenant_failure(clients):
+    """Test that a failing tenant fails the merged inventory."""
+    clients["globex"].list_endpoints.side_effect = DefenderAPIError("boom")
+
+    with pytest.raises(DefenderAPIError, match="Tenant globex: boom"):
+        MultiTenantClient(clients).list_endpoints()
+
+
+def test_iter_endpoints_chains_tenants(clients):
+    """Test that iter_endpoints yields every tenant's endpoints with their tenant."""
+    for client in clients.values():
+        client.iter_endpoints.side_effect = lambda c=client: iter(c.list_endpoints()["value"])
+
+    endpoints = list(MultiTenantClient(clients).iter_endpoints())
+
+    assert [(e["id"], e["tenant"]) for e in endpoints] == [
+        ("a1", "acme"),
+        ("shared", "acme"),
+        ("g1", "globex"),
+        ("g2", "globex"),
+    ]
+
+
+def test_find_endpoint_across_tenants(clients):
+    """Test host resolution in any tenant, first tenant first."""
+    client = MultiTenantClient(clients)
+
+    assert client.find_endpoint(fqdn="web.globex.tld")["tenant"] == "globex"
+    assert client.find_endpoint(fqdn="dup.domain.tld")["id"] == "shared"
+    assert client.find_endpoint(fqdn="dup.domain.tld", endpoint_id="g2")["id"] == "g2"
+    assert client.find_endpoint(fqdn="missing.domain.tld") is None
+
+
+def test_find_endpoint_tenant_failure(clients):
+    """Test that a host found elsewhere survives a failing tenant, a missing one does not."""
+    clients["acme"].find_endpoint = Mock(side_effect=DefenderAPIError("down"))
+    client = MultiTenantClient(clients)
+
+    assert client.find_endpoint(fqdn="web.globex.tld")["id"] == "g1"
+    with pytest.raises(DefenderAPIError, match="Tenant acme: down"):
+        client.find_endpoint(fqdn="missing.domain.tld")
+
+
+def test_get_endpoint_details_routed_to_owner(clients):
+    """Test that details are requested from the tenant owning the endpoint."""
+    clients["globex"].get_endpoint_details.return_value = {"id": "g1"}
+    client = MultiTenantClient(clients)
+    client.find_endpoint(fqdn="web.globex.tld")
+
+    assert client.get_endpoint_details("g1") == {"id": "g1"}
+    clients["acme"].get_endpoint_details.assert_not_called()
+
+
+def test_get_endpoint_details_unknown_owner(clients):
+    """Test that tenants are tried in order for an endpoint never seen."""
+    clients["acme"].get_endpoint_details.side_effect = DefenderAPIError("not found")
+    clients["globex"].get_endpoint_details.return_value = {"id": "g9"}
+
+    assert MultiTenantClient(clients).get_endpoint_details("g9") == {"id": "g9"}
+
+
+def test_get_endpoints_details_batched_per_tenant(clients):
+    """Test that batched details are split by owning tenant."""
+    clients["acme"].get_endpoints_details.return_value = {"a1": {"id": "a1"}}
+    clients["globex"].get_endpoints_details.return_value = {"g1": {"id": "g1"}}
+    client = MultiTenantClient(clients)
+    client.list_endpoints()
+
+    results = client.get_endpoints_details(["a1", "g1"])
+
+    assert results == {"a1": {"id": "a1"}, "g1": {"id": "g1"}}
+    clients["acme"].get_endpoints_details.assert_called_once_with(["a1"])
+    clients["globex"].get_endpoints_details.assert_called_once_with(["g1"])
+
+
+def test_service_resolves_host_across_tenants(clients):
+    """Test that a service checks a host of the second tenant."""
+    endpoint = clients["globex"].list_endpoints.return_value["value"][0]
+    endpoint.update(lastSeen="2024-01-01T00:00:00Z", lastSeenSource="lastSeen")
+
+    result = LastSeenService(MultiTenantClient(clients)).get_result(dns_name="web.globex.tld")
+
+    assert result["details"][0].startswith("Host last seen")
+    assert "web.globex.tld" in result["details"][0]